@@ -0,0 +1,5 @@
+# Scoring benchmarks: run with ``python -m benchmarks --help`` from the backend directory;
+# baseline.json holds the last recorded run (vectorized vs per-task speedups, and those
+# short of the 10x target, included),
+# for ``--baseline benchmarks/baseline.json`` on comparable hardware;
+# ``python -m benchmarks.load`` compares WSGI and ASGI latency under mixed load
@@ -0,0 +1,74 @@
+import random
+from datetime import datetime, timedelta, timezone
+from typing import Dict, Any, List, Optional
+
+# Share of tasks that are already overdue / have no due date at all
+OVERDUE_SHARE = 0.1
+UNDATED_SHARE = 0.2
+# Mean hours until the due date of dated tasks; most deadlines are near
+MEAN_HOURS_AHEAD = 96.0
+# Chance that a task has dependencies
+DEPENDENCY_SHARE = 0.4
+
+# Importance 1-10, weighted towards the middle with a heavy top end
+_IMPORTANCE_WEIGHTS = [2, 4, 7, 10, 14, 14, 12, 10, 8, 6]
+
+
+def generate_backlog(size: int, seed: int = 0, now: Optional[datetime] = None,
+                     with_ids: bool = True) -> List[Dict[str, Any]]:
+    """Build a reproducible synthetic backlog of ``size`` analyze-format task dicts.
+    
+    * due dates are exponentially skewed towards the next few days, with
+      a share already overdue and a share undated
+    * estimated hours follow a log-normal distribution (mostly 1-4h)
+    * dependencies only point at earlier tasks, so the graph is a DAG, and
+      targets are picked by preferential attachment, which gives a
+      power-law fan-in: a few tasks block many others, most block none
+    
+    The same ``size``, ``seed`` and ``now`` always give the same backlog.
+    """
+    rng = random.Random(seed)
+    now = now or datetime(2025, 1, 1, tzinfo=timezone.utc)
+    
+    tasks = []
+    # Every task once, plus once more each time it is picked as a dependency
+    attachment_pool: List[int] = []
+    for position in range(size):
+        roll = rng.random()
+        if roll < UNDATED_SHARE:
+            due_date = None
+        elif roll < UNDATED_SHARE + OVERDUE_SHARE:
+            due_date = (now - timedelta(hours=rng.expovariate(1 / 48))).isoformat()
+        else:
+            due_date = (now + timedelta(hours=rng.expovariate(1 / MEAN_HOURS_AHEAD))).isoformat()
+        
+        task = {
+            'title': f'Task {position}',
+            'due_date': due_date,
+            'estimated_hours': round(min(rng.lognormvariate(0.7, 0.8), 80.0), 1),
+            'importance': rng.choices(range(1, 11), _IMPORTANCE_WEIGHTS)[0],
+        }
+        if with_ids:
+            task['id'] = position + 1
+            task['dependencies'] = _pick_dependencies(rng, attachment_pool)
+            attachment_pool.extend(task['dependencies'])
+            attachment_pool.append(task['id'])
+        tasks.append(task)
+    return tasks
+
+
+def generate_chain(size: int) -> List[Dict[str, Any]]:
+    """``size`` tasks that each depend on the one before: the deepest possible DAG"""
+    return [
+        {'id': position + 1, 'title': f'Step {position}', 'importance': 5, 'estimated_hours': 1.0,
+         'dependencies': [position] if position else []}
+        for position in range(size)
+    ]
+
+
+def _pick_dependencies(rng: random.Random, attachment_pool: List[int]) -> List[int]:
+    """Ids of earlier tasks, each picked in proportion to how often it already was"""
+    if not attachment_pool or rng.random() >= DEPENDENCY_SHARE:
+        return []
+    count = 1 + int(rng.expovariate(1.0))
+    return sorted({rng.choice(attachment_pool) for _ in range(count)})
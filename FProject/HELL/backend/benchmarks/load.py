@@ -0,0 +1,242 @@
+"""Mixed-load latency comparison of the WSGI and ASGI entry points.
+
+Starts ``manage.py runserver`` (the threaded WSGI server run.py uses) and
+uvicorn on ``task_analyzer.asgi``, then drives each with the same mix: a
+few clients posting large backlogs to analyze while more clients poll
+suggest and analyze small backlogs. Reports p50/p99 latency per request
+class, so the effect of heavy requests on small ones is visible::
+    
+    python -m benchmarks.load --duration 20 --heavy-size 50000
+"""
+import argparse
+import http.client
+import itertools
+import json
+import os
+import socket
+import subprocess
+import sys
+import threading
+import time
+from typing import Dict, Any, List, Optional
+from urllib.parse import urlsplit
+
+from .generators import generate_backlog
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DEFAULT_DURATION = 10.0
+DEFAULT_HEAVY_CLIENTS = 2
+DEFAULT_LIGHT_CLIENTS = 8
+DEFAULT_HEAVY_SIZE = 20000
+LIGHT_SIZE = 10
+# Seconds to wait for a server to answer before giving up
+STARTUP_TIMEOUT = 30.0
+
+
+def percentile(values: List[float], share: float) -> Optional[float]:
+    """Nearest-rank percentile of ``values`` (``share`` in 0-1); None when empty"""
+    if not values:
+        return None
+    ordered = sorted(values)
+    rank = max(int(round(share * len(ordered) + 0.5)) - 1, 0)
+    return ordered[min(rank, len(ordered) - 1)]
+
+
+def analyze_body(encoded_tasks: str, serial: int) -> str:
+    """Analyze body of pre-encoded tasks, made unique so the result cache misses"""
+    probe = json.dumps({'title': f'probe {serial}', 'importance': 1, 'estimated_hours': 1})
+    separator = ',' if encoded_tasks != '[]' else ''
+    return f'{{"tasks":[{probe}{separator}{encoded_tasks[1:]}}}'
+
+
+class LoadClient(threading.Thread):
+    """Sends requests over one keep-alive connection until ``stop`` is set"""
+    
+    def __init__(self, url: str, requests, stop: threading.Event):
+        super().__init__(daemon=True)
+        parts = urlsplit(url)
+        self.host, self.port = parts.hostname, parts.port
+        self.requests = requests
+        self.stop = stop
+        # (request class, seconds, status)
+        self.samples: List[tuple] = []
+    
+    def run(self):
+        connection = http.client.HTTPConnection(self.host, self.port, timeout=120)
+        for kind, method, path, body in self.requests:
+            if self.stop.is_set():
+                break
+            headers = {'Content-Type': 'application/json'} if body else {}
+            start = time.perf_counter()
+            try:
+                connection.request(method, path, body, headers)
+                response = connection.getresponse()
+                response.read()
+                status = response.status
+            except (OSError, http.client.HTTPException):
+                connection.close()
+                connection = http.client.HTTPConnection(self.host, self.port, timeout=120)
+                status = 0
+            self.samples.append((kind, time.perf_counter() - start, status))
+        connection.close()
+
+
+def drive(url: str, duration: float, heavy_clients: int, light_clients: int,
+          heavy_tasks: str, light_tasks: str) -> Dict[str, Any]:
+    """Run the request mix against ``url`` for ``duration`` seconds and summarize it"""
+    serials = itertools.count()
+    
+    def heavy_requests():
+        while True:
+            yield 'heavy_analyze', 'POST', '/api/tasks/analyze/', analyze_body(heavy_tasks, next(serials))
+    
+    def light_requests():
+        while True:
+            yield 'light_suggest', 'GET', '/api/tasks/suggest/', None
+            yield 'light_analyze', 'POST', '/api/tasks/analyze/', analyze_body(light_tasks, next(serials))
+    
+    stop = threading.Event()
+    clients = ([LoadClient(url, heavy_requests(), stop) for _ in range(heavy_clients)] +
+               [LoadClient(url, light_requests(), stop) for _ in range(light_clients)])
+    for client in clients:
+        client.start()
+    time.sleep(duration)
+    stop.set()
+    for client in clients:
+        client.join()
+    
+    summary = {}
+    samples = [sample for client in clients for sample in client.samples]
+    for kind in sorted({kind for kind, _, _ in samples}):
+        ok = [seconds for sample_kind, seconds, status in samples if sample_kind == kind and status == 200]
+        statuses: Dict[str, int] = {}
+        for sample_kind, _, status in samples:
+            if sample_kind == kind:
+                statuses[str(status)] = statuses.get(str(status), 0) + 1
+        summary[kind] = {
+            'requests': sum(statuses.values()),
+            'statuses': statuses,
+            'p50_ms': _ms(percentile(ok, 0.5)),
+            'p99_ms': _ms(percentile(ok, 0.99)),
+            'per_second': round(len(ok) / duration, 1),
+        }
+    return summary
+
+
+def start_server(kind: str, port: int) -> subprocess.Popen:
+    if kind == 'wsgi':
+        command = [sys.executable, 'manage.py', 'runserver', '--noreload', f'127.0.0.1:{port}']
+    else:
+        command = [sys.executable, '-m', 'uvicorn', 'task_analyzer.asgi:application',
+                   '--host', '127.0.0.1', '--port', str(port), '--log-level', 'warning']
+    env = dict(os.environ, DJANGO_SETTINGS_MODULE='task_analyzer.settings')
+    server = subprocess.Popen(command, cwd=BACKEND_DIR, env=env,
+                              stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    deadline = time.monotonic() + STARTUP_TIMEOUT
+    while time.monotonic() < deadline:
+        if server.poll() is not None:
+            raise RuntimeError(f'{kind} server exited with status {server.returncode}')
+        try:
+            connection = http.client.HTTPConnection('127.0.0.1', port, timeout=1)
+            connection.request('GET', '/api/tasks/suggest/')
+            connection.getresponse().read()
+            connection.close()
+            return server
+        except OSError:
+            time.sleep(0.2)
+    server.terminate()
+    raise RuntimeError(f'{kind} server did not start within {STARTUP_TIMEOUT:g}s')
+
+
+def run_load(servers=('wsgi', 'asgi'), duration: float = DEFAULT_DURATION,
+             heavy_clients: int = DEFAULT_HEAVY_CLIENTS, light_clients: int = DEFAULT_LIGHT_CLIENTS,
+             heavy_size: int = DEFAULT_HEAVY_SIZE, seed: int = 0,
+             urls: Optional[Dict[str, str]] = None) -> Dict[str, Any]:
+    """Drive each server with the same mix; ``urls`` points at already running servers"""
+    heavy_tasks = json.dumps(generate_backlog(heavy_size, seed, with_ids=False))
+    light_tasks = json.dumps(generate_backlog(LIGHT_SIZE, seed, with_ids=False))
+    results = {}
+    for kind in servers:
+        url = (urls or {}).get(kind)
+        server = None
+        if url is None:
+            port = _free_port()
+            server = start_server(kind, port)
+            url = f'http://127.0.0.1:{port}'
+        try:
+            results[kind] = drive(url, duration, heavy_clients, light_clients, heavy_tasks, light_tasks)
+        finally:
+            if server is not None:
+                server.terminate()
+                server.wait()
+    return {
+        'meta': {
+            'duration': duration,
+            'heavy_clients': heavy_clients,
+            'light_clients': light_clients,
+            'heavy_size': heavy_size,
+            'light_size': LIGHT_SIZE,
+        },
+        'results': results,
+    }
+
+
+def format_report(report: Dict[str, Any]) -> str:
+    lines = [f"{'server':<6} {'requests':<14} {'n':>6} {'p50 ms':>9} {'p99 ms':>9} {'/s':>7}  statuses"]
+    for server, summary in report['results'].items():
+        for kind, row in summary.items():
+            lines.append(f"{server:<6} {kind:<14} {row['requests']:>6} {_cell(row['p50_ms']):>9} "
+                         f"{_cell(row['p99_ms']):>9} {row['per_second']:>7}  {row['statuses']}")
+    return '\n'.join(lines)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description='Compare WSGI and ASGI latency under mixed load')
+    parser.add_argument('--servers', default='wsgi,asgi', help='comma-separated: wsgi, asgi')
+    parser.add_argument('--duration', type=float, default=DEFAULT_DURATION, help='seconds per server')
+    parser.add_argument('--heavy-clients', type=int, default=DEFAULT_HEAVY_CLIENTS)
+    parser.add_argument('--light-clients', type=int, default=DEFAULT_LIGHT_CLIENTS)
+    parser.add_argument('--heavy-size', type=int, default=DEFAULT_HEAVY_SIZE,
+                        help='tasks per heavy analyze request')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--wsgi-url', help='use a running WSGI server instead of starting one')
+    parser.add_argument('--asgi-url', help='use a running ASGI server instead of starting one')
+    parser.add_argument('--output', help='also write the results JSON here')
+    args = parser.parse_args(argv)
+    
+    servers = [server for server in args.servers.split(',') if server]
+    unknown = set(servers) - {'wsgi', 'asgi'}
+    if unknown:
+        parser.error(f'unknown servers: {", ".join(sorted(unknown))}')
+    urls = {'wsgi': args.wsgi_url, 'asgi': args.asgi_url}
+    if 'asgi' in servers and not urls['asgi']:
+        try:
+            import uvicorn  # noqa: F401
+        except ImportError:
+            parser.error('the ASGI run needs uvicorn (pip install uvicorn) or --asgi-url')
+    
+    report = run_load(servers, args.duration, args.heavy_clients, args.light_clients,
+                      args.heavy_size, args.seed, {kind: url for kind, url in urls.items() if url})
+    print(format_report(report))
+    if args.output:
+        with open(args.output, 'w') as output:
+            output.write(json.dumps(report, indent=2) + '\n')
+    return 0
+
+
+def _free_port() -> int:
+    with socket.socket() as probe:
+        probe.bind(('127.0.0.1', 0))
+        return probe.getsockname()[1]
+
+
+def _ms(seconds: Optional[float]) -> Optional[float]:
+    return None if seconds is None else round(seconds * 1000, 2)
+
+
+def _cell(value: Optional[float]) -> str:
+    return '-' if value is None else f'{value:.2f}'
+
+
+if __name__ == '__main__':
+    sys.exit(main())
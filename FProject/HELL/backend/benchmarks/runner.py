@@ -0,0 +1,197 @@
+import argparse
+import json
+import os
+import platform
+import sys
+import time
+from datetime import datetime, timezone
+from typing import Callable, Dict, Any, List, Optional
+
+from .generators import generate_backlog, generate_chain
+
+DEFAULT_SIZES = (1000, 10000, 100000)
+DEFAULT_REPEAT = 3
+# Allowed throughput drop against the baseline before a case counts as a regression
+DEFAULT_TOLERANCE = 0.2
+# TaskScorer and the scalar path are per-task loops, so they are skipped above this size
+MAX_SCALAR_SIZE = 100000
+# Wanted speedup of vectorized over per-task scoring; results list the strategies short of it
+SPEEDUP_TARGET = 10.0
+STRATEGIES = ('fastest_wins', 'high_impact', 'deadline_driven', 'smart_balance', 'critical_path')
+
+
+def time_best(function: Callable[[], Any], repeat: int) -> float:
+    """Fastest of ``repeat`` wall-clock runs, in seconds"""
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def run_benchmarks(sizes=DEFAULT_SIZES, repeat: int = DEFAULT_REPEAT, seed: int = 0,
+                   include_view: bool = True, max_scalar_size: int = MAX_SCALAR_SIZE) -> Dict[str, Any]:
+    """Time every strategy, TaskScorer, dependency analysis and the analyze view on generated backlogs.
+    
+    ``strategy:*`` cases run the vectorized path from task dicts,
+    ``kernel:*`` only its kernels over prebuilt columns, and ``scalar:*``
+    the same strategies task by task. ``speedups`` and
+    ``kernel_speedups`` give the per-task time over each vectorized time
+    per strategy and size, and ``below_target`` the ``speedups`` short
+    of ``speedup_target``: from dicts, building the columns dominates.
+    """
+    from task_analyzer.scoring import DependencyGraph, ScoringContext, StrategyFactory, TaskScorer
+    from task_analyzer.scoring.batch import TaskBatch
+    
+    client = _analyze_client() if include_view else None
+    results = []
+    for size in sizes:
+        tasks = generate_backlog(size, seed)
+        context = ScoringContext()
+        
+        def record(name, seconds):
+            results.append({
+                'name': name,
+                'size': size,
+                'seconds': round(seconds, 6),
+                'tasks_per_second': round(size / seconds, 1) if seconds else None,
+            })
+        
+        for strategy_name in STRATEGIES:
+            strategy = StrategyFactory.create_strategy(strategy_name)
+            record(f'strategy:{strategy_name}',
+                   time_best(lambda: strategy.score_batch(tasks, context=context), repeat))
+        for strategy_name in STRATEGIES[:4]:
+            strategy = StrategyFactory.create_strategy(strategy_name)
+            batch = TaskBatch.from_tasks(tasks, context=context, count_dependents=strategy.uses_dependencies)
+            # Parse the due dates now, so only the kernel is timed
+            batch.urgency_band
+            record(f'kernel:{strategy_name}', time_best(lambda: strategy.score_columns(batch), repeat))
+        
+        if size <= max_scalar_size:
+            # Graph strategies score a task against the whole batch, so
+            # they have no per-task path worth timing
+            for strategy_name in STRATEGIES[:4]:
+                strategy = StrategyFactory.create_strategy(strategy_name)
+                record(f'scalar:{strategy_name}',
+                       time_best(lambda: _score_scalar(strategy, tasks, context), repeat))
+            for strategy_name in STRATEGIES[:4]:
+                scorer = TaskScorer(strategy_name)
+                record(f'task_scorer:{strategy_name}',
+                       time_best(lambda: scorer.score_batch(tasks, context=context), repeat))
+        
+        # Graphs cache their counts, so every run builds a fresh one; the
+        # chain is the worst case for the transitive walk
+        chain = generate_chain(size)
+        for name, backlog in (('graph:transitive_counts', tasks), ('graph:transitive_counts_chain', chain)):
+            record(name, time_best(lambda: DependencyGraph(backlog).transitive_dependent_counts(), repeat))
+        
+        if client is not None:
+            body = json.dumps({'tasks': tasks, 'strategy': 'smart_balance'})
+            record('view:analyze', time_best(lambda: _post_analyze(client, body), repeat))
+    
+    seconds = {(case['name'], case['size']): case['seconds'] for case in results}
+    
+    def speedups_over(prefix):
+        return {
+            f'{strategy_name}@{size}': round(seconds[('scalar:' + strategy_name, size)] /
+                                             seconds[(prefix + strategy_name, size)], 1)
+            for strategy_name in STRATEGIES for size in sizes
+            if ('scalar:' + strategy_name, size) in seconds and seconds.get((prefix + strategy_name, size))
+        }
+    
+    speedups = speedups_over('strategy:')
+    return {
+        'meta': {
+            'created_at': datetime.now(timezone.utc).isoformat(),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'seed': seed,
+            'repeat': repeat,
+        },
+        'results': results,
+        'speedups': speedups,
+        'kernel_speedups': speedups_over('kernel:'),
+        'speedup_target': SPEEDUP_TARGET,
+        'below_target': [case for case, speedup in speedups.items() if speedup < SPEEDUP_TARGET],
+    }
+
+
+def compare(results: Dict[str, Any], baseline: Dict[str, Any],
+            tolerance: float = DEFAULT_TOLERANCE) -> List[str]:
+    """Describe every case whose throughput fell more than ``tolerance`` below the baseline"""
+    expected = {(case['name'], case['size']): case for case in baseline.get('results', [])}
+    regressions = []
+    for case in results['results']:
+        reference = expected.get((case['name'], case['size']))
+        if not reference or not reference.get('tasks_per_second') or not case['tasks_per_second']:
+            continue
+        ratio = case['tasks_per_second'] / reference['tasks_per_second']
+        if ratio < 1 - tolerance:
+            regressions.append(
+                f"{case['name']} @ {case['size']}: {case['tasks_per_second']:.0f} tasks/s "
+                f"vs {reference['tasks_per_second']:.0f} baseline ({ratio:.0%})"
+            )
+    return regressions
+
+
+def _score_scalar(strategy, tasks, context) -> List[float]:
+    """The per-task path: one calculate_score call per task against a shared index"""
+    from task_analyzer.scoring import DependencyIndex
+    
+    dependency_index = DependencyIndex.from_tasks(tasks)
+    return [strategy.calculate_score(task, dependency_index, context) for task in tasks]
+
+
+def _analyze_client():
+    """Django test client for the analyze view, without a test database"""
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'task_analyzer.settings')
+    import django
+    from django.test import Client
+    
+    django.setup()
+    return Client()
+
+
+def _post_analyze(client, body: str) -> None:
+    from tasks.cache import get_result_cache
+    
+    # Time the full pipeline, not a result-cache hit
+    get_result_cache().clear()
+    response = client.post('/api/tasks/analyze/', body, content_type='application/json')
+    if response.status_code != 200:
+        raise RuntimeError(f'analyze returned {response.status_code}: {response.content[:200]!r}')
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description='Benchmark task scoring on synthetic backlogs')
+    parser.add_argument('--sizes', default=','.join(map(str, DEFAULT_SIZES)),
+                        help='comma-separated backlog sizes, e.g. 1000,10000,1000000')
+    parser.add_argument('--repeat', type=int, default=DEFAULT_REPEAT)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--no-view', action='store_true', help='skip the analyze view benchmark')
+    parser.add_argument('--output', help='write results JSON here (default: stdout)')
+    parser.add_argument('--baseline', help='results JSON to compare throughput against')
+    parser.add_argument('--tolerance', type=float, default=DEFAULT_TOLERANCE,
+                        help='allowed fractional throughput drop before failing')
+    args = parser.parse_args(argv)
+    
+    sizes = [int(size) for size in args.sizes.split(',') if size]
+    results = run_benchmarks(sizes, args.repeat, args.seed, include_view=not args.no_view)
+    
+    report = json.dumps(results, indent=2)
+    if args.output:
+        with open(args.output, 'w') as output:
+            output.write(report + '\n')
+    else:
+        print(report)
+    
+    if args.baseline:
+        with open(args.baseline) as baseline_file:
+            regressions = compare(results, json.load(baseline_file), args.tolerance)
+        for regression in regressions:
+            print(f'REGRESSION {regression}', file=sys.stderr)
+        if regressions:
+            return 1
+    return 0
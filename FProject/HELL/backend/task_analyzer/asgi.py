@@ -0,0 +1,30 @@
+"""
+ASGI config for task_analyzer project.
+
+It exposes the ASGI callable as a module-level variable named ``application``.
+Analyze and suggest are served by the async views in ``tasks.async_views``
+(see ``task_analyzer.asgi_urls``); every other endpoint is shared with WSGI.
+
+Run it with an ASGI server, e.g. ``uvicorn task_analyzer.asgi:application``
+or ``python run.py --asgi``.
+"""
+
+import os
+
+import django
+from django.core.handlers.asgi import ASGIHandler, ASGIRequest
+
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'task_analyzer.settings')
+
+
+class AsyncURLRequest(ASGIRequest):
+    # Resolved against the async URLconf instead of ROOT_URLCONF
+    urlconf = 'task_analyzer.asgi_urls'
+
+
+class ScoringASGIHandler(ASGIHandler):
+    request_class = AsyncURLRequest
+
+
+django.setup(set_prefix=False)
+application = ScoringASGIHandler()
@@ -0,0 +1,13 @@
+from django.urls import path
+
+from tasks import async_views
+
+from .urls import urlpatterns as sync_urlpatterns
+
+# URLconf of the ASGI application: analyze and suggest resolve to their
+# async views first, everything else to the same views as under WSGI
+urlpatterns = [
+    path('api/tasks/analyze/', async_views.analyze_tasks),
+    path('api/tasks/suggest/', async_views.suggest_tasks),
+    *sync_urlpatterns,
+]
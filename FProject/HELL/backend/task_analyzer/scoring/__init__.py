@@ -1,20 +1,59 @@
-# This file makes the scoring directory a Python package
-from .algorithms import TaskScorer
-from .strategies import (
-    ScoringStrategy,
-    FastestWinsStrategy,
-    HighImpactStrategy,
-    DeadlineDrivenStrategy,
-    SmartBalanceStrategy,
-    StrategyFactory
-)
-
-__all__ = [
-    'TaskScorer',
-    'ScoringStrategy',
-    'FastestWinsStrategy', 
-    'HighImpactStrategy',
-    'DeadlineDrivenStrategy',
-    'SmartBalanceStrategy',
-    'StrategyFactory'
-]
\ No newline at end of file
+# This file makes the scoring directory a Python package. It has no
+# Django dependency. Names are imported on first use (PEP 562), so
+# importing the package, or scoring tasks one at a time, does not pay
+# for NumPy or for modules the caller never touches.
+from importlib import import_module
+from typing import TYPE_CHECKING
+
+# Public name -> submodule defining it
+_EXPORTS = {
+    'TaskScorer': 'algorithms',
+    'ScoringContext': 'context',
+    'DependencyIndex': 'dependencies',
+    'DependencyGraph': 'graph',
+    'StrategySpec': 'pipeline',
+    'compile_strategy': 'pipeline',
+    'TaskTable': 'table',
+    'ScoringStrategy': 'strategies',
+    'PipelineStrategy': 'strategies',
+    'FastestWinsStrategy': 'strategies',
+    'HighImpactStrategy': 'strategies',
+    'DeadlineDrivenStrategy': 'strategies',
+    'SmartBalanceStrategy': 'strategies',
+    'CriticalPathStrategy': 'strategies',
+    'StrategyFactory': 'strategies',
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name):
+    module_name = _EXPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f'module {__name__!r} has no attribute {name!r}')
+    value = getattr(import_module(f'.{module_name}', __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
+
+
+if TYPE_CHECKING:
+    from .algorithms import TaskScorer
+    from .context import ScoringContext
+    from .dependencies import DependencyIndex
+    from .graph import DependencyGraph
+    from .pipeline import StrategySpec, compile_strategy
+    from .table import TaskTable
+    from .strategies import (
+        ScoringStrategy,
+        PipelineStrategy,
+        FastestWinsStrategy,
+        HighImpactStrategy,
+        DeadlineDrivenStrategy,
+        SmartBalanceStrategy,
+        CriticalPathStrategy,
+        StrategyFactory
+    )
@@ -0,0 +1,155 @@
+from __future__ import annotations
+
+from functools import cached_property
+from typing import TYPE_CHECKING, Dict, Any, List, Optional, Sequence
+
+from .lazy import numpy as np
+from .context import ScoringContext, NO_DUE_DATE, URGENCY_HORIZONS, ensure_context
+from .dependencies import DependencyIndex
+from .graph import DependencyGraph
+from .timing import stage
+
+if TYPE_CHECKING:
+    from .table import TaskTable
+
+
+class TaskBatch:
+    """Column view of a batch of task dicts for vectorized scoring.
+    
+    Holds one NumPy array per scoring input:
+    
+    * ``importance`` and ``estimated_hours`` as floats
+    * ``due_timestamp`` as epoch seconds (NaN when the task has no due date)
+    * ``urgency_band`` as one of the ``context`` band constants, all
+      classified against the same ScoringContext
+    * ``dependent_count`` from the batch's DependencyIndex (-1 when the
+      task has no id, which strategies score differently from 0); left at
+      zero when built with ``count_dependents=False`` for strategies that
+      ignore dependencies
+    
+    ``graph`` is the batch's DependencyGraph when built with
+    ``with_graph=True`` for strategies that walk dependency chains.
+    
+    Batches built from task dicts parse due dates on first use of
+    ``due_timestamp`` or ``urgency_band``, so strategies that ignore due
+    dates don't pay for them, just as on the scalar path.
+    """
+    
+    def __init__(self, importance: np.ndarray, estimated_hours: np.ndarray,
+                 due_timestamp: Optional[np.ndarray], dependent_count: np.ndarray,
+                 context: ScoringContext, graph: Optional[DependencyGraph] = None,
+                 tasks: Optional[List[Dict[str, Any]]] = None):
+        self.importance = importance
+        self.estimated_hours = estimated_hours
+        if due_timestamp is not None:
+            self.due_timestamp = due_timestamp
+        elif tasks is None:
+            raise ValueError('TaskBatch needs due timestamps or the tasks to read them from')
+        self.dependent_count = dependent_count
+        self.context = context
+        self.graph = graph
+        self._tasks = tasks
+    
+    @cached_property
+    def due_timestamp(self) -> np.ndarray:
+        with stage('columns'):
+            return np.array(self.context.due_timestamps([task.get('due_date') for task in self._tasks]),
+                            dtype=float)
+    
+    @cached_property
+    def urgency_band(self) -> np.ndarray:
+        return classify_urgency(self.due_timestamp, self.context)
+    
+    @classmethod
+    def from_tasks(cls, tasks: List[Dict[str, Any]],
+                   dependency_index: Optional[DependencyIndex] = None,
+                   context: Optional[ScoringContext] = None,
+                   count_dependents: bool = True,
+                   with_graph: bool = False) -> 'TaskBatch':
+        if dependency_index is None and count_dependents:
+            with stage('dependency_index'):
+                dependency_index = DependencyIndex.from_tasks(tasks)
+        context = ensure_context(context)
+        
+        with stage('columns'):
+            # One list comprehension per column is cheaper than a single
+            # pass that builds tuples and transposes them
+            importance = np.array([task.get('importance', 5) for task in tasks], dtype=float)
+            estimated_hours = np.array([task.get('estimated_hours', 1.0) for task in tasks], dtype=float)
+            if count_dependents:
+                dependent_count = np.array(
+                    dependency_index.dependent_counts([task.get('id') for task in tasks]), dtype=float)
+            else:
+                dependent_count = np.zeros(len(tasks))
+        graph = _build_graph(tasks) if with_graph else None
+        return cls(importance, estimated_hours, None, dependent_count, context, graph, tasks=tasks)
+    
+    @classmethod
+    def from_table(cls, table: 'TaskTable',
+                   dependency_index: Optional[DependencyIndex] = None,
+                   context: Optional[ScoringContext] = None,
+                   count_dependents: bool = True,
+                   with_graph: bool = False) -> 'TaskBatch':
+        """Wrap a TaskTable's columns; hours and due dates are not copied"""
+        if dependency_index is None and count_dependents:
+            with stage('dependency_index'):
+                dependency_index = table.dependency_index()
+        context = ensure_context(context)
+        
+        importance = np.frombuffer(table.importance, dtype=_ARRAY_DTYPES[table.importance.typecode])
+        if importance.dtype != float:
+            importance = importance.astype(float)
+        estimated_hours = np.frombuffer(table.estimated_hours, dtype=float)
+        due_timestamps = np.frombuffer(table.due_timestamp, dtype=float)
+        if count_dependents:
+            dependent_count = np.array(dependency_index.dependent_counts(table.ids), dtype=float)
+        else:
+            dependent_count = np.zeros(len(table))
+        graph = _build_graph(table) if with_graph else None
+        return cls(importance, estimated_hours, due_timestamps, dependent_count, context, graph)
+    
+    @property
+    def hours_until_due(self) -> np.ndarray:
+        return (self.due_timestamp - self.context.timestamp) / 3600
+    
+    def next_band_change(self, horizons: Sequence[float] = URGENCY_HORIZONS) -> np.ndarray:
+        """Epoch seconds at which each task's urgency band next changes.
+        
+        Bands switch when the time left reaches each of ``horizons``
+        hours (168h, 72h, 24h and 0h by default; custom strategies set
+        their own), so this is the earliest of those instants after the
+        reference time; NaN for tasks with no due date or no such instant
+        left.
+        """
+        if not horizons:
+            return np.full(len(self), np.nan)
+        offsets = np.array(horizons, dtype=float) * 3600
+        boundaries = self.due_timestamp[:, np.newaxis] - offsets
+        upcoming = np.where(boundaries > self.context.timestamp, boundaries, np.inf)
+        next_change = upcoming.min(axis=1)
+        return np.where(np.isinf(next_change), np.nan, next_change)
+    
+    def valid_until(self, horizons: Sequence[float] = URGENCY_HORIZONS) -> Optional[float]:
+        """Epoch seconds until which the batch's scores stay correct, None if forever"""
+        next_changes = self.next_band_change(horizons)
+        if not len(next_changes) or np.isnan(next_changes).all():
+            return None
+        return float(np.nanmin(next_changes))
+    
+    def __len__(self) -> int:
+        return len(self.importance)
+
+
+def _build_graph(tasks) -> DependencyGraph:
+    with stage('graph'):
+        return DependencyGraph(tasks)
+
+
+# numpy dtypes of the array module typecodes TaskTable uses
+_ARRAY_DTYPES = {'b': 'int8', 'd': 'float64'}
+
+
+def classify_urgency(due_timestamp: np.ndarray, context: ScoringContext) -> np.ndarray:
+    """Vectorized ScoringContext.urgency_band over epoch-second due dates"""
+    bands = np.searchsorted(context.cutoffs, due_timestamp, side='left')
+    return np.where(np.isnan(due_timestamp), NO_DUE_DATE, bands)
@@ -0,0 +1,95 @@
+import hashlib
+import json
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional
+
+# Default number of results kept by the in-process backend
+DEFAULT_MAX_ENTRIES = 256
+
+
+class LRUCacheBackend:
+    """Thread-safe in-process store with LRU eviction and per-entry expiry"""
+    
+    def __init__(self, max_entries: int = DEFAULT_MAX_ENTRIES):
+        self.max_entries = max_entries
+        self._entries: 'OrderedDict[str, tuple]' = OrderedDict()
+        self._lock = threading.Lock()
+    
+    def get(self, key: str) -> Optional[Any]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires_at, value = entry
+            if expires_at is not None and expires_at <= time.time():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value
+    
+    def set(self, key: str, value: Any, expires_at: Optional[float] = None) -> None:
+        with self._lock:
+            self._entries[key] = (expires_at, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+    
+    def delete(self, key: str) -> bool:
+        with self._lock:
+            return self._entries.pop(key, None) is not None
+    
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+    
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class ResultCache:
+    """Cache of analysis results keyed on a canonical hash of the request.
+    
+    Entries carry an expiry: the earliest instant at which any task's
+    urgency band can change, or the end of the current minute for
+    strategies whose scores drift continuously (see
+    ScoringStrategy.valid_until). An entry therefore stops being served
+    as soon as a rescore could give a different answer, with no TTL tuning.
+    Backends implement ``get(key)``, ``set(key, value, expires_at)`` and
+    ``clear()``.
+    """
+    
+    def __init__(self, backend=None):
+        self.backend = backend if backend is not None else LRUCacheBackend()
+        self.hits = 0
+        self.misses = 0
+    
+    @staticmethod
+    def make_key(tasks: Any, strategy: Any, **options: Any) -> str:
+        """Stable hash of the task list, strategy and any result-shaping options"""
+        canonical = json.dumps(
+            {'tasks': tasks, 'strategy': strategy, 'options': options},
+            sort_keys=True, separators=(',', ':'), default=str
+        )
+        return 'analyze:' + hashlib.sha256(canonical.encode()).hexdigest()
+    
+    def get(self, key: str) -> Optional[Any]:
+        value = self.backend.get(key)
+        if value is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return value
+    
+    def set(self, key: str, value: Any, expires_at: Optional[float] = None) -> None:
+        if expires_at is not None and expires_at <= time.time():
+            return
+        self.backend.set(key, value, expires_at)
+    
+    def clear(self) -> None:
+        self.backend.clear()
+        self.hits = self.misses = 0
+    
+    def stats(self) -> Dict[str, int]:
+        return {'hits': self.hits, 'misses': self.misses}
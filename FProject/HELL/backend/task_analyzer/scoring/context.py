@@ -0,0 +1,97 @@
+import math
+from bisect import bisect_left
+from datetime import date, datetime
+from typing import Callable, Iterable, List, Optional, Union
+
+# Urgency bands, in the order the strategies' point tables are laid out
+PAST_DUE = 0
+DUE_WITHIN_24H = 1
+DUE_WITHIN_72H = 2
+DUE_WITHIN_168H = 3
+DUE_LATER = 4
+NO_DUE_DATE = 5
+
+# Band boundaries in hours from the reference time
+URGENCY_HORIZONS = (0, 24, 72, 168)
+
+Clock = Callable[[], datetime]
+DueDate = Union[datetime, date, str]
+
+
+def system_clock() -> datetime:
+    return datetime.now().astimezone()
+
+
+def parse_due_date(value: Optional[DueDate]) -> Optional[datetime]:
+    """Parse an ISO 8601 string (or a plain date) into a datetime"""
+    if not value or isinstance(value, datetime):
+        return value or None
+    if isinstance(value, date):
+        return datetime(value.year, value.month, value.day)
+    if not isinstance(value, str):
+        raise TypeError(f'due_date must be an ISO 8601 string, not {type(value).__name__}')
+    if value.endswith('Z'):
+        value = value[:-1] + '+00:00'
+    return datetime.fromisoformat(value)
+
+
+class ScoringContext:
+    """Single reference time shared by every task scored in one analysis run.
+    
+    The 24h/72h/168h band boundaries are precomputed as absolute epoch
+    timestamps, so classifying a due date is one bisect instead of a
+    ``datetime.now()`` call and a timedelta per task. Pass ``now`` or a
+    ``clock`` to make runs reproducible.
+    """
+    
+    def __init__(self, now: Optional[datetime] = None, clock: Optional[Clock] = None):
+        if now is None:
+            now = (clock or system_clock)()
+        if now.tzinfo is None:
+            now = now.astimezone()
+        self.now = now
+        self.timezone = now.tzinfo
+        self.timestamp = now.timestamp()
+        self.cutoffs = [self.timestamp + hours * 3600 for hours in URGENCY_HORIZONS]
+    
+    def due_timestamp(self, due_date: DueDate) -> float:
+        """Epoch seconds of a due date; naive dates are read in the reference timezone"""
+        if not isinstance(due_date, datetime):
+            due_date = parse_due_date(due_date)
+        if due_date.tzinfo is None:
+            due_date = due_date.replace(tzinfo=self.timezone)
+        return due_date.timestamp()
+    
+    def due_timestamps(self, due_dates: Iterable[Optional[DueDate]]) -> List[float]:
+        """``due_timestamp`` of many due dates, NaN where there is none.
+        
+        Offset-aware and naive ISO strings, the common case in request
+        bodies, are parsed inline; anything else goes through
+        ``due_timestamp``.
+        """
+        fromisoformat = datetime.fromisoformat
+        due_timestamp = self.due_timestamp
+        reference_timezone = self.timezone
+        nan = math.nan
+        
+        def timestamp(due_date):
+            if due_date.__class__ is str and due_date[-1] != 'Z':
+                parsed = fromisoformat(due_date)
+                if parsed.tzinfo is None:
+                    parsed = parsed.replace(tzinfo=reference_timezone)
+                return parsed.timestamp()
+            return due_timestamp(due_date)
+        return [timestamp(due_date) if due_date else nan for due_date in due_dates]
+    
+    def hours_until(self, due_date: DueDate) -> float:
+        return (self.due_timestamp(due_date) - self.timestamp) / 3600
+    
+    def urgency_band(self, due_date: Optional[DueDate]) -> int:
+        """Classify a due date into one of the urgency band constants above"""
+        if not due_date:
+            return NO_DUE_DATE
+        return bisect_left(self.cutoffs, self.due_timestamp(due_date))
+
+
+def ensure_context(context: Optional[ScoringContext]) -> ScoringContext:
+    return context if context is not None else ScoringContext()
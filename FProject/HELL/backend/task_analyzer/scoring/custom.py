@@ -0,0 +1,194 @@
+import hashlib
+import json
+import math
+from typing import Any, Dict, List, Mapping, Optional
+
+from .cache import LRUCacheBackend
+from .pipeline import Band, ScoringPipeline, StrategySpec
+from .strategies import PipelineStrategy
+
+# Compiled custom strategies kept in memory, least recently used evicted first
+DEFAULT_MAX_STRATEGIES = 1024
+
+MAX_WEIGHT = 1000.0
+MAX_THRESHOLDS = 16
+
+# Definition factor -> (pipeline field, default band thresholds, whether a
+# value on a threshold falls in the band below, whether higher bands score more)
+FACTORS = {
+    'importance': ('importance', (3, 5, 7, 9), False, True),
+    'urgency': ('hours_until_due', (0, 24, 72, 168), True, False),
+    'effort': ('estimated_hours', (1, 4, 8, 16), True, False),
+    'dependencies': ('dependents', (1, 2, 3), False, True),
+}
+
+# Share of the urgency weight given to tasks without a due date
+DEFAULT_NO_DEADLINE = 0.3
+
+DEFINITION_KEYS = {'weights', 'thresholds', 'levels', 'no_deadline', 'cap'}
+
+
+def normalize_definition(definition: Mapping[str, Any]) -> Dict[str, Any]:
+    """Validate a custom strategy definition and fill in its defaults.
+    
+    A definition looks like::
+        
+        {"weights": {"importance": 40, "urgency": 35, "effort": 15, "dependencies": 10},
+         "thresholds": {"effort": [2, 6]},
+         "levels": {"effort": [1, 0.6, 0.2]},
+         "no_deadline": 0.3, "cap": 100}
+    
+    Each weighted factor scores ``weight * level`` for the band its value
+    falls in. Thresholds are band edges (hours until due for urgency,
+    hours for effort, dependent counts for dependencies); levels are the
+    0-1 share of the weight per band and default to evenly spaced steps,
+    rising for importance and dependencies and falling for urgency and
+    effort. Raises ValueError describing the first problem found.
+    """
+    if not isinstance(definition, Mapping):
+        raise ValueError('Strategy definition must be an object')
+    unknown = set(definition) - DEFINITION_KEYS
+    if unknown:
+        raise ValueError(f'Unknown strategy definition keys: {", ".join(sorted(unknown))}')
+    
+    weights = _factor_mapping(definition, 'weights')
+    if not weights:
+        raise ValueError('weights must give at least one of: ' + ', '.join(FACTORS))
+    thresholds = _factor_mapping(definition, 'thresholds')
+    levels = _factor_mapping(definition, 'levels')
+    
+    normalized: Dict[str, Any] = {'weights': {}, 'thresholds': {}, 'levels': {}}
+    for factor, (_, default_edges, _, rising) in FACTORS.items():
+        weight = _number(weights.get(factor, 0), f'weights.{factor}', 0, MAX_WEIGHT)
+        if not weight:
+            continue
+        edges = [_number(edge, f'thresholds.{factor}') for edge in _list(thresholds.get(factor, default_edges),
+                                                                          f'thresholds.{factor}')]
+        if len(edges) > MAX_THRESHOLDS:
+            raise ValueError(f'thresholds.{factor} allows at most {MAX_THRESHOLDS} values')
+        if any(a >= b for a, b in zip(edges, edges[1:])):
+            raise ValueError(f'thresholds.{factor} must be strictly increasing')
+        bands = len(edges) + 1
+        if factor in levels:
+            shares = [_number(level, f'levels.{factor}', 0, 1) for level in _list(levels[factor], f'levels.{factor}')]
+            if len(shares) != bands:
+                raise ValueError(f'levels.{factor} needs {bands} values, one per band')
+        else:
+            steps = range(1, bands + 1) if rising else range(bands, 0, -1)
+            shares = [step / bands for step in steps]
+        normalized['weights'][factor] = weight
+        normalized['thresholds'][factor] = edges
+        normalized['levels'][factor] = shares
+    
+    normalized['no_deadline'] = _number(definition.get('no_deadline', DEFAULT_NO_DEADLINE), 'no_deadline', 0, 1)
+    cap = definition.get('cap', 100.0)
+    normalized['cap'] = None if cap is None else _number(cap, 'cap', 0)
+    return normalized
+
+
+def definition_key(definition: Mapping[str, Any]) -> str:
+    """Stable hash of a definition, whatever its key order"""
+    canonical = json.dumps(definition, sort_keys=True, separators=(',', ':'), default=str)
+    return hashlib.sha256(canonical.encode()).hexdigest()
+
+
+def build_spec(name: str, definition: Mapping[str, Any]) -> StrategySpec:
+    """StrategySpec of a normalized definition: one Band per weighted factor.
+    
+    Components are ordered heaviest first, so explanations lead with the
+    factor that weighs most.
+    """
+    components = []
+    for factor, weight in sorted(definition['weights'].items(), key=lambda item: -item[1]):
+        field, _, right, _ = FACTORS[factor]
+        points = [weight * level for level in definition['levels'][factor]]
+        if factor == 'urgency':
+            missing = weight * definition['no_deadline']
+        elif factor == 'dependencies':
+            # Tasks without an id can't have dependents
+            missing = points[0]
+        else:
+            missing = None
+        components.append(Band(field, points, edges=definition['thresholds'][factor],
+                               right=right, missing=missing))
+    return StrategySpec(name, components, cap=definition['cap'])
+
+
+class CustomStrategyCache:
+    """Compiled custom strategies keyed by a hash of their definition.
+    
+    Identical definitions, whichever request or profile they come from,
+    share one compiled PipelineStrategy; at most ``max_entries`` are
+    kept, least recently used evicted first.
+    """
+    
+    def __init__(self, max_entries: int = DEFAULT_MAX_STRATEGIES):
+        self.backend = LRUCacheBackend(max_entries)
+        self.hits = 0
+        self.misses = 0
+    
+    def get(self, definition: Mapping[str, Any]) -> PipelineStrategy:
+        # Hits are looked up by the definition as sent, so they skip
+        # validation; the strategy is named after the normalized one
+        key = definition_key(definition)
+        strategy = self.backend.get(key)
+        if strategy is not None:
+            self.hits += 1
+            return strategy
+        
+        self.misses += 1
+        normalized = normalize_definition(definition)
+        spec = build_spec(f'custom:{definition_key(normalized)[:12]}', normalized)
+        strategy = PipelineStrategy(spec, ScoringPipeline(spec))
+        self.backend.set(key, strategy)
+        return strategy
+    
+    def clear(self) -> None:
+        self.backend.clear()
+        self.hits = self.misses = 0
+    
+    def __len__(self) -> int:
+        return len(self.backend)
+
+
+_custom_strategies = CustomStrategyCache()
+
+
+def get_custom_strategy(definition: Mapping[str, Any]) -> PipelineStrategy:
+    """Compiled strategy of a definition from the process-wide cache"""
+    return _custom_strategies.get(definition)
+
+
+def configure(max_entries: int) -> None:
+    """Resize the process-wide cache (drops every cached strategy)"""
+    global _custom_strategies
+    _custom_strategies = CustomStrategyCache(max_entries)
+
+
+def custom_strategy_cache() -> CustomStrategyCache:
+    return _custom_strategies
+
+
+def _factor_mapping(definition: Mapping[str, Any], key: str) -> Mapping[str, Any]:
+    value = definition.get(key) or {}
+    if not isinstance(value, Mapping):
+        raise ValueError(f'{key} must be an object')
+    unknown = set(value) - set(FACTORS)
+    if unknown:
+        raise ValueError(f'Unknown {key} factors: {", ".join(sorted(unknown))}')
+    return value
+
+
+def _list(value: Any, name: str) -> List[Any]:
+    if not isinstance(value, (list, tuple)):
+        raise ValueError(f'{name} must be a list')
+    return list(value)
+
+
+def _number(value: Any, name: str, low: Optional[float] = None, high: Optional[float] = None) -> float:
+    if isinstance(value, bool) or not isinstance(value, (int, float)) or not math.isfinite(value):
+        raise ValueError(f'{name} must be a number')
+    if (low is not None and value < low) or (high is not None and value > high):
+        raise ValueError(f'{name} must be between {low} and {high}' if high is not None
+                         else f'{name} must be at least {low}')
+    return float(value)
@@ -0,0 +1,76 @@
+from collections import Counter
+from itertools import chain
+from typing import Dict, Any, List, Iterable, Hashable, Optional, Union
+
+
+class DependencyIndex:
+    """Reverse dependency counts built once per analysis batch.
+    
+    Maps each task id to the number of tasks that list it in their
+    ``dependencies``, so strategies can look up dependent counts in O(1)
+    instead of scanning the whole batch for every task.
+    """
+    
+    def __init__(self):
+        self._counts: Counter = Counter()
+    
+    @classmethod
+    def from_tasks(cls, tasks: Iterable[Dict[str, Any]]) -> 'DependencyIndex':
+        index = cls()
+        # A task listing the same dependency twice still counts once
+        index._counts.update(chain.from_iterable(
+            _unique(dependencies)
+            for dependencies in (task.get('dependencies') for task in tasks)
+            if dependencies
+        ))
+        return index
+    
+    @classmethod
+    def from_counts(cls, counts: Dict[Hashable, int]) -> 'DependencyIndex':
+        """Wrap dependent counts computed elsewhere, e.g. by a database query"""
+        index = cls()
+        index._counts.update(counts)
+        return index
+    
+    def add(self, task: Dict[str, Any]) -> None:
+        """Register the dependency edges of a single task"""
+        dependencies = task.get('dependencies')
+        if dependencies:
+            self._counts.update(_unique(dependencies))
+    
+    def remove(self, task: Dict[str, Any]) -> None:
+        """Unregister the edges ``add`` registered for the same task"""
+        dependencies = task.get('dependencies')
+        if dependencies:
+            for task_id in _unique(dependencies):
+                self._counts[task_id] -= 1
+                if self._counts[task_id] <= 0:
+                    del self._counts[task_id]
+    
+    def dependent_count(self, task_id: Hashable) -> int:
+        return self._counts.get(task_id, 0)
+    
+    def dependent_counts(self, task_ids: Iterable[Optional[Hashable]]) -> List[int]:
+        """``dependent_count`` of many ids in one pass; -1 for tasks without an id"""
+        get = self._counts.get
+        return [get(task_id, 0) if task_id else -1 for task_id in task_ids]
+    
+    def __contains__(self, task_id: Hashable) -> bool:
+        return task_id in self._counts
+    
+    def __len__(self) -> int:
+        return len(self._counts)
+
+
+TaskCollection = Union[List[Dict[str, Any]], DependencyIndex]
+
+
+def ensure_index(all_tasks: TaskCollection) -> DependencyIndex:
+    """Return ``all_tasks`` as a DependencyIndex, building one from a list if needed"""
+    if isinstance(all_tasks, DependencyIndex):
+        return all_tasks
+    return DependencyIndex.from_tasks(all_tasks or [])
+
+
+def _unique(dependencies: List[Hashable]) -> Iterable[Hashable]:
+    return dependencies if len(dependencies) == 1 else set(dependencies)
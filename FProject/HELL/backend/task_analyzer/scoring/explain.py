@@ -0,0 +1,120 @@
+from __future__ import annotations
+
+from functools import lru_cache
+from itertools import product
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from .lazy import numpy as np
+from .batch import TaskBatch, classify_urgency
+from .context import ScoringContext, ensure_context
+
+# Inclusive upper bounds of every band but the last, and the phrase for
+# each band. Importance 1-3 is low, 4-6 medium, 7-8 high and 9-10 critical.
+IMPORTANCE_EDGES = (3, 6, 8)
+IMPORTANCE_PHRASES = ('low importance', 'medium importance', 'high importance', 'critical importance')
+
+# Up to 1h, up to 4h, up to a working day and longer
+EFFORT_EDGES = (1, 4, 8)
+EFFORT_PHRASES = ('quick (up to 1h)', 'short (up to 4h)', 'up to a day of work', 'multi-day effort')
+
+# Indexed by the ScoringContext urgency band constants
+URGENCY_PHRASES = ('past due', 'due within 24h', 'due within 3 days', 'due within a week',
+                   'due later', 'no deadline')
+
+DEPENDENT_PHRASES = (None, 'unblocks other tasks')
+
+# Label that opens the explanations of each built-in strategy
+STRATEGY_LABELS = {
+    'fastest_wins': 'Quick wins strategy',
+    'high_impact': 'High impact focus',
+    'deadline_driven': 'Deadline driven',
+    'smart_balance': 'Smart balanced approach',
+    'critical_path': 'Critical path',
+}
+
+FACTOR_PHRASES = {
+    'importance': IMPORTANCE_PHRASES,
+    'effort': EFFORT_PHRASES,
+    'urgency': URGENCY_PHRASES,
+    'dependents': DEPENDENT_PHRASES,
+}
+
+
+class ExplanationTemplates:
+    """Every explanation a strategy can give, rendered once.
+    
+    A task's explanation depends only on which band each of the
+    strategy's factors falls into, so all band combinations are formatted
+    up front and stored in a flat list indexed by the mixed-radix code of
+    the band tuple. Explaining a task is then a band lookup, and
+    explaining a batch is a few vectorized ``searchsorted`` calls plus
+    one list index per returned task.
+    """
+    
+    def __init__(self, label: str, factors: Sequence[str]):
+        self.label = label
+        self.factors = tuple(factors)
+        self.radices = tuple(len(FACTOR_PHRASES[factor]) for factor in self.factors)
+        self.templates: Dict[Tuple[int, ...], str] = {}
+        for bands in product(*(range(radix) for radix in self.radices)):
+            phrases = [FACTOR_PHRASES[factor][band] for factor, band in zip(self.factors, bands)]
+            self.templates[bands] = f"{label}: {', '.join(p for p in phrases if p)}"
+        # product() enumerates band tuples in mixed-radix code order
+        self._by_code = list(self.templates.values())
+    
+    def explain_batch(self, batch: TaskBatch, positions: Optional[Sequence[int]] = None) -> List[str]:
+        """Explanations for ``positions`` of a batch (all tasks when None)"""
+        if positions is None:
+            positions = np.arange(len(batch))
+        positions = np.asarray(positions, dtype=np.intp)
+        codes = np.zeros(len(positions), dtype=np.intp)
+        for factor, radix in zip(self.factors, self.radices):
+            codes = codes * radix + _batch_bands(factor, batch, positions)
+        by_code = self._by_code
+        return [by_code[code] for code in codes.tolist()]
+    
+    def explain(self, task: Dict[str, Any], context: Optional[ScoringContext] = None,
+                dependent_count: int = 0) -> str:
+        """Explanation for one task dict"""
+        bands = []
+        for factor in self.factors:
+            if factor == 'importance':
+                bands.append(_band(task.get('importance', 5), IMPORTANCE_EDGES))
+            elif factor == 'effort':
+                bands.append(_band(task.get('estimated_hours', 1.0), EFFORT_EDGES))
+            elif factor == 'urgency':
+                bands.append(ensure_context(context).urgency_band(task.get('due_date')))
+            else:
+                bands.append(int(dependent_count > 0))
+        return self.templates[tuple(bands)]
+
+
+# Template tables kept; each is small, but labels include profile names
+MAX_TEMPLATE_TABLES = 1024
+
+
+@lru_cache(maxsize=MAX_TEMPLATE_TABLES)
+def explanation_templates(label: str, factors: Tuple[str, ...]) -> ExplanationTemplates:
+    """The shared template table of a label and factors, built on first use"""
+    return ExplanationTemplates(label, factors)
+
+
+def strategy_templates(strategy, label: str) -> ExplanationTemplates:
+    """Templates explaining the factors of a strategy's spec, most decisive first"""
+    spec = getattr(strategy, 'spec', None)
+    return explanation_templates(label, spec.factors if spec else ('importance', 'effort'))
+
+
+def _band(value: float, edges: Sequence[float]) -> int:
+    # A value on an edge belongs to the band below it, as in searchsorted(side='left')
+    return sum(value > edge for edge in edges)
+
+
+def _batch_bands(factor: str, batch: TaskBatch, positions: np.ndarray) -> np.ndarray:
+    if factor == 'importance':
+        return np.searchsorted(IMPORTANCE_EDGES, batch.importance[positions], side='left')
+    if factor == 'effort':
+        return np.searchsorted(EFFORT_EDGES, batch.estimated_hours[positions], side='left')
+    if factor == 'urgency':
+        return classify_urgency(batch.due_timestamp[positions], batch.context)
+    return (batch.dependent_count[positions] > 0).astype(np.intp)
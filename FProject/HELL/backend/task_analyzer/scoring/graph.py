@@ -0,0 +1,279 @@
+from typing import TYPE_CHECKING, Dict, Any, Hashable, Iterable, List, Optional, Sequence, Union
+
+if TYPE_CHECKING:
+    from .table import TaskTable
+
+# int.bit_count only exists on Python 3.10+
+_popcount = getattr(int, 'bit_count', None) or (lambda value: bin(value).count('1'))
+
+
+class DependencyGraph:
+    """Validated dependency graph of one analysis batch.
+    
+    Validated in linear time with Kahn's algorithm plus an iterative
+    Tarjan walk over anything left in a cycle (no recursion, so 100k-task
+    chains are fine). Edges point from a
+    dependency to the tasks that depend on it. The graph exposes:
+    
+    * ``cycles``: lists of task ids that depend on each other
+    * ``unknown_dependencies``: task id -> dependency ids not in the batch
+    * ``duplicate_ids``: ids used by more than one task (first one wins)
+    * ``order``: batch positions in dependency order, skipping blocked tasks
+    * ``blocked``: positions that can never start because they sit in or
+      downstream of a cycle
+    
+    Nodes are batch positions, so tasks without an id still take part.
+    Accepts task dicts or a TaskTable.
+    """
+    
+    def __init__(self, tasks: Union[List[Dict[str, Any]], 'TaskTable']):
+        self.size = len(tasks)
+        if hasattr(tasks, 'dependency_lists'):
+            self.ids: List[Optional[Hashable]] = list(tasks.ids)
+            dependency_lists: Iterable[Any] = tasks.dependency_lists()
+        else:
+            self.ids = [task.get('id') for task in tasks]
+            dependency_lists = (task.get('dependencies') for task in tasks)
+        self.position_of: Dict[Hashable, int] = {}
+        self.duplicate_ids: List[Hashable] = []
+        for position, task_id in enumerate(self.ids):
+            if task_id is None:
+                continue
+            if task_id in self.position_of:
+                self.duplicate_ids.append(task_id)
+            else:
+                self.position_of[task_id] = position
+        
+        size = self.size
+        # Most tasks have no edges, so they share one empty tuple
+        dependents: List[Sequence[int]] = [()] * size
+        prerequisites: List[Sequence[int]] = [()] * size
+        self.unknown_dependencies: Dict[Hashable, List[Hashable]] = {}
+        position_of = self.position_of
+        for position, dependencies in enumerate(dependency_lists):
+            if not dependencies:
+                continue
+            known = [position_of.get(dependency_id, -1) for dependency_id in dependencies]
+            if -1 in known:
+                self.unknown_dependencies[self.ids[position]] = [
+                    dependency_id for dependency_id in dict.fromkeys(dependencies)
+                    if dependency_id not in position_of
+                ]
+                known = [dependency for dependency in known if dependency != -1]
+            if len(known) > 1 and len(set(known)) != len(known):
+                known = list(dict.fromkeys(known))
+            prerequisites[position] = known
+            for dependency in known:
+                if dependents[dependency]:
+                    dependents[dependency].append(position)
+                else:
+                    dependents[dependency] = [position]
+        self.dependents = dependents
+        self.prerequisites = prerequisites
+        self.edge_count = sum(map(len, prerequisites))
+        
+        self._find_components()
+    
+    def _find_components(self) -> None:
+        """Kahn's algorithm, then Tarjan over whatever it could not order.
+        
+        Kahn settles every task that is not in or behind a cycle; the
+        iterative Tarjan walk only visits the leftovers, which is usually
+        nothing, to split them into strongly connected components.
+        """
+        size = self.size
+        dependents = self.dependents
+        waiting = [len(prerequisites) for prerequisites in self.prerequisites]
+        order = [position for position in range(size) if not waiting[position]]
+        for node in order:
+            for successor in dependents[node]:
+                waiting[successor] -= 1
+                if not waiting[successor]:
+                    order.append(successor)
+        self.order = order
+        self.blocked = [position for position in range(size) if waiting[position]]
+        
+        # Components in completion order: blocked ones as Tarjan emits them
+        # (dependents first), then the ordered tasks back to front
+        components = self._strongly_connected(self.blocked, waiting) if self.blocked else []
+        self.cycles = [[self.ids[member] for member in reversed(component)]
+                       for component in components
+                       if len(component) > 1 or component[0] in dependents[component[0]]]
+        components.extend([position] for position in reversed(order))
+        self._components = components
+        self._transitive_counts: Optional[List[int]] = None
+    
+    def _strongly_connected(self, nodes: List[int], in_residual: List[int]) -> List[List[int]]:
+        """Iterative Tarjan SCC restricted to ``nodes``, dependents-first"""
+        dependents = self.dependents
+        index: Dict[int, int] = {}
+        low: Dict[int, int] = {}
+        on_stack = set()
+        stack: List[int] = []
+        components: List[List[int]] = []
+        
+        for root in nodes:
+            if root in index:
+                continue
+            index[root] = low[root] = len(index)
+            stack.append(root)
+            on_stack.add(root)
+            work = [(root, 0)]
+            while work:
+                node, next_edge = work[-1]
+                edges = dependents[node]
+                if next_edge < len(edges):
+                    work[-1] = (node, next_edge + 1)
+                    successor = edges[next_edge]
+                    if not in_residual[successor]:
+                        continue
+                    if successor not in index:
+                        index[successor] = low[successor] = len(index)
+                        stack.append(successor)
+                        on_stack.add(successor)
+                        work.append((successor, 0))
+                    elif successor in on_stack and index[successor] < low[node]:
+                        low[node] = index[successor]
+                    continue
+                
+                work.pop()
+                if work:
+                    parent = work[-1][0]
+                    if low[node] < low[parent]:
+                        low[parent] = low[node]
+                if low[node] == index[node]:
+                    component = []
+                    while True:
+                        member = stack.pop()
+                        on_stack.discard(member)
+                        component.append(member)
+                        if member == node:
+                            break
+                    components.append(component)
+        return components
+    
+    @property
+    def has_issues(self) -> bool:
+        return bool(self.cycles or self.unknown_dependencies or self.duplicate_ids)
+    
+    def ready(self) -> List[int]:
+        """Positions with no prerequisites in the batch"""
+        return [position for position, prerequisites in enumerate(self.prerequisites)
+                if not prerequisites]
+    
+    def direct_dependent_count(self, position: int) -> int:
+        return len(self.dependents[position])
+    
+    def transitive_dependent_counts(self) -> List[int]:
+        """How many tasks each task ultimately unblocks, per batch position.
+        
+        Computed once over the component DAG, successors first. A component
+        with a single successor component adds that component's size and
+        count to its own and only links to it, so chains cost O(n) time and
+        memory. Bitsets of reachable tasks (bits numbered in completion
+        order) are built only where branches merge, following links down
+        to the nearest bitset, and dropped once every predecessor has used
+        them; backlogs that keep merging still cost up to O(n) bits per
+        merge. Members of a cycle count each other.
+        """
+        if self._transitive_counts is not None:
+            return self._transitive_counts
+        
+        components = self._components
+        dependents = self.dependents
+        component_of = [0] * self.size
+        first_bit = [0] * len(components)
+        bit = 0
+        for number, component in enumerate(components):
+            first_bit[number] = bit
+            bit += len(component)
+            for member in component:
+                component_of[member] = number
+        
+        def successors(number: int) -> set:
+            following = {component_of[successor]
+                         for member in components[number] for successor in dependents[member]}
+            following.discard(number)
+            return following
+        
+        # Predecessor components yet to use each component's reach
+        users = [0] * len(components)
+        for number in range(len(components)):
+            for other in successors(number):
+                users[other] += 1
+        
+        # A component's reach is either a bitset or a link to its only
+        # successor component (link >= 0); unblocked counts its tasks
+        reach: List[Optional[int]] = [0] * len(components)
+        link = [-1] * len(components)
+        unblocked = [0] * len(components)
+        
+        def release(number: int) -> None:
+            """One user of ``number`` is done with it; free it after the last"""
+            users[number] -= 1
+            while not users[number]:
+                reach[number] = None
+                number, chained = link[number], number
+                link[chained] = -1
+                if number < 0:
+                    return
+                users[number] -= 1
+        
+        def bitset(number: int) -> int:
+            """Reach of ``number`` as a bitset, built from its links on first use"""
+            if link[number] < 0:
+                return reach[number]
+            chain = [link[number]]
+            while link[chain[-1]] >= 0:
+                chain.append(link[chain[-1]])
+            # Links point to earlier components, so the first one has the top bits
+            top = chain[0]
+            bits = bytearray((first_bit[top] + len(components[top])) // 8 + 1)
+            for other in chain:
+                for position in range(first_bit[other], first_bit[other] + len(components[other])):
+                    bits[position >> 3] |= 1 << (position & 7)
+            value = reach[chain[-1]] | int.from_bytes(bits, 'little')
+            # Keep it for this component's other users instead of the chain
+            reach[number] = value
+            chained = link[number]
+            link[number] = -1
+            release(chained)
+            return value
+        
+        counts = [0] * self.size
+        for number, component in enumerate(components):
+            following = successors(number)
+            if len(following) == 1:
+                other, = following
+                link[number] = other
+                unblocked[number] = unblocked[other] + len(components[other])
+            elif following:
+                reachable = 0
+                for other in following:
+                    own = ((1 << len(components[other])) - 1) << first_bit[other]
+                    reachable |= bitset(other) | own
+                    release(other)
+                reach[number] = reachable
+                unblocked[number] = _popcount(reachable)
+            total = unblocked[number] + len(component) - 1
+            for member in component:
+                counts[member] = total
+            if not users[number]:
+                # Nothing upstream will ask for it
+                users[number] = 1
+                release(number)
+        
+        self._transitive_counts = counts
+        return counts
+    
+    def issues(self) -> Dict[str, Any]:
+        """JSON-friendly summary of what is wrong with the batch, empty if nothing"""
+        issues: Dict[str, Any] = {}
+        if self.cycles:
+            issues['cycles'] = self.cycles
+            issues['blocked'] = [self.ids[position] for position in self.blocked]
+        if self.unknown_dependencies:
+            issues['unknown_dependencies'] = self.unknown_dependencies
+        if self.duplicate_ids:
+            issues['duplicate_ids'] = self.duplicate_ids
+        return issues
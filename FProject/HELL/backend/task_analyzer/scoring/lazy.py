@@ -0,0 +1,51 @@
+import importlib
+import threading
+from types import ModuleType
+from typing import Any
+
+
+class _LazyModule(ModuleType):
+    """Stand-in for a module that is imported on first attribute access.
+    
+    The first access imports the real module under a lock and copies its
+    namespace in, so later accesses are plain attribute lookups. Unlike
+    ``importlib.util.LazyLoader``, whose first load is not thread-safe
+    before Python 3.12, threads racing on the first access all see the
+    fully imported module. The stand-in is never put in ``sys.modules``;
+    other importers get the real module as usual.
+    """
+    
+    def __init__(self, name: str):
+        super().__init__(name)
+        self.__dict__['_lazy_lock'] = threading.Lock()
+        self.__dict__['_lazy_module'] = None
+    
+    def __getattr__(self, attribute: str) -> Any:
+        # Only reached for names not copied in yet (or not in the module at all)
+        module = self.__dict__['_lazy_module']
+        if module is None:
+            with self.__dict__['_lazy_lock']:
+                module = self.__dict__['_lazy_module']
+                if module is None:
+                    module = importlib.import_module(self.__name__)
+                    namespace = {key: value for key, value in vars(module).items()
+                                 if key not in ('__name__', '__spec__', '__loader__')}
+                    self.__dict__.update(namespace)
+                    self.__dict__['_lazy_module'] = module
+        return getattr(module, attribute)
+
+
+def lazy_import(name: str) -> ModuleType:
+    """``name`` as a module that is only imported on first attribute access.
+    
+    Importing NumPy costs more than the rest of the scoring package put
+    together, and scoring a few tasks one at a time never touches it.
+    Modules that need NumPy take it from here, so importing them stays
+    cheap and the import is paid by the first vectorized call instead.
+    Servers import NumPy up front (see tasks.apps), so only the CLI and
+    other standalone callers defer it.
+    """
+    return _LazyModule(name)
+
+
+numpy = lazy_import('numpy')
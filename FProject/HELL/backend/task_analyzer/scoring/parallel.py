@@ -0,0 +1,104 @@
+from __future__ import annotations
+
+import atexit
+import threading
+from concurrent.futures import Executor, ProcessPoolExecutor
+from datetime import datetime
+from typing import Any, List, Mapping, Optional, Tuple, Union
+
+from .lazy import numpy as np
+from .batch import TaskBatch
+from .context import ScoringContext
+from .strategies import StrategyFactory
+from .timing import stage
+
+# Tasks per chunk sent to a worker process
+DEFAULT_CHUNK_SIZE = 100000
+
+# TaskBatch columns shipped to the workers, in buffer row order
+_COLUMNS = ('importance', 'estimated_hours', 'due_timestamp', 'dependent_count')
+
+_executor: Optional[ProcessPoolExecutor] = None
+_executor_lock = threading.Lock()
+
+
+def get_executor(max_workers: Optional[int] = None) -> ProcessPoolExecutor:
+    """Process pool shared by every request, so workers stay warm between batches"""
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ProcessPoolExecutor(max_workers=max_workers)
+        return _executor
+
+
+def shutdown_executor() -> None:
+    global _executor
+    with _executor_lock:
+        if _executor is not None:
+            _executor.shutdown(wait=False, cancel_futures=True)
+            _executor = None
+
+
+atexit.register(shutdown_executor)
+
+
+def can_parallelize(strategy) -> bool:
+    """Graph-walking strategies need the whole batch in one process"""
+    return not strategy.uses_graph
+
+
+def rank_parallel(batch: TaskBatch, strategy_name: Union[str, Mapping[str, Any]], k: Optional[int] = None,
+                  chunk_size: int = DEFAULT_CHUNK_SIZE,
+                  executor: Optional[Executor] = None) -> List[Tuple[int, float]]:
+    """Score a TaskBatch across worker processes and return (position, score) best first.
+    
+    The batch is cut into chunks of ``chunk_size`` tasks and each chunk
+    travels as one float64 buffer of its columns rather than pickled
+    dicts. Workers score with the strategy's vectorized kernel against
+    the same reference time; with ``k`` they only send back their own top
+    ``k``, which are merged here. Ties keep batch order, as in
+    top_k_indices. ``strategy_name`` may also be a custom definition,
+    which each worker compiles once.
+    """
+    executor = executor or get_executor()
+    columns = np.stack([getattr(batch, name) for name in _COLUMNS])
+    now = batch.context.now
+    
+    with stage('score'):
+        futures = []
+        for start in range(0, len(batch), chunk_size):
+            chunk = np.ascontiguousarray(columns[:, start:start + chunk_size])
+            futures.append(executor.submit(_score_chunk, strategy_name, chunk.tobytes(), now, k))
+        
+        positions, scores = [], []
+        for start, future in zip(range(0, len(batch), chunk_size), futures):
+            chunk_positions, chunk_scores = future.result()
+            positions.append(np.frombuffer(chunk_positions, dtype=np.int64) + start)
+            scores.append(np.frombuffer(chunk_scores, dtype=float))
+    if not futures:
+        return []
+    
+    with stage('select'):
+        positions, scores = np.concatenate(positions), np.concatenate(scores)
+        order = np.lexsort((positions, -scores))[:k]
+        return list(zip(positions[order].tolist(), scores[order].tolist()))
+
+
+def _score_chunk(strategy_name: Union[str, Mapping[str, Any]], buffer: bytes, now: datetime,
+                 k: Optional[int]) -> Tuple[bytes, bytes]:
+    """Worker entry point: score one column buffer, return positions and scores as bytes"""
+    columns = np.frombuffer(buffer, dtype=float).reshape(len(_COLUMNS), -1)
+    batch = TaskBatch(*columns, context=ScoringContext(now=now))
+    scores = StrategyFactory.create_strategy(strategy_name).score_columns(batch)
+    positions = _top_k(scores, k)
+    return positions.astype(np.int64).tobytes(), scores[positions].tobytes()
+
+
+def _top_k(scores: np.ndarray, k: Optional[int]) -> np.ndarray:
+    """Positions of the ``k`` best scores (all when None), ties resolved by position"""
+    if k is None or k >= len(scores):
+        return np.arange(len(scores))
+    threshold = np.partition(scores, len(scores) - k)[len(scores) - k]
+    above = np.flatnonzero(scores > threshold)
+    ties = np.flatnonzero(scores == threshold)[:k - len(above)]
+    return np.concatenate([above, ties])
@@ -0,0 +1,408 @@
+from __future__ import annotations
+
+import math
+import operator
+from bisect import bisect_left, bisect_right
+from functools import cached_property, lru_cache
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+from .lazy import numpy as np
+from .batch import TaskBatch
+from .context import NO_DUE_DATE, URGENCY_HORIZONS, ScoringContext, ensure_context
+from .dependencies import TaskCollection, ensure_index
+
+# TaskBatch column holding each input field
+BATCH_COLUMNS = {
+    'importance': 'importance',
+    'estimated_hours': 'estimated_hours',
+    'urgency': 'urgency_band',
+    'hours_until_due': 'hours_until_due',
+    'dependents': 'dependent_count',
+}
+
+# Explanation factor (see explain.py) each input field speaks to
+FIELD_FACTORS = {
+    'importance': 'importance',
+    'estimated_hours': 'effort',
+    'urgency': 'urgency',
+    'hours_until_due': 'urgency',
+    'dependents': 'dependents',
+}
+
+
+def _read_importance(task, all_tasks, context):
+    return task.get('importance', 5)
+
+
+def _read_estimated_hours(task, all_tasks, context):
+    return task.get('estimated_hours', 1.0)
+
+
+def _read_urgency(task, all_tasks, context):
+    return ensure_context(context).urgency_band(task.get('due_date'))
+
+
+def _read_hours_until_due(task, all_tasks, context):
+    due_date = task.get('due_date')
+    return ensure_context(context).hours_until(due_date) if due_date else None
+
+
+def _read_dependents(task, all_tasks, context):
+    task_id = task.get('id')
+    return ensure_index(all_tasks).dependent_count(task_id) if task_id else -1
+
+
+# How the scalar path reads each input field from a task dict
+FIELD_READERS = {
+    'importance': _read_importance,
+    'estimated_hours': _read_estimated_hours,
+    'urgency': _read_urgency,
+    'hours_until_due': _read_hours_until_due,
+    'dependents': _read_dependents,
+}
+
+
+def _is_absent(field: str, value):
+    """No due date (urgency) or no task id (dependents); works on scalars and arrays"""
+    if field == 'urgency':
+        return value == NO_DUE_DATE
+    if field == 'hours_until_due':
+        # The scalar path passes a float or None, and must not load NumPy
+        if value is None or isinstance(value, float):
+            return value is None
+        return np.isnan(value)
+    if field == 'dependents':
+        return value < 0
+    return False
+
+
+class Component:
+    """One term of a strategy's score, computed from a single input field.
+    
+    ``value`` scores one input and ``vector`` a whole column of them; the
+    two must agree. ``missing`` replaces the score of absent inputs (a
+    task without a due date or without an id).
+    """
+    
+    uses_graph = False
+    
+    def __init__(self, field: str, missing: Optional[float] = None):
+        if field not in FIELD_READERS:
+            raise ValueError(f'Unknown scoring field: {field}')
+        self.field = field
+        self.missing = missing
+    
+    @property
+    def factor(self) -> str:
+        return FIELD_FACTORS[self.field]
+    
+    @property
+    def due_horizons(self) -> Optional[Tuple[float, ...]]:
+        """Hours before a due date at which the score can change.
+        
+        Empty when the score doesn't depend on the time left, None when it
+        changes continuously with it.
+        """
+        if self.field == 'urgency':
+            return URGENCY_HORIZONS
+        if self.field == 'hours_until_due':
+            return None
+        return ()
+    
+    def value(self, x: float) -> float:
+        raise NotImplementedError
+    
+    def vector(self, x: np.ndarray) -> np.ndarray:
+        raise NotImplementedError
+    
+    def scalar(self) -> Callable[[float], float]:
+        """``value`` with the missing-input rule folded in"""
+        if self.missing is None:
+            return self.value
+        field, missing, value = self.field, self.missing, self.value
+        return lambda x: missing if _is_absent(field, x) else value(x)
+    
+    def column(self, batch: TaskBatch) -> np.ndarray:
+        x = getattr(batch, BATCH_COLUMNS[self.field])
+        scores = self.vector(x)
+        if self.missing is not None:
+            scores = np.where(_is_absent(self.field, x), self.missing, scores)
+        return scores
+
+
+class Band(Component):
+    """Points by band: ``points[i]`` for values in the i-th band of ``edges``.
+    
+    Bands follow ``np.digitize``: with ``right=False`` a value equal to an
+    edge falls in the band above it, with ``right=True`` in the band
+    below. Without ``edges`` the input is already a band index (urgency).
+    """
+    
+    def __init__(self, field: str, points: Sequence[float], edges: Optional[Sequence[float]] = None,
+                 right: bool = False, missing: Optional[float] = None):
+        super().__init__(field, missing)
+        self.points = tuple(points)
+        self.edges = tuple(edges) if edges is not None else None
+        self.right = right
+    
+    @property
+    def due_horizons(self) -> Optional[Tuple[float, ...]]:
+        if self.field == 'hours_until_due' and self.edges is not None:
+            return self.edges
+        return super().due_horizons
+    
+    def value(self, x: float) -> float:
+        if self.edges is None:
+            return self.points[x] if 0 <= x < len(self.points) else 0.0
+        locate = bisect_left if self.right else bisect_right
+        return self.points[locate(self.edges, x)]
+    
+    def vector(self, x: np.ndarray) -> np.ndarray:
+        if self.edges is None:
+            # Out-of-table bands (no due date) land on the trailing 0.0
+            index = np.clip(x, 0, len(self.points)).astype(int)
+        else:
+            index = np.digitize(x, self.edges, right=self.right)
+        return self._point_table[index]
+    
+    @cached_property
+    def _point_table(self) -> np.ndarray:
+        # Built on first use, so defining strategies doesn't import NumPy
+        return np.array(self.points + (0.0,))
+
+
+class Linear(Component):
+    """``offset + weight * (x / divisor)``, optionally capped"""
+    
+    def __init__(self, field: str, weight: float = 1.0, divisor: float = 1.0, offset: float = 0.0,
+                 cap: Optional[float] = None, missing: Optional[float] = None):
+        super().__init__(field, missing)
+        self.weight = weight
+        self.divisor = divisor
+        self.offset = offset
+        self.cap = cap
+    
+    def value(self, x: float) -> float:
+        result = self.offset + self.weight * (x / self.divisor)
+        return result if self.cap is None else min(result, self.cap)
+    
+    def vector(self, x: np.ndarray) -> np.ndarray:
+        result = self.offset + self.weight * (x / self.divisor)
+        return result if self.cap is None else np.minimum(result, self.cap)
+
+
+class Power(Component):
+    """``x ** exponent * scale / divisor``"""
+    
+    def __init__(self, field: str, exponent: float, scale: float = 1.0, divisor: float = 1.0,
+                 missing: Optional[float] = None):
+        super().__init__(field, missing)
+        self.exponent = exponent
+        self.scale = scale
+        self.divisor = divisor
+    
+    def value(self, x: float) -> float:
+        return (x ** self.exponent) * self.scale / self.divisor
+    
+    def vector(self, x: np.ndarray) -> np.ndarray:
+        return (x ** self.exponent) * self.scale / self.divisor
+
+
+class Reciprocal(Component):
+    """``scale / x``, with ``x`` floored so tiny inputs don't blow up"""
+    
+    def __init__(self, field: str, scale: float = 1.0, floor: float = 0.1,
+                 missing: Optional[float] = None):
+        super().__init__(field, missing)
+        self.scale = scale
+        self.floor = floor
+    
+    def value(self, x: float) -> float:
+        return (1.0 / max(x, self.floor)) * self.scale
+    
+    def vector(self, x: np.ndarray) -> np.ndarray:
+        return (1.0 / np.maximum(x, self.floor)) * self.scale
+
+
+class InverseLog(Component):
+    """``scale / log(x + 1)``, with ``x`` floored at ``floor``"""
+    
+    def __init__(self, field: str, scale: float = 1.0, floor: float = 1.0,
+                 missing: Optional[float] = None):
+        super().__init__(field, missing)
+        self.scale = scale
+        self.floor = floor
+    
+    def value(self, x: float) -> float:
+        return (1.0 / math.log(max(x, self.floor) + 1)) * self.scale
+    
+    def vector(self, x: np.ndarray) -> np.ndarray:
+        return (1.0 / np.log(np.maximum(x, self.floor) + 1)) * self.scale
+
+
+class Slack(Component):
+    """Criticality from the slack before the nearest downstream deadline.
+    
+    ``points`` with no slack left, halving every ``scale_hours`` of
+    slack; ``no_deadline_points`` for tasks with no deadline downstream.
+    Needs the batch's DependencyGraph, so it only has a vectorized form.
+    """
+    
+    uses_graph = True
+    
+    def __init__(self, points: float, scale_hours: float, no_deadline_points: float):
+        super().__init__('urgency')
+        self.points = points
+        self.scale_hours = scale_hours
+        self.no_deadline_points = no_deadline_points
+    
+    @property
+    def due_horizons(self) -> None:
+        return None
+    
+    def column(self, batch: TaskBatch) -> np.ndarray:
+        slack_hours = (latest_starts(batch) - batch.context.timestamp) / 3600
+        return np.where(
+            np.isinf(slack_hours),
+            self.no_deadline_points,
+            self.points / (1 + np.maximum(slack_hours, 0) / self.scale_hours)
+        )
+
+
+def latest_starts(batch: TaskBatch) -> np.ndarray:
+    """Epoch seconds by which each task must start; inf without a downstream deadline.
+    
+    A task's latest start is the earliest due date reachable through its
+    dependents, minus the estimated hours of every task on that chain.
+    Propagated once over the batch's DependencyGraph in reverse
+    topological order, so a batch costs O(tasks + dependencies). Tasks
+    stuck in a cycle only see their own due date.
+    """
+    graph = batch.graph
+    if graph is None:
+        raise ValueError('Slack needs a TaskBatch built with with_graph=True')
+    
+    durations = (np.maximum(batch.estimated_hours, 0) * 3600).tolist()
+    finish = np.where(np.isnan(batch.due_timestamp), np.inf, batch.due_timestamp).tolist()
+    start = [0.0] * len(durations)
+    for position in graph.blocked:
+        start[position] = finish[position] - durations[position]
+    
+    dependents = graph.dependents
+    for position in reversed(graph.order):
+        latest = finish[position]
+        for dependent in dependents[position]:
+            if start[dependent] < latest:
+                latest = start[dependent]
+        start[position] = latest - durations[position]
+    return np.array(start)
+
+
+class StrategySpec:
+    """Declarative definition of a scoring strategy.
+    
+    The score is the ``combine`` ('sum' or 'product') of the components,
+    in order, capped at ``cap``. Tasks without a due date score
+    ``no_due_date_score`` outright when it is set. Specs are compiled
+    once by compile_strategy into a scalar function and a vectorized
+    kernel, so a new strategy is a new spec rather than new code.
+    """
+    
+    def __init__(self, name: str, components: Sequence[Component], combine: str = 'sum',
+                 cap: Optional[float] = 100.0, no_due_date_score: Optional[float] = None):
+        if combine not in ('sum', 'product'):
+            raise ValueError(f'Unknown combine: {combine}')
+        if not components:
+            raise ValueError('A strategy needs at least one component')
+        self.name = name
+        self.components = tuple(components)
+        self.combine = combine
+        self.cap = cap
+        self.no_due_date_score = no_due_date_score
+    
+    @property
+    def uses_dependencies(self) -> bool:
+        return any(component.field == 'dependents' for component in self.components)
+    
+    @property
+    def uses_graph(self) -> bool:
+        return any(component.uses_graph for component in self.components)
+    
+    @property
+    def due_horizons(self) -> Optional[Tuple[float, ...]]:
+        """Every component's due_horizons, sorted; None if any score changes continuously"""
+        horizons = set()
+        for component in self.components:
+            if component.due_horizons is None:
+                return None
+            horizons.update(component.due_horizons)
+        return tuple(sorted(horizons))
+    
+    @property
+    def factors(self) -> Tuple[str, ...]:
+        """Explanation factors of the components, in component order"""
+        return tuple(dict.fromkeys(component.factor for component in self.components))
+
+
+class ScoringPipeline:
+    """A StrategySpec compiled into ``score_task`` and ``score_columns``.
+    
+    Field readers, component functions and the combine step are resolved
+    here once, so scoring a task is a straight loop over prebound
+    functions with no per-call dispatch on the strategy.
+    """
+    
+    def __init__(self, spec: StrategySpec):
+        self.spec = spec
+        self._steps: List[Tuple[Callable, Callable[[float], float]]] = [
+            (FIELD_READERS[component.field], component.scalar())
+            for component in spec.components
+        ]
+        self._product = spec.combine == 'product'
+        self._score_task = self._compile_scalar()
+    
+    def score_task(self, task: Dict[str, Any], all_tasks: TaskCollection,
+                   context: Optional[ScoringContext] = None) -> float:
+        return self._score_task(task, all_tasks, context)
+    
+    def _compile_scalar(self) -> Callable[..., float]:
+        spec = self.spec
+        if spec.uses_graph:
+            def score_task(task, all_tasks, context=None):
+                raise ValueError(f'{spec.name} scores whole batches only')
+            return score_task
+        
+        (read_first, score_first), rest = self._steps[0], tuple(self._steps[1:])
+        combine = operator.mul if spec.combine == 'product' else operator.add
+        cap, no_due_date_score = spec.cap, spec.no_due_date_score
+        
+        def score_task(task, all_tasks, context=None):
+            if no_due_date_score is not None and not task.get('due_date'):
+                return no_due_date_score
+            total = score_first(read_first(task, all_tasks, context))
+            for read, score in rest:
+                total = combine(total, score(read(task, all_tasks, context)))
+            return total if cap is None else min(total, cap)
+        return score_task
+    
+    def score_columns(self, batch: TaskBatch) -> np.ndarray:
+        total = None
+        for component in self.spec.components:
+            column = component.column(batch)
+            if total is None:
+                total = column
+            elif self._product:
+                total = total * column
+            else:
+                total = total + column
+        if self.spec.cap is not None:
+            total = np.minimum(total, self.spec.cap)
+        if self.spec.no_due_date_score is not None:
+            total = np.where(batch.urgency_band == NO_DUE_DATE, self.spec.no_due_date_score, total)
+        return np.asarray(total, dtype=float)
+
+
+@lru_cache(maxsize=None)
+def compile_strategy(spec: StrategySpec) -> ScoringPipeline:
+    """The shared compiled pipeline of a spec"""
+    return ScoringPipeline(spec)
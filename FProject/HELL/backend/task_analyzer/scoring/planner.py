@@ -0,0 +1,97 @@
+import heapq
+from typing import Dict, Any, List, Optional, Sequence, Tuple
+
+from .graph import DependencyGraph
+
+# Tasks popped and put back per day while looking for one that still fits
+DEFAULT_LOOKAHEAD = 64
+# Floor on task hours when ranking by score per hour, so tiny tasks don't divide by zero
+MIN_RATE_HOURS = 0.1
+
+
+class Schedule:
+    """Result of plan_schedule.
+    
+    ``days`` holds one list per day of ``(position, hours)`` pairs in the
+    order the tasks should be worked on; a task longer than a whole day
+    appears on consecutive days with the hours spent on each.
+    ``unscheduled`` lists the positions that did not fit in ``max_days``
+    or are blocked by a dependency cycle.
+    """
+    
+    def __init__(self, days: List[List[Tuple[int, float]]], unscheduled: List[int]):
+        self.days = days
+        self.unscheduled = unscheduled
+
+
+def plan_schedule(tasks: List[Dict[str, Any]], scores: Sequence[float],
+                  hours_per_day: float, max_days: Optional[int] = None,
+                  graph: Optional[DependencyGraph] = None,
+                  lookahead: int = DEFAULT_LOOKAHEAD) -> Schedule:
+    """Pack scored tasks into days of ``hours_per_day`` without breaking dependencies.
+    
+    Ready tasks (every dependency already scheduled) sit in a heap keyed
+    by score per hour. Each day is filled greedily from the heap, like a
+    fractional knapsack: a task that no longer fits is set aside and the
+    next best one is tried, up to ``lookahead`` misses a day. Finishing a
+    task releases its dependents into the heap straight away, since work
+    within a day is sequential. A task bigger than a whole day starts on
+    an empty day and carries over. Runs in O((n + e) log n).
+    """
+    if hours_per_day <= 0:
+        raise ValueError('hours_per_day must be positive')
+    if graph is None:
+        graph = DependencyGraph(tasks)
+    
+    hours = [max(float(task.get('estimated_hours', 1.0) or 0.0), 0.0) for task in tasks]
+    waiting = [len(prerequisites) for prerequisites in graph.prerequisites]
+    done = [False] * len(tasks)
+    dependents = graph.dependents
+    
+    def rank(position):
+        return (-scores[position] / max(hours[position], MIN_RATE_HOURS), position)
+    
+    ready = [rank(position) for position in range(len(tasks)) if not waiting[position]]
+    heapq.heapify(ready)
+    
+    def finish(position):
+        done[position] = True
+        for dependent in dependents[position]:
+            waiting[dependent] -= 1
+            if not waiting[dependent]:
+                heapq.heappush(ready, rank(dependent))
+    
+    days: List[List[Tuple[int, float]]] = []
+    carry: Optional[Tuple[int, float]] = None
+    while (ready or carry) and (max_days is None or len(days) < max_days):
+        day: List[Tuple[int, float]] = []
+        free = hours_per_day
+        if carry:
+            position, left = carry
+            portion = min(left, free)
+            day.append((position, portion))
+            free -= portion
+            carry = (position, left - portion) if left > portion else None
+            if carry is None:
+                finish(position)
+        
+        deferred = []
+        while ready and free > 0 and len(deferred) < lookahead:
+            key, position = heapq.heappop(ready)
+            need = hours[position]
+            if need <= free:
+                day.append((position, need))
+                free -= need
+                finish(position)
+            elif not day:
+                day.append((position, free))
+                carry = (position, need - free)
+                free = 0
+            else:
+                deferred.append((key, position))
+        for item in deferred:
+            heapq.heappush(ready, item)
+        days.append(day)
+    
+    unscheduled = [position for position, finished in enumerate(done) if not finished]
+    return Schedule(days, unscheduled)
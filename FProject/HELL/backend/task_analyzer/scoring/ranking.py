@@ -0,0 +1,150 @@
+import math
+import random
+from typing import Any, Hashable, Iterator, List, Optional, Tuple
+
+# Levels of the skip list; enough for far more tasks than fit in memory
+MAX_LEVEL = 32
+# Key of the end sentinel, greater than any (negated score, order) key
+_END_KEY = (math.inf, math.inf)
+
+Key = Tuple[float, int]
+
+
+class _Node:
+    __slots__ = ('key', 'value', 'next', 'width')
+    
+    def __init__(self, key: Key, value: Any, level: int):
+        self.key = key
+        self.value = value
+        self.next: List[Optional['_Node']] = [None] * level
+        # Number of level-0 steps each forward link skips
+        self.width = [1] * level
+
+
+class ScoreIndex:
+    """Ranking of task ids by score, best first, kept sorted as scores change.
+    
+    An indexable skip list keyed on ``(-score, order)``: ``order`` is a
+    unique, increasing number per task, so equal scores keep backlog
+    order like the analyze endpoint. Each link records how many entries
+    it skips, so inserting, removing, finding the rank of a key and
+    fetching the entry at a rank are all O(log n).
+    """
+    
+    def __init__(self, seed: Optional[int] = None):
+        self._random = random.Random(seed)
+        self._end = _Node(_END_KEY, None, 0)
+        self._head = _Node(None, None, MAX_LEVEL)
+        self._head.next = [self._end] * MAX_LEVEL
+        self._size = 0
+    
+    @classmethod
+    def from_sorted(cls, items, seed: Optional[int] = None) -> 'ScoreIndex':
+        """Index of ``(key, value)`` pairs already in key order, linked in O(n)"""
+        index = cls(seed)
+        last = [index._head] * MAX_LEVEL
+        last_position = [0] * MAX_LEVEL
+        position = 0
+        for position, (key, value) in enumerate(items, 1):
+            node = _Node(key, value, index._random_level())
+            for level in range(len(node.next)):
+                last[level].next[level] = node
+                last[level].width[level] = position - last_position[level]
+                last[level] = node
+                last_position[level] = position
+        for level in range(MAX_LEVEL):
+            last[level].next[level] = index._end
+            last[level].width[level] = position + 1 - last_position[level]
+        index._size = position
+        return index
+    
+    @staticmethod
+    def key(score: float, order: int) -> Key:
+        return (-score, order)
+    
+    def insert(self, key: Key, value: Hashable) -> None:
+        chain, steps = self._path(key)
+        level_count = self._random_level()
+        node = _Node(key, value, level_count)
+        skipped = 0
+        for level in range(level_count):
+            previous = chain[level]
+            node.next[level] = previous.next[level]
+            previous.next[level] = node
+            node.width[level] = previous.width[level] - skipped
+            previous.width[level] = skipped + 1
+            skipped += steps[level]
+        for level in range(level_count, MAX_LEVEL):
+            chain[level].width[level] += 1
+        self._size += 1
+    
+    def remove(self, key: Key) -> None:
+        chain, _ = self._path(key)
+        node = chain[0].next[0]
+        if node.key != key:
+            raise KeyError(key)
+        for level in range(len(node.next)):
+            previous = chain[level]
+            previous.width[level] += node.width[level] - 1
+            previous.next[level] = node.next[level]
+        for level in range(len(node.next), MAX_LEVEL):
+            chain[level].width[level] -= 1
+        self._size -= 1
+    
+    def rank(self, key: Key) -> int:
+        """0-based position of ``key``; KeyError if it is not in the index"""
+        node = self._head
+        position = 0
+        for level in reversed(range(MAX_LEVEL)):
+            while node.next[level].key < key:
+                position += node.width[level]
+                node = node.next[level]
+        if node.next[0].key != key:
+            raise KeyError(key)
+        return position
+    
+    def __getitem__(self, position: int) -> Hashable:
+        if not 0 <= position < self._size:
+            raise IndexError(position)
+        return self._node_at(position).value
+    
+    def slice(self, start: int = 0, stop: Optional[int] = None) -> Iterator[Tuple[Key, Hashable]]:
+        """``(key, value)`` pairs from rank ``start`` up to ``stop``"""
+        stop = self._size if stop is None else min(stop, self._size)
+        if start >= stop:
+            return
+        node = self._node_at(start)
+        for _ in range(stop - start):
+            yield node.key, node.value
+            node = node.next[0]
+    
+    def __iter__(self) -> Iterator[Hashable]:
+        return (value for _, value in self.slice())
+    
+    def __len__(self) -> int:
+        return self._size
+    
+    def _random_level(self) -> int:
+        # Each level holds about half the nodes of the one below
+        return min(MAX_LEVEL, 1 - int(math.log2(1.0 - self._random.random())))
+    
+    def _path(self, key: Key):
+        """Last node before ``key`` on every level, and the steps taken on each"""
+        chain = [self._head] * MAX_LEVEL
+        steps = [0] * MAX_LEVEL
+        node = self._head
+        for level in reversed(range(MAX_LEVEL)):
+            while node.next[level].key < key:
+                steps[level] += node.width[level]
+                node = node.next[level]
+            chain[level] = node
+        return chain, steps
+    
+    def _node_at(self, position: int) -> _Node:
+        node = self._head
+        remaining = position + 1
+        for level in reversed(range(MAX_LEVEL)):
+            while node.width[level] <= remaining and node.next[level] is not self._end:
+                remaining -= node.width[level]
+                node = node.next[level]
+        return node
@@ -0,0 +1,17 @@
+import heapq
+from typing import List, Optional, Sequence
+
+from .timing import stage
+
+
+def top_k_indices(scores: Sequence[float], k: Optional[int] = None) -> List[int]:
+    """Indices of the ``k`` highest scores, best first.
+    
+    Uses a bounded heap, so selecting k of n scores costs O(n log k)
+    instead of a full sort. Ties keep their input order, and ``k=None``
+    ranks everything.
+    """
+    with stage('select'):
+        if k is None or k >= len(scores):
+            return sorted(range(len(scores)), key=scores.__getitem__, reverse=True)
+        return heapq.nlargest(k, range(len(scores)), key=scores.__getitem__)
@@ -0,0 +1,230 @@
+import threading
+from datetime import datetime
+from typing import Any, Dict, Hashable, List, Optional
+
+from .batch import TaskBatch
+from .context import ScoringContext
+from .dependencies import DependencyIndex
+from .ranking import ScoreIndex
+from .strategies import StrategyFactory
+
+PATCH_OPS = ('add', 'update', 'remove')
+
+
+class ScoringSession:
+    """A ranked backlog kept up to date under small edits.
+    
+    Holds the tasks by id, their reverse-dependency counts and a
+    ScoreIndex of their scores. A patch re-scores only the tasks whose
+    inputs changed: the patched tasks and, for strategies that count
+    dependents, the tasks they start or stop depending on. Each of those
+    is moved in the index in O(log n), so a patch costs O(log n) per
+    affected task instead of a rescore and sort of the whole backlog.
+    Graph-walking strategies still re-score every task on each patch,
+    since slack can change anywhere along a chain, but only report the
+    tasks whose score changed.
+    
+    Every task is scored against one reference time. Once any task's
+    urgency band would change (for graph-walking strategies, whose scores
+    drift continuously, once a minute), the next ``apply`` moves to a new
+    reference time and re-scores everything. Not thread-safe: callers
+    sharing a session hold its ``lock``.
+    """
+    
+    def __init__(self, tasks: List[Dict[str, Any]], strategy: Any, now: Optional[datetime] = None):
+        self.strategy = strategy
+        self.scorer = StrategyFactory.create_strategy(strategy)
+        self.lock = threading.Lock()
+        # Task dicts by id, in backlog order
+        self.tasks: Dict[Hashable, Dict[str, Any]] = {}
+        self.dependency_index = DependencyIndex()
+        self._keys: Dict[Hashable, tuple] = {}
+        self._order: Dict[Hashable, int] = {}
+        self._next_order = 0
+        
+        context = ScoringContext(now=now)
+        for position, task in enumerate(tasks):
+            if not isinstance(task, dict):
+                raise ValueError(f'Task {position} is not an object')
+            task_id = _task_id(task)
+            if task_id in self.tasks:
+                raise ValueError(f'Duplicate task id: {task_id}')
+            self._store(task_id, task)
+        self._rebase(context)
+    
+    def apply(self, patches: List[Dict[str, Any]], now: Optional[datetime] = None) -> List[Dict[str, Any]]:
+        """Apply ``patches`` in order and return the tasks whose score changed.
+        
+        Patches are ``{'op': 'add', 'task': {...}}``, ``{'op': 'update',
+        'id': ..., 'task': {fields to change}}`` (``dependencies``
+        included) and ``{'op': 'remove', 'id': ...}``. Every patch is
+        checked before any is applied, so a bad one changes nothing.
+        
+        Changes are ``{'id', 'score', 'rank', 'previous_rank'}`` with
+        1-based ranks, best first; ``previous_rank`` is None for added
+        tasks and ``rank`` and ``score`` are None for removed ones. Tasks
+        not listed keep their relative order, so moving the listed tasks
+        to their new ranks, lowest rank first, gives the new ranking.
+        """
+        pending = self._resolve(patches)
+        context = ScoringContext(now=now)
+        rebase = self.expires_at is not None and context.timestamp >= self.expires_at
+        everything = rebase or self.scorer.uses_graph
+        
+        affected = set(pending)
+        if everything:
+            affected.update(self.tasks)
+        elif self.scorer.uses_dependencies:
+            for task_id, task in pending.items():
+                for version in (self.tasks.get(task_id), task):
+                    if version:
+                        affected.update(version.get('dependencies') or ())
+        affected = {task_id for task_id in affected if task_id in self.tasks or task_id in pending}
+        previous = self._ranks([task_id for task_id in affected if task_id in self._keys], everything)
+        previous_keys = {task_id: self._keys[task_id] for task_id in previous}
+        
+        for task_id, task in pending.items():
+            old = self.tasks.get(task_id)
+            if old is not None:
+                self.dependency_index.remove(old)
+            if task is None:
+                if old is None:
+                    # Added and removed by the same request
+                    continue
+                del self.tasks[task_id]
+                del self._order[task_id]
+                self.index.remove(self._keys.pop(task_id))
+            else:
+                self._store(task_id, task)
+        
+        if rebase:
+            self._rebase(context)
+        else:
+            self._rescore([task_id for task_id in affected if task_id in self.tasks])
+        
+        changed = [task_id for task_id in affected if self._keys.get(task_id) != previous_keys.get(task_id)]
+        ranks = self._ranks([task_id for task_id in changed if task_id in self._keys], everything)
+        changes = [
+            {
+                'id': task_id,
+                'score': round(-self._keys[task_id][0], 2) if task_id in self._keys else None,
+                'rank': ranks[task_id] + 1 if task_id in ranks else None,
+                'previous_rank': previous[task_id] + 1 if task_id in previous else None,
+            }
+            for task_id in changed
+        ]
+        changes.sort(key=lambda change: (change['rank'] is None, change['rank'] or 0))
+        return changes
+    
+    def ranking(self, offset: int = 0, limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        """Copies of the task dicts from rank ``offset`` on, best first, with ``score``"""
+        stop = None if limit is None else offset + limit
+        return [dict(self.tasks[task_id], score=round(-key[0], 2))
+                for key, task_id in self.index.slice(offset, stop)]
+    
+    def __len__(self) -> int:
+        return len(self.tasks)
+    
+    def _resolve(self, patches: List[Dict[str, Any]]) -> Dict[Hashable, Optional[Dict[str, Any]]]:
+        """Final version of every patched task (None once removed), checking each patch"""
+        if not isinstance(patches, list):
+            raise ValueError('patches must be a list')
+        pending: Dict[Hashable, Optional[Dict[str, Any]]] = {}
+        for position, patch in enumerate(patches):
+            if not isinstance(patch, dict) or patch.get('op') not in PATCH_OPS:
+                raise ValueError(f'Patch {position}: op must be one of {", ".join(PATCH_OPS)}')
+            op = patch['op']
+            fields = patch.get('task', {})
+            if op != 'remove' and not isinstance(fields, dict):
+                raise ValueError(f'Patch {position}: task must be an object')
+            try:
+                task_id = _task_id(fields if op == 'add' else patch)
+            except ValueError as e:
+                raise ValueError(f'Patch {position}: {e}')
+            current = pending[task_id] if task_id in pending else self.tasks.get(task_id)
+            
+            if op == 'add':
+                if current is not None:
+                    raise ValueError(f'Patch {position}: task {task_id} already exists')
+                task = dict(fields)
+            elif current is None:
+                raise ValueError(f'Patch {position}: unknown task {task_id}')
+            elif op == 'update':
+                if fields.get('id', task_id) != task_id:
+                    raise ValueError(f'Patch {position}: task ids cannot be changed')
+                task = {**current, **fields}
+            else:
+                task = None
+            
+            if task is not None:
+                try:
+                    _check_task(task, self.context)
+                except (TypeError, ValueError) as e:
+                    raise ValueError(f'Patch {position}: {e}')
+            pending[task_id] = task
+        return pending
+    
+    def _store(self, task_id: Hashable, task: Dict[str, Any]) -> None:
+        # Updated tasks keep their backlog position and so their tie order
+        if task_id not in self._order:
+            self._order[task_id] = self._next_order
+            self._next_order += 1
+        self.tasks[task_id] = task
+        self.dependency_index.add(task)
+    
+    def _score(self, task_ids: List[Hashable]):
+        batch = TaskBatch.from_tasks([self.tasks[task_id] for task_id in task_ids], self.dependency_index,
+                                     self.context, count_dependents=self.scorer.uses_dependencies,
+                                     with_graph=self.scorer.uses_graph)
+        return self.scorer.score_batch(batch), batch
+    
+    def _rebase(self, context: ScoringContext) -> None:
+        self.context = context
+        task_ids = list(self.tasks)
+        scores, batch = self._score(task_ids)
+        self._keys = {task_id: ScoreIndex.key(float(score), self._order[task_id])
+                      for task_id, score in zip(task_ids, scores)}
+        self.index = ScoreIndex.from_sorted(sorted((key, task_id) for task_id, key in self._keys.items()))
+        self.expires_at = self.scorer.valid_until(batch)
+    
+    def _rescore(self, task_ids: List[Hashable]) -> None:
+        if not task_ids:
+            return
+        scores, batch = self._score(task_ids)
+        for task_id, score in zip(task_ids, scores):
+            key = ScoreIndex.key(float(score), self._order[task_id])
+            old = self._keys.get(task_id)
+            if old == key:
+                continue
+            if old is not None:
+                self.index.remove(old)
+            self.index.insert(key, task_id)
+            self._keys[task_id] = key
+        valid_until = self.scorer.valid_until(batch)
+        if valid_until is not None and (self.expires_at is None or valid_until < self.expires_at):
+            self.expires_at = valid_until
+    
+    def _ranks(self, task_ids: List[Hashable], everything: bool) -> Dict[Hashable, int]:
+        """0-based ranks of ``task_ids``; one walk of the index when they are most of it"""
+        if everything:
+            wanted = set(task_ids)
+            return {task_id: rank for rank, task_id in enumerate(self.index) if task_id in wanted}
+        return {task_id: self.index.rank(self._keys[task_id]) for task_id in task_ids}
+
+
+def _task_id(task: Dict[str, Any]) -> Hashable:
+    task_id = task.get('id')
+    if task_id is None or isinstance(task_id, (bool, dict, list)):
+        raise ValueError('Every task needs an id (a number or string)')
+    return task_id
+
+
+def _check_task(task: Dict[str, Any], context: ScoringContext) -> None:
+    """Raise for fields that would fail scoring, before anything is changed"""
+    dependencies = task.get('dependencies')
+    if dependencies is not None and not isinstance(dependencies, list):
+        raise ValueError('dependencies must be a list')
+    for dependency in dependencies or ():
+        if dependency is None or isinstance(dependency, (bool, dict, list)):
+            raise ValueError(f'Invalid dependency id: {dependency!r}')
+    TaskBatch.from_tasks([task], context=context, count_dependents=False).due_timestamp
@@ -1,169 +1,210 @@
-from abc import ABC, abstractmethod
-from datetime import datetime
-from typing import Dict, Any, List
-import math
-
-class ScoringStrategy(ABC):
-    """Abstract base class for all scoring strategies"""
-    
-    @abstractmethod
-    def calculate_score(self, task: Dict[str, Any], all_tasks: List[Dict[str, Any]]) -> float:
-        pass
-    
-    def get_strategy_name(self) -> str:
-        return self.__class__.__name__
-
-class FastestWinsStrategy(ScoringStrategy):
-    """Prioritize tasks that can be completed quickly"""
-    
-    def calculate_score(self, task: Dict[str, Any], all_tasks: List[Dict[str, Any]]) -> float:
-        effort = task.get('estimated_hours', 1.0)
-        importance = task.get('importance', 5) / 10.0
-        
-        # Quick tasks get highest scores
-        base_score = (1.0 / max(effort, 0.1)) * 50
-        importance_modifier = 0.3 + 0.7 * importance
-        
-        return min(base_score * importance_modifier, 100.0)
-
-class HighImpactStrategy(ScoringStrategy):
-    """Prioritize high importance tasks regardless of effort"""
-    
-    def calculate_score(self, task: Dict[str, Any], all_tasks: List[Dict[str, Any]]) -> float:
-        importance = task.get('importance', 5)
-        effort = task.get('estimated_hours', 1.0)
-        
-        # Square importance to emphasize high-value tasks
-        base_score = (importance ** 2) / 1.5
-        # Minimal effort penalty
-        effort_penalty = 1.0 / math.log(max(effort, 1) + 1)
-        
-        return min(base_score * effort_penalty, 100.0)
-
-class DeadlineDrivenStrategy(ScoringStrategy):
-    """Prioritize tasks with approaching deadlines"""
-    
-    def calculate_score(self, task: Dict[str, Any], all_tasks: List[Dict[str, Any]]) -> float:
-        due_date = task.get('due_date')
-        importance = task.get('importance', 5)
-        
-        if not due_date:
-            return 30.0  # Medium priority for no deadline
-        
-        now = datetime.now().replace(tzinfo=due_date.tzinfo) if due_date.tzinfo else datetime.now()
-        hours_until_due = (due_date - now).total_seconds() / 3600
-        
-        if hours_until_due <= 0:
-            urgency = 100.0  # Past due - maximum urgency
-        elif hours_until_due <= 24:
-            urgency = 80.0   # Due within 24 hours
-        elif hours_until_due <= 72:
-            urgency = 60.0   # Due in 3 days
-        elif hours_until_due <= 168:
-            urgency = 40.0   # Due in 1 week
-        else:
-            urgency = 20.0   # Not urgent
-        
-        importance_modifier = 0.5 + (importance / 20.0)  # 0.55 to 1.0
-        
-        return min(urgency * importance_modifier, 100.0)
-
-class SmartBalanceStrategy(ScoringStrategy):
-    """Balanced approach considering all factors with weights"""
-    
-    def calculate_score(self, task: Dict[str, Any], all_tasks: List[Dict[str, Any]]) -> float:
-        importance = task.get('importance', 5)
-        effort = task.get('estimated_hours', 1.0)
-        due_date = task.get('due_date')
-        dependencies = task.get('dependencies', [])
-        
-        # Weighted components
-        importance_score = self._calculate_importance_score(importance)  # 0-40
-        urgency_score = self._calculate_urgency_score(due_date)          # 0-35
-        effort_score = self._calculate_effort_score(effort)              # 0-15
-        dependency_score = self._calculate_dependency_score(task, all_tasks)  # 0-10
-        
-        total_score = importance_score + urgency_score + effort_score + dependency_score
-        
-        return min(total_score, 100.0)
-    
-    def _calculate_importance_score(self, importance: int) -> float:
-        """Calculate score based on task importance (0-40 points)"""
-        if importance >= 9:
-            return 40.0
-        elif importance >= 7:
-            return 32.0
-        elif importance >= 5:
-            return 24.0
-        elif importance >= 3:
-            return 16.0
-        else:
-            return 8.0
-    
-    def _calculate_urgency_score(self, due_date) -> float:
-        """Calculate score based on urgency (0-35 points)"""
-        if not due_date:
-            return 10.0
-        
-        now = datetime.now().replace(tzinfo=due_date.tzinfo) if due_date.tzinfo else datetime.now()
-        hours_until_due = (due_date - now).total_seconds() / 3600
-        
-        if hours_until_due <= 0:
-            return 35.0  # Past due
-        elif hours_until_due <= 24:
-            return 30.0  # Due today
-        elif hours_until_due <= 72:
-            return 22.0  # Due in 3 days
-        elif hours_until_due <= 168:
-            return 15.0  # Due in 1 week
-        else:
-            return 8.0   # Not urgent
-    
-    def _calculate_effort_score(self, effort: float) -> float:
-        """Calculate score based on effort (0-15 points) - inverse relationship"""
-        if effort <= 1:
-            return 15.0  # Very quick tasks
-        elif effort <= 4:
-            return 12.0  # Quick tasks
-        elif effort <= 8:
-            return 8.0   # Medium effort
-        elif effort <= 16:
-            return 5.0   # High effort
-        else:
-            return 3.0   # Very high effort
-    
-    def _calculate_dependency_score(self, task: Dict[str, Any], all_tasks: List[Dict[str, Any]]) -> float:
-        """Calculate score based on dependency impact (0-10 points)"""
-        task_id = task.get('id')
-        if not task_id:
-            return 3.0
-        
-        # Count how many tasks depend on this one
-        dependent_count = 0
-        for other_task in all_tasks:
-            if task_id in other_task.get('dependencies', []):
-                dependent_count += 1
-        
-        if dependent_count >= 3:
-            return 10.0
-        elif dependent_count == 2:
-            return 7.0
-        elif dependent_count == 1:
-            return 4.0
-        else:
-            return 1.0
-
-class StrategyFactory:
-    """Factory class to create scoring strategies"""
-    
-    @staticmethod
-    def create_strategy(strategy_name: str) -> ScoringStrategy:
-        strategies = {
-            'fastest_wins': FastestWinsStrategy,
-            'high_impact': HighImpactStrategy,
-            'deadline_driven': DeadlineDrivenStrategy,
-            'smart_balance': SmartBalanceStrategy,
-        }
-        
-        strategy_class = strategies.get(strategy_name, SmartBalanceStrategy)
-        return strategy_class()
\ No newline at end of file
+from __future__ import annotations
+
+from abc import ABC, abstractmethod
+from typing import Dict, Any, List, Mapping, Optional, Union
+
+from .lazy import numpy as np
+from .batch import TaskBatch
+from .context import URGENCY_HORIZONS, ScoringContext, ensure_context
+from .dependencies import DependencyIndex, TaskCollection
+from .pipeline import (
+    Band, InverseLog, Linear, Power, Reciprocal, ScoringPipeline, Slack, StrategySpec,
+    compile_strategy, latest_starts,
+)
+from .table import TaskTable
+from .timing import stage
+
+# Scores that drift continuously with the time left (e.g. as slack runs
+# down) only stay valid until the end of the current bucket of this many seconds
+DRIFT_BUCKET_SECONDS = 60
+
+class ScoringStrategy(ABC):
+    """Abstract base class for all scoring strategies"""
+    
+    # Whether scores depend on how many tasks in the batch depend on a task
+    uses_dependencies = False
+    # Whether scores need the batch's whole DependencyGraph (TaskBatch.graph)
+    uses_graph = False
+    # Hours before a due date at which scores can change; None when they
+    # change continuously
+    due_horizons = URGENCY_HORIZONS
+    # Whether score_columns scores a TaskBatch; other strategies score
+    # task dicts one at a time with calculate_score
+    vectorized = False
+    
+    @abstractmethod
+    def calculate_score(self, task: Dict[str, Any], all_tasks: TaskCollection,
+                        context: Optional[ScoringContext] = None) -> float:
+        pass
+    
+    def score_batch(self, tasks: Union[List[Dict[str, Any]], TaskTable, TaskBatch],
+                    dependency_index: Optional[DependencyIndex] = None,
+                    context: Optional[ScoringContext] = None) -> List[float]:
+        """Score a whole batch against one dependency index and one reference time"""
+        if not self.vectorized and isinstance(tasks, (TaskTable, TaskBatch)):
+            raise TypeError(f"{self.get_strategy_name()} has no vectorized kernel, so it only scores task dicts")
+        if isinstance(tasks, TaskTable):
+            tasks = TaskBatch.from_table(tasks, dependency_index, context,
+                                         count_dependents=self.uses_dependencies,
+                                         with_graph=self.uses_graph)
+        if isinstance(tasks, TaskBatch):
+            with stage('score'):
+                return self.score_columns(tasks).tolist()
+        
+        context = ensure_context(context)
+        if not self.vectorized:
+            if dependency_index is None:
+                dependency_index = DependencyIndex.from_tasks(tasks)
+            with stage('score'):
+                return [self.calculate_score(task, dependency_index, context) for task in tasks]
+        
+        batch = TaskBatch.from_tasks(tasks, dependency_index, context,
+                                     count_dependents=self.uses_dependencies,
+                                     with_graph=self.uses_graph)
+        with stage('score'):
+            return self.score_columns(batch).tolist()
+    
+    def valid_until(self, batch: TaskBatch) -> Optional[float]:
+        """Epoch seconds until which this strategy's scores of ``batch`` stay correct, None if forever"""
+        if self.due_horizons is None:
+            timestamp = batch.context.timestamp
+            return timestamp - timestamp % DRIFT_BUCKET_SECONDS + DRIFT_BUCKET_SECONDS
+        return batch.valid_until(self.due_horizons)
+    
+    def get_strategy_name(self) -> str:
+        return self.__class__.__name__
+
+# Strategy definitions. Each is compiled once into a scalar scoring
+# function and a vectorized kernel; the classes below only name them.
+FASTEST_WINS = StrategySpec('fastest_wins', [
+    # Quick tasks get highest scores
+    Reciprocal('estimated_hours', scale=50.0, floor=0.1),
+    Linear('importance', weight=0.7, divisor=10.0, offset=0.3),
+], combine='product')
+
+HIGH_IMPACT = StrategySpec('high_impact', [
+    # Square importance to emphasize high-value tasks
+    Power('importance', 2, divisor=1.5),
+    # Minimal effort penalty
+    InverseLog('estimated_hours'),
+], combine='product')
+
+DEADLINE_DRIVEN = StrategySpec('deadline_driven', [
+    # Past due, due within 24 hours, 3 days, 1 week, not urgent
+    Band('urgency', (100.0, 80.0, 60.0, 40.0, 20.0)),
+    Linear('importance', divisor=20.0, offset=0.5),  # 0.55 to 1.0
+], combine='product', no_due_date_score=30.0)
+
+SMART_BALANCE = StrategySpec('smart_balance', [
+    # 1-2, 3-4, 5-6, 7-8 and 9-10
+    Band('importance', (8.0, 16.0, 24.0, 32.0, 40.0), edges=(3, 5, 7, 9)),
+    # Past due, due today, in 3 days, in 1 week, not urgent
+    Band('urgency', (35.0, 30.0, 22.0, 15.0, 8.0), missing=10.0),
+    # Up to 1h, 4h, 8h, 16h and longer
+    Band('estimated_hours', (15.0, 12.0, 8.0, 5.0, 3.0), edges=(1, 4, 8, 16), right=True),
+    # 0, 1, 2 and 3 or more dependents
+    Band('dependents', (1.0, 4.0, 7.0, 10.0), edges=(1, 2, 3), missing=3.0),
+])
+
+CRITICAL_PATH = StrategySpec('critical_path', [
+    # 75 points with no slack left, 37.5 with a day of slack, and so on
+    Slack(points=75.0, scale_hours=24.0, no_deadline_points=10.0),
+    Linear('importance', weight=25.0, divisor=10.0),
+])
+
+STRATEGY_SPECS = {spec.name: spec for spec in (
+    FASTEST_WINS, HIGH_IMPACT, DEADLINE_DRIVEN, SMART_BALANCE, CRITICAL_PATH
+)}
+
+class PipelineStrategy(ScoringStrategy):
+    """Strategy scored by a compiled StrategySpec"""
+    
+    spec: StrategySpec = SMART_BALANCE
+    vectorized = True
+    
+    def __init__(self, spec: Optional[StrategySpec] = None, pipeline: Optional[ScoringPipeline] = None):
+        if spec is not None:
+            self.spec = spec
+        # Built-in specs share compile_strategy's cache; callers holding
+        # their own bounded cache (custom strategies) pass the pipeline in
+        self.pipeline = pipeline or compile_strategy(self.spec)
+        self.uses_dependencies = self.spec.uses_dependencies
+        self.uses_graph = self.spec.uses_graph
+        self.due_horizons = self.spec.due_horizons
+    
+    def calculate_score(self, task: Dict[str, Any], all_tasks: TaskCollection,
+                        context: Optional[ScoringContext] = None) -> float:
+        if self.uses_graph:
+            # Graph strategies score a task against its whole batch
+            if not isinstance(all_tasks, list):
+                raise TypeError(f"{self.get_strategy_name()} needs the batch's task list, "
+                                f"not a {type(all_tasks).__name__}")
+            tasks = all_tasks
+            position = next((i for i, other in enumerate(tasks) if other is task), None)
+            if position is None:
+                tasks, position = tasks + [task], len(tasks)
+            return self.score_batch(tasks, context=context)[position]
+        return self.pipeline.score_task(task, all_tasks, context)
+    
+    def score_columns(self, batch: TaskBatch) -> np.ndarray:
+        """Vectorized equivalent of calculate_score over a TaskBatch"""
+        return self.pipeline.score_columns(batch)
+
+class FastestWinsStrategy(PipelineStrategy):
+    """Prioritize tasks that can be completed quickly"""
+    
+    spec = FASTEST_WINS
+
+class HighImpactStrategy(PipelineStrategy):
+    """Prioritize high importance tasks regardless of effort"""
+    
+    spec = HIGH_IMPACT
+
+class DeadlineDrivenStrategy(PipelineStrategy):
+    """Prioritize tasks with approaching deadlines"""
+    
+    spec = DEADLINE_DRIVEN
+
+class SmartBalanceStrategy(PipelineStrategy):
+    """Balanced approach considering all factors with weights"""
+    
+    spec = SMART_BALANCE
+
+class CriticalPathStrategy(PipelineStrategy):
+    """Prioritize tasks on the tightest chain of work before a deadline.
+    
+    A task's slack is the time from now until its latest start (see
+    pipeline.latest_starts), computed in one pass over the batch's
+    DependencyGraph.
+    """
+    
+    spec = CRITICAL_PATH
+    
+    def latest_starts(self, batch: TaskBatch) -> np.ndarray:
+        """Epoch seconds by which each task must start; inf without a downstream deadline"""
+        if batch.graph is None:
+            raise ValueError(f"{self.get_strategy_name()} needs a TaskBatch built with with_graph=True")
+        return latest_starts(batch)
+
+class StrategyFactory:
+    """Factory class to create scoring strategies"""
+    
+    # Strategies with a class of their own; other specs get a PipelineStrategy
+    STRATEGY_CLASSES = {
+        'fastest_wins': FastestWinsStrategy,
+        'high_impact': HighImpactStrategy,
+        'deadline_driven': DeadlineDrivenStrategy,
+        'smart_balance': SmartBalanceStrategy,
+        'critical_path': CriticalPathStrategy,
+    }
+    
+    @staticmethod
+    def create_strategy(strategy_name: Union[str, Mapping[str, Any]]) -> ScoringStrategy:
+        """Strategy by name, or compiled from a custom definition (see custom.py)"""
+        if isinstance(strategy_name, Mapping):
+            from .custom import get_custom_strategy
+            return get_custom_strategy(strategy_name)
+        strategy_class = StrategyFactory.STRATEGY_CLASSES.get(strategy_name)
+        if strategy_class is None and strategy_name in STRATEGY_SPECS:
+            return PipelineStrategy(STRATEGY_SPECS[strategy_name])
+        return (strategy_class or SmartBalanceStrategy)()
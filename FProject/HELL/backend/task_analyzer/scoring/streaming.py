@@ -0,0 +1,128 @@
+import heapq
+import json
+import tempfile
+from itertools import islice
+from typing import Dict, Any, Iterable, Iterator, List, Optional, Tuple, Union
+
+from .batch import TaskBatch
+from .context import ScoringContext, ensure_context
+from .dependencies import DependencyIndex
+
+# Tasks scored per vectorized batch while streaming
+DEFAULT_CHUNK_SIZE = 5000
+# Records held in memory before a sorted run is spilled to disk
+DEFAULT_RUN_SIZE = 50000
+
+Line = Union[bytes, str]
+
+
+def iter_ndjson(lines: Iterable[Line]) -> Iterator[Dict[str, Any]]:
+    """Decode one task dict per non-blank NDJSON line"""
+    for line in lines:
+        if line.strip():
+            yield json.loads(line)
+
+
+def chunked(items: Iterable[Any], size: int) -> Iterator[List[Any]]:
+    iterator = iter(items)
+    while True:
+        chunk = list(islice(iterator, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+class NDJSONSpool:
+    """Buffer an NDJSON task stream on disk while counting dependency edges.
+    
+    Dependent counts are only known once every task has been seen, so
+    strategies that use them read the input twice: this first pass keeps
+    just the DependencyIndex in memory, and iterating the spool replays
+    the tasks from the temporary file.
+    """
+    
+    def __init__(self, lines: Iterable[Line]):
+        self.dependency_index = DependencyIndex()
+        self.count = 0
+        self._file = tempfile.TemporaryFile()
+        try:
+            for line in lines:
+                if not line.strip():
+                    continue
+                if isinstance(line, str):
+                    line = line.encode()
+                self.dependency_index.add(json.loads(line))
+                self._file.write(line.rstrip(b'\r\n') + b'\n')
+                self.count += 1
+        except BaseException:
+            self._file.close()
+            raise
+    
+    def __iter__(self) -> Iterator[Dict[str, Any]]:
+        self._file.seek(0)
+        return iter_ndjson(self._file)
+    
+    def close(self) -> None:
+        self._file.close()
+
+
+def score_stream(tasks: Iterable[Dict[str, Any]], strategy,
+                 dependency_index: Optional[DependencyIndex] = None,
+                 context: Optional[ScoringContext] = None,
+                 chunk_size: int = DEFAULT_CHUNK_SIZE) -> Iterator[Tuple[Dict[str, Any], float]]:
+    """Score a task stream chunk by chunk, yielding (task, score) in input order.
+    
+    Strategies that walk the dependency graph need every task at once, so
+    their stream is read into a single chunk.
+    """
+    context = ensure_context(context)
+    count_dependents = strategy.uses_dependencies
+    if count_dependents and dependency_index is None:
+        raise ValueError(f"{strategy.get_strategy_name()} needs the dependency index of the whole stream")
+    if strategy.uses_graph:
+        tasks = list(tasks)
+        chunk_size = max(len(tasks), 1)
+    
+    for chunk in chunked(tasks, chunk_size):
+        batch = TaskBatch.from_tasks(chunk, dependency_index, context,
+                                     count_dependents=count_dependents,
+                                     with_graph=strategy.uses_graph)
+        yield from zip(chunk, strategy.score_batch(batch))
+
+
+def sort_by_score(records: Iterable[Tuple[float, str]],
+                  run_size: int = DEFAULT_RUN_SIZE) -> Iterator[str]:
+    """Yield record lines by descending score using an external merge sort.
+    
+    At most ``run_size`` records are held in memory; full runs are sorted
+    and spilled to temporary files, then merged lazily with heapq.merge.
+    Ties keep their input order.
+    """
+    runs = []
+    buffer = []
+    for sequence, (score, line) in enumerate(records):
+        buffer.append((-score, sequence, line))
+        if len(buffer) >= run_size:
+            runs.append(_spill_run(buffer))
+            buffer = []
+    buffer.sort()
+    
+    merged = heapq.merge(*(_read_run(run) for run in runs), buffer) if runs else buffer
+    for _, _, line in merged:
+        yield line
+
+
+def _spill_run(buffer: List[Tuple[float, int, str]]):
+    buffer.sort()
+    run = tempfile.TemporaryFile(mode='w+', encoding='utf-8')
+    for negative_score, sequence, line in buffer:
+        run.write(f'{negative_score!r}\t{sequence}\t{line}\n')
+    run.seek(0)
+    return run
+
+
+def _read_run(run) -> Iterator[Tuple[float, int, str]]:
+    with run:
+        for record in run:
+            negative_score, sequence, line = record.rstrip('\n').split('\t', 2)
+            yield float(negative_score), int(sequence), line
@@ -0,0 +1,140 @@
+from array import array
+from collections import Counter
+from datetime import datetime
+from typing import Dict, Any, Hashable, Iterable, Iterator, List, Optional, Sequence, Tuple, Union
+
+from .context import ScoringContext, ensure_context
+from .dependencies import DependencyIndex
+
+# (id, title, due_date, estimated_hours, importance, dependencies)
+TaskRecord = Tuple[Optional[Hashable], Optional[str], Any, float, Union[int, float], Optional[Sequence[Hashable]]]
+Ids = Union[array, List[Optional[Hashable]]]
+
+
+class TaskTable:
+    """Struct-of-arrays storage for a batch of tasks.
+    
+    Instead of one dict per task, every field is a column:
+    
+    * ``ids`` as ``array('q')`` when every id is an int, a list otherwise
+    * ``titles`` as a list of strings
+    * ``due_timestamp`` as ``array('d')`` epoch seconds (NaN without a due date)
+    * ``estimated_hours`` as ``array('d')``
+    * ``importance`` as ``array('b')`` (``array('d')`` if any value is fractional)
+    * dependencies in CSR form: the ids of task ``i`` are
+      ``dependency_ids[dependency_offsets[i]:dependency_offsets[i + 1]]``,
+      deduplicated per task
+    
+    TaskBatch wraps the numeric columns without copying, and strategies'
+    ``score_batch`` accepts a table directly. Indexing or iterating
+    builds serializer-shaped dicts on demand, so only the tasks that are
+    actually returned ever become dicts. Fields other than the ones above
+    are not kept.
+    """
+    
+    def __init__(self, ids: Ids, titles: List[Optional[str]], due_timestamp: array,
+                 estimated_hours: array, importance: array, dependency_offsets: array,
+                 dependency_ids: Ids, timezone=None):
+        self.ids = ids
+        self.titles = titles
+        self.due_timestamp = due_timestamp
+        self.estimated_hours = estimated_hours
+        self.importance = importance
+        self.dependency_offsets = dependency_offsets
+        self.dependency_ids = dependency_ids
+        # Used to turn epoch seconds back into datetimes
+        self.timezone = timezone
+    
+    @classmethod
+    def from_records(cls, records: Iterable[TaskRecord],
+                     context: Optional[ScoringContext] = None) -> 'TaskTable':
+        """Build a table from (id, title, due_date, hours, importance, dependencies) tuples"""
+        context = ensure_context(context)
+        due_timestamp = context.due_timestamp
+        nan = float('nan')
+        
+        ids, titles, dependency_ids = [], [], []
+        due_timestamps, estimated_hours, importance = array('d'), array('d'), []
+        dependency_offsets = array('q', [0])
+        for task_id, title, due_date, hours, task_importance, dependencies in records:
+            ids.append(task_id)
+            titles.append(title)
+            due_timestamps.append(due_timestamp(due_date) if due_date else nan)
+            estimated_hours.append(hours)
+            importance.append(task_importance)
+            if dependencies:
+                dependency_ids.extend(dependencies if len(dependencies) == 1 else dict.fromkeys(dependencies))
+            dependency_offsets.append(len(dependency_ids))
+        
+        return cls(_compact_ids(ids), titles, due_timestamps, estimated_hours,
+                   _compact_importance(importance), dependency_offsets,
+                   _compact_ids(dependency_ids), context.timezone)
+    
+    @classmethod
+    def from_dicts(cls, tasks: Iterable[Dict[str, Any]],
+                   context: Optional[ScoringContext] = None) -> 'TaskTable':
+        return cls.from_records(
+            ((task.get('id'), task.get('title'), task.get('due_date'),
+              task.get('estimated_hours', 1.0), task.get('importance', 5),
+              task.get('dependencies'))
+             for task in tasks),
+            context
+        )
+    
+    def dependencies_of(self, position: int) -> List[Hashable]:
+        offsets = self.dependency_offsets
+        return list(self.dependency_ids[offsets[position]:offsets[position + 1]])
+    
+    def dependency_lists(self) -> Iterator[Sequence[Hashable]]:
+        """Dependency ids per task, in table order"""
+        offsets, dependency_ids = self.dependency_offsets, self.dependency_ids
+        for start, stop in zip(offsets, offsets[1:]):
+            yield dependency_ids[start:stop]
+    
+    def dependency_index(self) -> DependencyIndex:
+        """Dependent counts of this table's own edges"""
+        return DependencyIndex.from_counts(Counter(self.dependency_ids))
+    
+    def due_date(self, position: int) -> Optional[datetime]:
+        timestamp = self.due_timestamp[position]
+        if timestamp != timestamp:
+            return None
+        return datetime.fromtimestamp(timestamp, tz=self.timezone)
+    
+    def __getitem__(self, position: int) -> Dict[str, Any]:
+        """The task at ``position`` as a fresh serializer-style dict"""
+        if position < 0:
+            position += len(self)
+        if not 0 <= position < len(self):
+            raise IndexError('task position out of range')
+        return {
+            'id': self.ids[position],
+            'title': self.titles[position],
+            'due_date': self.due_date(position),
+            'estimated_hours': self.estimated_hours[position],
+            'importance': self.importance[position],
+            'dependencies': self.dependencies_of(position),
+        }
+    
+    def __iter__(self) -> Iterator[Dict[str, Any]]:
+        for position in range(len(self)):
+            yield self[position]
+    
+    def __len__(self) -> int:
+        return len(self.estimated_hours)
+
+
+def _compact_ids(ids: List[Optional[Hashable]]) -> Ids:
+    """Pack ids into an int64 array when they are all ints (bools excluded)"""
+    if all(type(task_id) is int for task_id in ids):
+        try:
+            return array('q', ids)
+        except OverflowError:
+            pass
+    return ids
+
+
+def _compact_importance(importance: List[Union[int, float]]) -> array:
+    if all(type(value) is int and -128 <= value <= 127 for value in importance):
+        return array('b', importance)
+    return array('d', importance)
@@ -0,0 +1,160 @@
+import threading
+import time
+from bisect import bisect_left
+from contextlib import contextmanager, nullcontext
+from contextvars import ContextVar, Token
+from typing import Dict, Iterator, List, Optional, Tuple
+
+# Upper bounds (seconds) of the stage duration histogram buckets
+DEFAULT_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+_NO_TIMING = nullcontext()
+
+
+class StageTimer:
+    """Wall-clock durations of the named stages of one request.
+    
+    Stages with the same name add up, so a stage entered once per chunk
+    reports its total. Durations are kept in insertion order.
+    """
+    
+    def __init__(self):
+        self.durations: Dict[str, float] = {}
+    
+    @contextmanager
+    def stage(self, name: str) -> Iterator[None]:
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add(name, time.perf_counter() - start)
+    
+    def add(self, name: str, seconds: float) -> None:
+        self.durations[name] = self.durations.get(name, 0.0) + seconds
+    
+    def server_timing(self) -> str:
+        """The durations as a ``Server-Timing`` header value (milliseconds)"""
+        return ', '.join(f'{name};dur={seconds * 1000:.2f}' for name, seconds in self.durations.items())
+
+
+_current_timer: ContextVar[Optional[StageTimer]] = ContextVar('scoring_stage_timer', default=None)
+
+
+def activate(timer: StageTimer) -> Token:
+    """Make ``timer`` collect every stage() entered in this thread or task"""
+    return _current_timer.set(timer)
+
+
+def deactivate(token: Token) -> None:
+    _current_timer.reset(token)
+
+
+def stage(name: str):
+    """Time a block into the active StageTimer; a shared no-op when none is active"""
+    timer = _current_timer.get()
+    if timer is None:
+        return _NO_TIMING
+    return timer.stage(name)
+
+
+class Histogram:
+    """Cumulative-bucket histogram in the Prometheus style"""
+    
+    def __init__(self, buckets: Tuple[float, ...] = DEFAULT_BUCKETS):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+    
+    def observe(self, value: float) -> None:
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+
+class MetricsRegistry:
+    """Process-wide counters and histograms, rendered in Prometheus text format"""
+    
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._counters: Dict[Tuple[str, Tuple[Tuple[str, str], ...]], float] = {}
+        self._histograms: Dict[Tuple[str, Tuple[Tuple[str, str], ...]], Histogram] = {}
+        self._help: Dict[str, Tuple[str, str]] = {}
+    
+    def inc(self, name: str, amount: float = 1, help_text: str = '', **labels: str) -> None:
+        key = (name, _label_key(labels))
+        with self._lock:
+            self._help.setdefault(name, ('counter', help_text))
+            self._counters[key] = self._counters.get(key, 0) + amount
+    
+    def observe(self, name: str, value: float, help_text: str = '', **labels: str) -> None:
+        key = (name, _label_key(labels))
+        with self._lock:
+            self._help.setdefault(name, ('histogram', help_text))
+            histogram = self._histograms.get(key)
+            if histogram is None:
+                histogram = self._histograms[key] = Histogram()
+            histogram.observe(value)
+    
+    def observe_timer(self, timer: StageTimer, **labels: str) -> None:
+        for name, seconds in timer.durations.items():
+            self.observe('scoring_stage_seconds', seconds,
+                         'Time spent per request in each analyze pipeline stage',
+                         stage=name, **labels)
+    
+    def render(self) -> str:
+        lines: List[str] = []
+        with self._lock:
+            for name, (kind, help_text) in sorted(self._help.items()):
+                if help_text:
+                    lines.append(f'# HELP {name} {help_text}')
+                lines.append(f'# TYPE {name} {kind}')
+                if kind == 'counter':
+                    for (metric, labels), value in sorted(self._counters.items()):
+                        if metric == name:
+                            lines.append(f'{name}{_format_labels(labels)} {value:g}')
+                    continue
+                for (metric, labels), histogram in sorted(self._histograms.items(), key=lambda item: item[0]):
+                    if metric != name:
+                        continue
+                    cumulative = 0
+                    for bound, count in zip(histogram.buckets + (float('inf'),), histogram.counts):
+                        cumulative += count
+                        le = '+Inf' if bound == float('inf') else f'{bound:g}'
+                        lines.append(f'{name}_bucket{_format_labels(labels + (("le", le),))} {cumulative}')
+                    lines.append(f'{name}_sum{_format_labels(labels)} {histogram.sum:.6f}')
+                    lines.append(f'{name}_count{_format_labels(labels)} {histogram.count}')
+        return '\n'.join(lines) + '\n'
+    
+    def drain_counters(self) -> List[Tuple[str, str, Dict[str, str], float]]:
+        """Take every counter as ``(name, help, labels, value)``, resetting them.
+        
+        Lets a worker process hand its counts to the serving process,
+        which adds them to its own registry with ``inc``.
+        """
+        with self._lock:
+            drained = [(name, self._help[name][1], dict(labels), value)
+                       for (name, labels), value in self._counters.items()]
+            self._counters.clear()
+        return drained
+    
+    def clear(self) -> None:
+        with self._lock:
+            self._counters.clear()
+            self._histograms.clear()
+            self._help.clear()
+
+
+def _label_key(labels: Dict[str, str]) -> Tuple[Tuple[str, str], ...]:
+    return tuple(sorted((key, str(value)) for key, value in labels.items()))
+
+
+def _format_labels(labels: Tuple[Tuple[str, str], ...]) -> str:
+    if not labels:
+        return ''
+    escaped = (value.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n') for _, value in labels)
+    return '{' + ','.join(f'{key}="{value}"' for (key, _), value in zip(labels, escaped)) + '}'
+
+
+# Shared by the whole process; the metrics endpoint renders this one
+REGISTRY = MetricsRegistry()
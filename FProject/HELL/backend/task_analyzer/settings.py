@@ -1,71 +1,135 @@
-from pathlib import Path
-
-BASE_DIR = Path(__file__).resolve().parent.parent
-SECRET_KEY = 'django-insecure-smart-task-analyzer-2024'
-DEBUG = True
-ALLOWED_HOSTS = ['*']
-
-INSTALLED_APPS = [
-    'django.contrib.admin',
-    'django.contrib.auth',
-    'django.contrib.contenttypes',
-    'django.contrib.sessions',
-    'django.contrib.messages',
-    'django.contrib.staticfiles',
-    'rest_framework',
-    'corsheaders',
-    'tasks',
-]
-
-MIDDLEWARE = [
-    'corsheaders.middleware.CorsMiddleware',
-    'django.middleware.security.SecurityMiddleware',
-    'django.contrib.sessions.middleware.SessionMiddleware',
-    'django.middleware.common.CommonMiddleware',
-    'django.middleware.csrf.CsrfViewMiddleware',
-    'django.contrib.auth.middleware.AuthenticationMiddleware',
-    'django.contrib.messages.middleware.MessageMiddleware',
-    'django.middleware.clickjacking.XFrameOptionsMiddleware',
-]
-
-ROOT_URLCONF = 'task_analyzer.urls'
-
-TEMPLATES = [
-    {
-        'BACKEND': 'django.template.backends.django.DjangoTemplates',
-        'DIRS': [],
-        'APP_DIRS': True,
-        'OPTIONS': {
-            'context_processors': [
-                'django.template.context_processors.debug',
-                'django.template.context_processors.request',
-                'django.contrib.auth.context_processors.auth',
-                'django.contrib.messages.context_processors.messages',
-            ],
-        },
-    },
-]
-
-WSGI_APPLICATION = 'task_analyzer.wsgi.application'
-
-DATABASES = {
-    'default': {
-        'ENGINE': 'django.db.backends.sqlite3',
-        'NAME': BASE_DIR / 'db.sqlite3',
-    }
-}
-
-LANGUAGE_CODE = 'en-us'
-TIME_ZONE = 'UTC'
-USE_I18N = True
-USE_TZ = True
-STATIC_URL = 'static/'
-DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
-
-REST_FRAMEWORK = {
-    'DEFAULT_RENDERER_CLASSES': [
-        'rest_framework.renderers.JSONRenderer',
-    ]
-}
-
-CORS_ALLOW_ALL_ORIGINS = True
\ No newline at end of file
+from pathlib import Path
+
+BASE_DIR = Path(__file__).resolve().parent.parent
+SECRET_KEY = 'django-insecure-smart-task-analyzer-2024'
+DEBUG = True
+ALLOWED_HOSTS = ['*']
+
+INSTALLED_APPS = [
+    'django.contrib.admin',
+    'django.contrib.auth',
+    'django.contrib.contenttypes',
+    'django.contrib.sessions',
+    'django.contrib.messages',
+    'django.contrib.staticfiles',
+    'rest_framework',
+    'corsheaders',
+    'tasks',
+]
+
+MIDDLEWARE = [
+    'tasks.middleware.ScoringTimingMiddleware',
+    'corsheaders.middleware.CorsMiddleware',
+    'django.middleware.security.SecurityMiddleware',
+    'django.contrib.sessions.middleware.SessionMiddleware',
+    'django.middleware.common.CommonMiddleware',
+    'django.middleware.csrf.CsrfViewMiddleware',
+    'django.contrib.auth.middleware.AuthenticationMiddleware',
+    'django.contrib.messages.middleware.MessageMiddleware',
+    'django.middleware.clickjacking.XFrameOptionsMiddleware',
+]
+
+ROOT_URLCONF = 'task_analyzer.urls'
+
+TEMPLATES = [
+    {
+        'BACKEND': 'django.template.backends.django.DjangoTemplates',
+        'DIRS': [],
+        'APP_DIRS': True,
+        'OPTIONS': {
+            'context_processors': [
+                'django.template.context_processors.debug',
+                'django.template.context_processors.request',
+                'django.contrib.auth.context_processors.auth',
+                'django.contrib.messages.context_processors.messages',
+            ],
+        },
+    },
+]
+
+WSGI_APPLICATION = 'task_analyzer.wsgi.application'
+ASGI_APPLICATION = 'task_analyzer.asgi.application'
+
+DATABASES = {
+    'default': {
+        'ENGINE': 'django.db.backends.sqlite3',
+        'NAME': BASE_DIR / 'db.sqlite3',
+    }
+}
+
+LANGUAGE_CODE = 'en-us'
+TIME_ZONE = 'UTC'
+USE_I18N = True
+USE_TZ = True
+STATIC_URL = 'static/'
+DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
+
+REST_FRAMEWORK = {
+    'DEFAULT_RENDERER_CLASSES': [
+        'rest_framework.renderers.JSONRenderer',
+    ]
+}
+
+CORS_ALLOW_ALL_ORIGINS = True
+
+# Result cache in front of /api/tasks/analyze/. BACKEND is 'lru' for an
+# in-process cache of MAX_ENTRIES results, or 'django' to use the cache
+# named by ALIAS in CACHES.
+SCORING_RESULT_CACHE = {
+    'BACKEND': 'lru',
+    'MAX_ENTRIES': 256,
+}
+
+# Analyze/score batches of at least THRESHOLD tasks are scored in a process
+# pool of WORKERS processes (None: one per CPU) that stays up between
+# requests, CHUNK_SIZE tasks per job. Set THRESHOLD to None to disable.
+SCORING_PARALLEL = {
+    'THRESHOLD': 200000,
+    'WORKERS': None,
+    'CHUNK_SIZE': 100000,
+}
+
+# Per-stage timers for the Server-Timing header and /metrics. PROFILING
+# allows ?profile=1 to run a request under cProfile.
+SCORING_TIMING = {
+    'ENABLED': True,
+    'PROFILING': DEBUG,
+}
+
+# Custom strategies (inline definitions and StrategyProfiles) are compiled
+# once per distinct definition; at most MAX_ENTRIES stay in memory per
+# process, least recently used evicted first.
+SCORING_CUSTOM_STRATEGIES = {
+    'MAX_ENTRIES': 1024,
+}
+
+# ASGI serving (task_analyzer.asgi). Analyze bodies of at least
+# HEAVY_BYTES (about 1500 tasks) run in a pool of HEAVY_WORKERS processes
+# niced by HEAVY_NICENESS, so the OS favours small requests; up to
+# MAX_WAITING more wait for a worker and further heavy requests get a 503.
+# Analyze and suggest requests still running after DEADLINE_SECONDS get a 504.
+SCORING_ASYNC = {
+    'HEAVY_BYTES': 256 * 1024,
+    'HEAVY_WORKERS': 2,
+    'HEAVY_NICENESS': 5,
+    'MAX_WAITING': 8,
+    'DEADLINE_SECONDS': 30.0,
+}
+
+# Background analysis jobs (/api/tasks/jobs/): backlogs are stored in
+# chunks of CHUNK_SIZE tasks and scored by WORKERS threads of the serving
+# process, which look for leftover work every POLL_SECONDS. Set WORKERS
+# to 0 to leave jobs to ``manage.py run_jobs``.
+SCORING_JOBS = {
+    'WORKERS': 2,
+    'CHUNK_SIZE': 10000,
+    'POLL_SECONDS': 5.0,
+}
+
+# Delta sessions (/api/tasks/sessions/): ranked backlogs kept in memory
+# between single-task edits. Sessions idle for IDLE_SECONDS expire and at
+# most MAX_SESSIONS are kept per process, least recently used dropped first.
+SCORING_SESSIONS = {
+    'MAX_SESSIONS': 100,
+    'IDLE_SECONDS': 30 * 60,
+}
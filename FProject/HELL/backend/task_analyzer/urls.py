@@ -1,20 +1,34 @@
-from django.contrib import admin
-from django.urls import path, include
-from django.http import JsonResponse
-
-def home(request):
-    return JsonResponse({
-        "message": "🚀 Smart Task Analyzer API is Running!",
-        "endpoints": {
-            "GET suggestions": "/api/tasks/suggest/",
-            "POST analyze": "/api/tasks/analyze/",
-            "admin": "/admin/"
-        },
-        "frontend": "Open frontend/index.html in browser"
-    })
-
-urlpatterns = [
-    path('', home),
-    path('admin/', admin.site.urls),
-    path('api/tasks/', include('tasks.urls')),
+from django.contrib import admin
+from django.urls import path, include
+from django.http import JsonResponse
+
+from tasks.views import metrics
+
+def home(request):
+    return JsonResponse({
+        "message": "🚀 Smart Task Analyzer API is Running!",
+        "endpoints": {
+            "GET suggestions": "/api/tasks/suggest/",
+            "POST analyze": "/api/tasks/analyze/",
+            "POST score stored tasks": "/api/tasks/score/",
+            "GET top stored tasks": "/api/tasks/top/",
+            "POST plan schedule": "/api/tasks/plan/",
+            "GET/POST strategy profiles": "/api/tasks/strategies/",
+            "POST bulk import": "/api/tasks/import/",
+            "GET export (csv, ndjson, columnar)": "/api/tasks/export/?format=csv",
+            "POST analysis job": "/api/tasks/jobs/",
+            "GET job progress / results": "/api/tasks/jobs/<id>/, /api/tasks/jobs/<id>/results/",
+            "POST delta session": "/api/tasks/sessions/",
+            "GET/PATCH/DELETE delta session": "/api/tasks/sessions/<id>/",
+            "GET metrics": "/metrics",
+            "admin": "/admin/"
+        },
+        "frontend": "Open frontend/index.html in browser"
+    })
+
+urlpatterns = [
+    path('', home),
+    path('admin/', admin.site.urls),
+    path('metrics', metrics),
+    path('api/tasks/', include('tasks.urls')),
 ]
\ No newline at end of file
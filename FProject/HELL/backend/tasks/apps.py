@@ -0,0 +1,18 @@
+from django.apps import AppConfig
+
+
+class TasksConfig(AppConfig):
+    default_auto_field = 'django.db.models.BigAutoField'
+    name = 'tasks'
+    
+    def ready(self):
+        from django.conf import settings
+        from task_analyzer.scoring import custom
+        from . import signals  # noqa: F401
+        
+        # The scoring package defers NumPy for the CLI's sake; servers score
+        # from many threads, so load it once here, before any request
+        import numpy  # noqa: F401
+        
+        options = getattr(settings, 'SCORING_CUSTOM_STRATEGIES', {})
+        custom.configure(options.get('MAX_ENTRIES', custom.DEFAULT_MAX_STRATEGIES))
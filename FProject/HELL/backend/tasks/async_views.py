@@ -0,0 +1,235 @@
+import asyncio
+import json
+import multiprocessing
+import threading
+from concurrent.futures import BrokenExecutor, ProcessPoolExecutor
+from functools import partial
+from itertools import islice
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import close_old_connections
+from django.http import HttpResponse, HttpResponseNotAllowed, HttpResponseNotModified, JsonResponse
+
+from task_analyzer.scoring.timing import REGISTRY, StageTimer, activate, deactivate, stage
+
+from . import views
+from .workers import setup_worker
+
+# Defaults for settings.SCORING_ASYNC
+DEFAULT_HEAVY_BYTES = 256 * 1024
+DEFAULT_HEAVY_WORKERS = 2
+DEFAULT_MAX_WAITING = 8
+DEFAULT_HEAVY_NICENESS = 5
+DEFAULT_DEADLINE_SECONDS = 30.0
+# Streamed NDJSON lines handed from the worker thread to the event loop at a time
+STREAM_BATCH_SIZE = 256
+
+class Overloaded(Exception):
+    """Every heavy worker is busy and the waiting line is full"""
+
+class WorkersUnavailable(Exception):
+    """The heavy worker pool broke, e.g. a worker process died; it is rebuilt for the next request"""
+
+class AdmissionGate:
+    """Bounded executor for heavy requests, with admission control.
+    
+    At most ``workers`` heavy requests run at once and ``max_waiting``
+    more may queue for a worker; beyond that ``run`` raises Overloaded
+    straight away instead of letting the backlog grow. A request that
+    times out while still queued is dropped from the queue; one that
+    already started keeps its slot until it finishes, so the bound
+    holds for the work actually running.
+    
+    Once the executor breaks, requests using it raise WorkersUnavailable
+    and it is swapped for a fresh one from ``make_executor``.
+    """
+    
+    def __init__(self, executor, workers=DEFAULT_HEAVY_WORKERS, max_waiting=DEFAULT_MAX_WAITING,
+                 make_executor=None):
+        self.executor = executor
+        self.make_executor = make_executor
+        self.capacity = workers + max_waiting
+        self.admitted = 0
+        self._lock = threading.Lock()
+    
+    async def run(self, function, *args, timeout=None):
+        """``function(*args)`` in the executor; asyncio.TimeoutError after ``timeout`` seconds"""
+        with self._lock:
+            if self.admitted >= self.capacity:
+                raise Overloaded()
+            self.admitted += 1
+            executor = self.executor
+        try:
+            future = executor.submit(function, *args)
+        except BaseException as e:
+            self._release()
+            if isinstance(e, BrokenExecutor):
+                self._replace(executor)
+                raise WorkersUnavailable() from e
+            raise
+        future.add_done_callback(self._release)
+        try:
+            return await asyncio.wait_for(asyncio.wrap_future(future), timeout)
+        except BrokenExecutor as e:
+            self._replace(executor)
+            raise WorkersUnavailable() from e
+    
+    def _release(self, future=None):
+        with self._lock:
+            self.admitted -= 1
+    
+    def _replace(self, broken):
+        # Every request that saw the break gets here; only the first swaps
+        with self._lock:
+            if self.executor is not broken or self.make_executor is None:
+                return
+            self.executor = self.make_executor()
+        broken.shutdown(wait=False)
+
+_gate = None
+_gate_lock = threading.Lock()
+
+def get_admission_gate():
+    """Build the AdmissionGate described by ``settings.SCORING_ASYNC`` once.
+    
+    Heavy requests are CPU-bound Python; in threads they would hold the
+    GIL against the event loop and every small request, so they run in
+    a process pool that stays up between requests. Workers are spawned
+    rather than forked from the threaded server and set Django up from
+    the inherited DJANGO_SETTINGS_MODULE.
+    """
+    global _gate
+    with _gate_lock:
+        if _gate is None:
+            options = getattr(settings, 'SCORING_ASYNC', {})
+            workers = options.get('HEAVY_WORKERS', DEFAULT_HEAVY_WORKERS)
+            make_executor = partial(ProcessPoolExecutor, workers, mp_context=multiprocessing.get_context('spawn'),
+                                    initializer=setup_worker,
+                                    initargs=(options.get('HEAVY_NICENESS', DEFAULT_HEAVY_NICENESS),))
+            _gate = AdmissionGate(make_executor(), workers, options.get('MAX_WAITING', DEFAULT_MAX_WAITING),
+                                  make_executor=make_executor)
+        return _gate
+
+def parse_and_analyze(body, params):
+    """Analyze payload of a raw JSON request body"""
+    try:
+        with stage('parse'):
+            data = json.loads(body or b'{}')
+        if not isinstance(data, dict):
+            raise ValueError('Expected a JSON object')
+    except ValueError as e:
+        return {'error': str(e)}, 400, {}
+    return views.analyze_payload(data, params)
+
+def suggest(params, request):
+    # Conditional headers are checked here, so a 304 skips encoding too
+    return views.suggest_payload(params, request)
+
+def encode_payload(function, *args):
+    """Run a payload function and JSON-encode its body, off the event loop.
+    
+    Stages are timed on a StageTimer of its own, since this may run in
+    another process; returns ``(content, status, headers, durations)``.
+    """
+    timer = StageTimer()
+    token = activate(timer)
+    try:
+        body, status, headers = function(*args)
+        with stage('encode'):
+            content = b'' if body is None else json.dumps(body, cls=DjangoJSONEncoder).encode()
+    finally:
+        deactivate(token)
+        # Connections opened by pool threads are not closed by the request signals
+        close_old_connections()
+    return content, status, headers, timer.durations
+
+def encode_payload_in_process(function, *args):
+    # Counters incremented here would never reach /metrics, so send them along
+    return encode_payload(function, *args), REGISTRY.drain_counters()
+
+async def analyze_tasks(request):
+    """Async analyze for the ASGI application (task_analyzer.asgi).
+    
+    Same body, parameters and response as the DRF view. Bodies of at
+    least ``SCORING_ASYNC['HEAVY_BYTES']`` are parsed and ranked in the
+    AdmissionGate's process pool, so they can't starve small requests,
+    which run on asgiref's shared threads. A full gate answers 503 and a
+    request still running after ``DEADLINE_SECONDS`` answers 504.
+    NDJSON uploads are passed on to the streaming sync view.
+    """
+    if request.method != 'POST':
+        return HttpResponseNotAllowed(['POST'])
+    if request.content_type == views.NDJSON_CONTENT_TYPE:
+        response = await sync_to_async(views.analyze_tasks, thread_sensitive=False)(request)
+        if response.streaming and not response.is_async:
+            response.streaming_content = iterate_in_thread(response.streaming_content)
+        return response
+    
+    # Sized by bytes: parsing the body is part of the heavy work
+    heavy = len(request.body) >= async_option('HEAVY_BYTES', DEFAULT_HEAVY_BYTES)
+    return await respond(request, 'analyze', heavy, parse_and_analyze, request.body, request.GET.dict())
+
+async def suggest_tasks(request):
+    """Async suggest for the ASGI application; always a small request"""
+    if request.method != 'GET':
+        return HttpResponseNotAllowed(['GET'])
+    return await respond(request, 'suggest', False, suggest, request.GET.dict(), request)
+
+async def respond(request, endpoint, heavy, function, *args):
+    deadline = async_option('DEADLINE_SECONDS', DEFAULT_DEADLINE_SECONDS)
+    try:
+        if heavy:
+            result, counters = await get_admission_gate().run(
+                encode_payload_in_process, function, *args, timeout=deadline)
+            for name, help_text, labels, value in counters:
+                REGISTRY.inc(name, value, help_text, **labels)
+        else:
+            result = await asyncio.wait_for(
+                sync_to_async(encode_payload, thread_sensitive=False)(function, *args), deadline)
+    except Overloaded:
+        REGISTRY.inc('scoring_rejected_total', help_text='Async requests refused, by endpoint and reason',
+                     endpoint=endpoint, reason='overloaded')
+        return JsonResponse({'error': 'Server is busy with other large requests, retry shortly'},
+                            status=503, headers={'Retry-After': '1'})
+    except WorkersUnavailable:
+        REGISTRY.inc('scoring_rejected_total', help_text='Async requests refused, by endpoint and reason',
+                     endpoint=endpoint, reason='workers')
+        return JsonResponse({'error': 'Scoring workers are restarting, retry shortly'},
+                            status=503, headers={'Retry-After': '1'})
+    except asyncio.TimeoutError:
+        REGISTRY.inc('scoring_rejected_total', help_text='Async requests refused, by endpoint and reason',
+                     endpoint=endpoint, reason='deadline')
+        return JsonResponse({'error': f'{endpoint} did not finish within {deadline:g}s'}, status=504)
+    
+    content, status, headers, durations = result
+    timer = getattr(request, 'stage_timer', None)
+    if timer is not None:
+        for name, seconds in durations.items():
+            timer.add(name, seconds)
+    if status == 304:
+        return HttpResponseNotModified(headers=headers)
+    return HttpResponse(content, status=status, headers=headers, content_type='application/json')
+
+async def iterate_in_thread(iterator, batch_size=STREAM_BATCH_SIZE):
+    """Drain a sync iterator from a worker thread, ``batch_size`` items per hop.
+    
+    Django would otherwise read a sync streaming body into one list
+    before sending any of it.
+    """
+    next_batch = sync_to_async(lambda: list(islice(iterator, batch_size)), thread_sensitive=False)
+    while True:
+        batch = await next_batch()
+        if not batch:
+            return
+        yield b''.join(batch)
+
+def async_option(name, default):
+    return getattr(settings, 'SCORING_ASYNC', {}).get(name, default)
+
+# Async views do their own method checks and take JSON, not forms, so
+# like the DRF views they skip CSRF. Set directly: Django 4.2's
+# csrf_exempt decorator would turn them into sync views.
+analyze_tasks.csrf_exempt = True
+suggest_tasks.csrf_exempt = True
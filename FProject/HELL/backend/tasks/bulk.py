@@ -0,0 +1,290 @@
+import csv
+import io
+import json
+import math
+from datetime import date, datetime
+
+from django.db import transaction
+from django.utils import timezone
+
+from task_analyzer.scoring.context import parse_due_date
+from task_analyzer.scoring.streaming import chunked
+
+from .materialized import refresh_scores
+from .models import Task
+
+# Rows per INSERT/UPDATE statement and ids per IN (...) lookup
+DEFAULT_BATCH_SIZE = 1000
+# Validation errors listed before the rest are summarized
+MAX_REPORTED_ERRORS = 20
+# Rows serialized per chunk of a streamed export
+EXPORT_CHUNK_SIZE = 2000
+
+EXPORT_FIELDS = ('id', 'title', 'due_date', 'estimated_hours', 'importance', 'dependencies')
+TITLE_MAX_LENGTH = Task._meta.get_field('title').max_length
+
+EXPORT_FORMATS = {
+    'csv': 'text/csv',
+    'ndjson': 'application/x-ndjson',
+    'columnar': 'application/json',
+}
+
+class BulkImportError(ValueError):
+    """Rejected import; ``errors`` lists the problems as ``row N: message``"""
+    
+    def __init__(self, errors):
+        self.errors = errors
+        shown = errors[:MAX_REPORTED_ERRORS]
+        more = len(errors) - len(shown)
+        super().__init__('; '.join(shown) + (f'; and {more} more' if more > 0 else ''))
+
+class ImportResult:
+    def __init__(self, ids, created, updated):
+        # Database id of every imported record, in input order
+        self.ids = ids
+        self.created = created
+        self.updated = updated
+
+def read_csv(lines):
+    """Task dicts from CSV with the export columns; ``dependencies`` separated by ``;``"""
+    for row in csv.DictReader(line.decode() if isinstance(line, bytes) else line for line in lines):
+        record = {key: value for key, value in row.items() if key and value not in (None, '')}
+        if 'dependencies' in record:
+            record['dependencies'] = [part for part in record['dependencies'].split(';') if part.strip()]
+        yield record
+
+def validate_records(records, now=None, allow_past_due=False):
+    """Check and normalize task dicts without going through DRF.
+    
+    One pass with plain type checks per field; every due date is compared
+    against the same ``now``. Numeric fields may be strings (CSV). Returns
+    ``(id, title, due_date, estimated_hours, importance, dependencies)``
+    tuples or raises BulkImportError listing every bad row.
+    """
+    now = now or timezone.now()
+    default_timezone = timezone.get_current_timezone()
+    cleaned, errors = [], []
+    for row, record in enumerate(records, 1):
+        try:
+            if not isinstance(record, dict):
+                raise ValueError('expected an object')
+            task_id = record.get('id')
+            if task_id is not None:
+                task_id = _integer(task_id, 'id', low=1)
+            title = record.get('title')
+            if not isinstance(title, str) or not title.strip():
+                raise ValueError('title is required')
+            if len(title) > TITLE_MAX_LENGTH:
+                raise ValueError(f'title is longer than {TITLE_MAX_LENGTH} characters')
+            importance = _integer(record.get('importance', 5), 'importance', low=1, high=10)
+            hours = _number(record.get('estimated_hours', 1.0), 'estimated_hours')
+            if hours <= 0:
+                raise ValueError('estimated_hours must be positive')
+            due_date = record.get('due_date')
+            if due_date:
+                due_date = _due_date(due_date, default_timezone)
+                if not allow_past_due and due_date < now:
+                    raise ValueError('due_date cannot be in the past')
+            else:
+                due_date = None
+            dependencies = record.get('dependencies') or []
+            if not isinstance(dependencies, (list, tuple)):
+                raise ValueError('dependencies must be a list of ids')
+            dependencies = list(dict.fromkeys(_integer(value, 'dependencies', low=1) for value in dependencies))
+        except (TypeError, ValueError) as e:
+            errors.append(f'row {row}: {e}')
+            continue
+        cleaned.append((task_id, title, due_date, hours, importance, dependencies))
+    
+    seen = set()
+    for row, (task_id, *_rest) in enumerate(cleaned, 1):
+        if task_id is not None:
+            if task_id in seen:
+                errors.append(f'row {row}: duplicate id {task_id}')
+            seen.add(task_id)
+    if errors:
+        raise BulkImportError(errors)
+    return cleaned
+
+def import_tasks(records, batch_size=DEFAULT_BATCH_SIZE, allow_past_due=False, now=None):
+    """Insert or update many tasks in one transaction.
+    
+    A record whose ``id`` is an existing task updates that task, and
+    replaces its dependencies; any other record creates a task, its
+    ``id`` (if any) only naming it for other records' ``dependencies``.
+    Rows go in with batched bulk_create/bulk_update, then dependency ids
+    are resolved (records of this import first, then existing tasks) and
+    the edges are inserted in a second batched pass. Materialized scores
+    of the touched tasks are refreshed at the end, since bulk writes
+    skip the model signals.
+    """
+    now = now or timezone.now()
+    cleaned = validate_records(records, now, allow_past_due)
+    
+    with transaction.atomic():
+        existing = _existing_ids((task_id for task_id, *_ in cleaned if task_id is not None), batch_size)
+        
+        to_update, to_create = [], []
+        for task_id, title, due_date, hours, importance, _ in cleaned:
+            task = Task(title=title, due_date=due_date, estimated_hours=hours, importance=importance)
+            if task_id in existing:
+                task.id = task_id
+                task.updated_at = now
+                to_update.append(task)
+            else:
+                to_create.append(task)
+        Task.objects.bulk_update(to_update, ['title', 'due_date', 'estimated_hours', 'importance', 'updated_at'],
+                                 batch_size=batch_size)
+        Task.objects.bulk_create(to_create, batch_size=batch_size)
+        
+        created = iter(to_create)
+        ids, references = [], {}
+        for task_id, *_ in cleaned:
+            pk = task_id if task_id in existing else next(created).pk
+            ids.append(pk)
+            if task_id is not None:
+                references[task_id] = pk
+        
+        # Second pass: dependency ids become database ids
+        unresolved = {dep for *_, dependencies in cleaned for dep in dependencies if dep not in references}
+        known = _existing_ids(unresolved, batch_size)
+        missing = unresolved - known
+        if missing:
+            raise BulkImportError([f'unknown dependency ids: {", ".join(map(str, sorted(missing)))}'])
+        
+        # Old and new dependencies both change dependent counts, so both are re-scored
+        Edge = Task.dependencies.through
+        dependency_ids = set()
+        for chunk in chunked(to_update, batch_size):
+            old_edges = Edge.objects.filter(from_task_id__in=[task.pk for task in chunk])
+            dependency_ids.update(old_edges.values_list('to_task_id', flat=True))
+            old_edges.delete()
+        edges = (
+            Edge(from_task_id=pk, to_task_id=references.get(dep, dep))
+            for pk, (*_, dependencies) in zip(ids, cleaned)
+            for dep in dependencies
+        )
+        for chunk in chunked(edges, batch_size):
+            Edge.objects.bulk_create(chunk, ignore_conflicts=True)
+            dependency_ids.update(edge.to_task_id for edge in chunk)
+        
+        for chunk in chunked(set(ids) | dependency_ids, batch_size):
+            refresh_scores(chunk)
+    
+    return ImportResult(ids, len(to_create), len(to_update))
+
+def export_tasks(queryset, format='ndjson', chunk_size=EXPORT_CHUNK_SIZE):
+    """Stream tasks as CSV, NDJSON or columnar JSON text chunks.
+    
+    Rows come from ``for_scoring`` (three queries into a TaskTable), not
+    DRF serializers. ``columnar`` is one JSON object with an array per
+    field, due dates as epoch seconds and dependencies as CSR offsets
+    into ``dependency_ids``, like TaskTable.
+    """
+    if format not in EXPORT_FORMATS:
+        raise ValueError(f'Unknown export format: {format}')
+    table, _ = queryset.order_by('id').for_scoring()
+    if format == 'columnar':
+        return _export_columnar(table, chunk_size)
+    rows = _export_rows(table)
+    if format == 'csv':
+        return _export_csv(rows, chunk_size)
+    return _export_ndjson(rows, chunk_size)
+
+def _export_rows(table):
+    for position in range(len(table)):
+        due_date = table.due_date(position)
+        yield (
+            table.ids[position],
+            table.titles[position],
+            due_date and due_date.isoformat(),
+            table.estimated_hours[position],
+            table.importance[position],
+            list(table.dependencies_of(position)),
+        )
+
+def _export_csv(rows, chunk_size):
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(EXPORT_FIELDS)
+    for chunk in chunked(rows, chunk_size):
+        writer.writerows(
+            (task_id, title, due_date or '', hours, importance, ';'.join(map(str, dependencies)))
+            for task_id, title, due_date, hours, importance, dependencies in chunk
+        )
+        yield buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate()
+    if buffer.tell():
+        yield buffer.getvalue()
+
+def _export_ndjson(rows, chunk_size):
+    for chunk in chunked(rows, chunk_size):
+        yield ''.join(json.dumps(dict(zip(EXPORT_FIELDS, row))) + '\n' for row in chunk)
+
+def _export_columnar(table, chunk_size):
+    due_dates = [None if math.isnan(due) else due for due in table.due_timestamp]
+    columns = (
+        ('id', table.ids),
+        ('title', table.titles),
+        ('due_date', due_dates),
+        ('estimated_hours', table.estimated_hours),
+        ('importance', table.importance),
+        ('dependency_offsets', table.dependency_offsets),
+        ('dependency_ids', table.dependency_ids),
+    )
+    yield f'{{"format":"columnar","count":{len(table)},"columns":{{'
+    for index, (name, values) in enumerate(columns):
+        yield ('' if index == 0 else ',') + json.dumps(name) + ':['
+        for start in range(0, len(values), chunk_size):
+            part = json.dumps(list(values[start:start + chunk_size]))[1:-1]
+            yield part if start == 0 else ',' + part
+        yield ']'
+    yield '}}\n'
+
+def _existing_ids(ids, batch_size):
+    existing = set()
+    for chunk in chunked(ids, batch_size):
+        existing.update(Task.objects.filter(id__in=chunk).values_list('id', flat=True))
+    return existing
+
+def _integer(value, name, low=None, high=None):
+    if isinstance(value, bool):
+        raise ValueError(f'{name} must be an integer')
+    if isinstance(value, str):
+        value = value.strip()
+    try:
+        number = int(value)
+    except (TypeError, ValueError):
+        raise ValueError(f'{name} must be an integer')
+    if isinstance(value, float) and value != number:
+        raise ValueError(f'{name} must be an integer')
+    if (low is not None and number < low) or (high is not None and number > high):
+        raise ValueError(f'{name} must be between {low} and {high}' if high is not None
+                         else f'{name} must be at least {low}')
+    return number
+
+def _number(value, name):
+    if isinstance(value, bool):
+        raise ValueError(f'{name} must be a number')
+    try:
+        number = float(value)
+    except (TypeError, ValueError):
+        raise ValueError(f'{name} must be a number')
+    if not math.isfinite(number):
+        raise ValueError(f'{name} must be a number')
+    return number
+
+def _due_date(value, default_timezone):
+    if isinstance(value, date) and not isinstance(value, datetime):
+        value = datetime(value.year, value.month, value.day)
+    elif not isinstance(value, datetime):
+        if not isinstance(value, str):
+            raise ValueError('due_date must be an ISO 8601 string')
+        try:
+            value = parse_due_date(value)
+        except ValueError:
+            raise ValueError(f'due_date is not an ISO 8601 date: {value}')
+    if timezone.is_naive(value):
+        value = timezone.make_aware(value, default_timezone)
+    return value
@@ -0,0 +1,36 @@
+import time
+
+from django.conf import settings
+from django.core.cache import caches
+
+from task_analyzer.scoring.cache import DEFAULT_MAX_ENTRIES, LRUCacheBackend, ResultCache
+
+class DjangoCacheBackend:
+    """ResultCache backend on top of Django's cache framework"""
+    
+    def __init__(self, alias='default'):
+        self.cache = caches[alias]
+    
+    def get(self, key):
+        return self.cache.get(key)
+    
+    def set(self, key, value, expires_at=None):
+        timeout = None if expires_at is None else max(expires_at - time.time(), 0)
+        self.cache.set(key, value, timeout)
+    
+    def clear(self):
+        self.cache.clear()
+
+_result_cache = None
+
+def get_result_cache():
+    """Build the ResultCache described by ``settings.SCORING_RESULT_CACHE`` once"""
+    global _result_cache
+    if _result_cache is None:
+        options = getattr(settings, 'SCORING_RESULT_CACHE', {})
+        if options.get('BACKEND', 'lru') == 'django':
+            backend = DjangoCacheBackend(options.get('ALIAS', 'default'))
+        else:
+            backend = LRUCacheBackend(options.get('MAX_ENTRIES', DEFAULT_MAX_ENTRIES))
+        _result_cache = ResultCache(backend)
+    return _result_cache
@@ -0,0 +1,243 @@
+import logging
+import threading
+
+from django.conf import settings
+from django.db import close_old_connections, transaction
+from django.db.models import F
+from django.utils import timezone
+
+from task_analyzer.scoring import ScoringContext, StrategyFactory
+from task_analyzer.scoring.batch import TaskBatch
+from task_analyzer.scoring.dependencies import DependencyIndex
+from task_analyzer.scoring.explain import strategy_templates
+from task_analyzer.scoring.streaming import chunked
+
+from .models import AnalysisChunk, AnalysisJob, AnalysisResult
+
+logger = logging.getLogger(__name__)
+
+# Defaults for settings.SCORING_JOBS
+DEFAULT_WORKERS = 2
+DEFAULT_CHUNK_SIZE = 10000
+DEFAULT_POLL_SECONDS = 5.0
+# Result rows per INSERT statement
+RESULT_BATCH_SIZE = 1000
+
+ACTIVE_STATUSES = (AnalysisJob.QUEUED, AnalysisJob.RUNNING)
+
+def submit_job(records, strategy, name, explanation_label='', chunk_size=None, now=None):
+    """Store a backlog as a queued job, cut into chunks of ``chunk_size`` tasks.
+    
+    ``records`` may be any iterable of task dicts (e.g. a streamed NDJSON
+    upload); only one chunk is held in memory at a time. Dependent counts
+    are taken over the whole backlog and stored with each chunk, so the
+    chunks score independently. Graph-walking strategies need the whole
+    backlog at once and get a single chunk.
+    """
+    scorer = StrategyFactory.create_strategy(strategy)
+    chunk_size = chunk_size or job_option('CHUNK_SIZE', DEFAULT_CHUNK_SIZE)
+    if scorer.uses_graph:
+        records = [list(records)]
+    else:
+        records = chunked(records, chunk_size)
+    
+    dependency_index = DependencyIndex()
+    chunk_ids = []
+    total = 0
+    with transaction.atomic():
+        job = AnalysisJob.objects.create(
+            strategy=strategy,
+            strategy_name=name,
+            explanation_label=explanation_label or '',
+            reference_time=now or timezone.now(),
+            chunk_size=chunk_size,
+        )
+        for index, tasks in enumerate(records):
+            for offset, task in enumerate(tasks, total):
+                if not isinstance(task, dict):
+                    raise ValueError(f'Task {offset} is not an object')
+                dependency_index.add(task)
+            chunk = AnalysisChunk.objects.create(job=job, index=index, tasks=tasks)
+            chunk_ids.append((chunk.pk, [task.get('id') for task in tasks]))
+            total += len(tasks)
+        if not total:
+            raise ValueError('At least one task is required')
+        
+        if scorer.uses_dependencies:
+            for chunk_id, task_ids in chunk_ids:
+                dependents = [[task_id, dependency_index.dependent_count(task_id)]
+                              for task_id in set(task_ids) if task_id in dependency_index]
+                AnalysisChunk.objects.filter(pk=chunk_id).update(dependents=dependents)
+        
+        job.total = total
+        job.chunks_total = len(chunk_ids)
+        if scorer.uses_graph:
+            job.chunk_size = total
+        job.save(update_fields=['total', 'chunks_total', 'chunk_size'])
+    return job
+
+def score_chunk(job, chunk):
+    """AnalysisResult rows (unsaved) for every task of ``chunk``"""
+    tasks = chunk.tasks
+    scorer = StrategyFactory.create_strategy(job.strategy)
+    dependency_index = DependencyIndex.from_counts({task_id: count for task_id, count in chunk.dependents or []})
+    batch = TaskBatch.from_tasks(tasks, dependency_index, ScoringContext(now=job.reference_time),
+                                 count_dependents=scorer.uses_dependencies,
+                                 with_graph=scorer.uses_graph)
+    scores = scorer.score_batch(batch)
+    if job.explanation_label:
+        templates = strategy_templates(scorer, job.explanation_label)
+        for task, explanation in zip(tasks, templates.explain_batch(batch, range(len(tasks)))):
+            task['explanation'] = explanation
+    
+    start = chunk.index * job.chunk_size
+    return [
+        AnalysisResult(job_id=job.pk, position=position, score=float(score), task=task)
+        for position, task, score in zip(range(start, start + len(tasks)), tasks, scores)
+    ]
+
+def process_chunk(chunk_id):
+    """Score one chunk and commit its results; returns False if there was nothing to do.
+    
+    The results, the chunk's ``done`` flag and the job's counters are
+    committed in one transaction, so a worker dying mid-chunk leaves the
+    chunk pending and it is simply scored again.
+    """
+    chunk = AnalysisChunk.objects.select_related('job').filter(pk=chunk_id, done=False).first()
+    if chunk is None or chunk.job.status not in ACTIVE_STATUSES:
+        return False
+    job = chunk.job
+    AnalysisJob.objects.filter(pk=job.pk, status=AnalysisJob.QUEUED).update(
+        status=AnalysisJob.RUNNING, updated_at=timezone.now())
+    
+    try:
+        results = score_chunk(job, chunk)
+    except Exception as e:
+        AnalysisJob.objects.filter(pk=job.pk).update(
+            status=AnalysisJob.FAILED, error=f'Chunk {chunk.index}: {e}',
+            updated_at=timezone.now(), finished_at=timezone.now())
+        return True
+    
+    with transaction.atomic():
+        # Another worker (or a delete) got there first
+        if not AnalysisChunk.objects.filter(pk=chunk.pk, done=False).update(done=True, tasks=None, dependents=None):
+            return False
+        AnalysisResult.objects.bulk_create(results, batch_size=RESULT_BATCH_SIZE)
+        now = timezone.now()
+        AnalysisJob.objects.filter(pk=job.pk).update(
+            scored=F('scored') + len(results), chunks_done=F('chunks_done') + 1, updated_at=now)
+        AnalysisJob.objects.filter(pk=job.pk, chunks_done=F('chunks_total')).update(
+            status=AnalysisJob.DONE, finished_at=now)
+    return True
+
+def result_page(job, offset, limit):
+    """Ranked task dicts ``offset`` to ``offset + limit``, best first.
+    
+    Reads whatever chunks are committed so far, so before a job finishes
+    this is the partial top-k of the tasks scored up to now. Ties keep
+    backlog order, as in the analyze endpoint.
+    """
+    rows = (job.results.order_by('-score', 'position')
+            .values_list('task', 'score')[offset:offset + limit])
+    ranked = []
+    for task, score in rows:
+        task['score'] = round(score, 2)
+        ranked.append(task)
+    return ranked
+
+class JobRunner:
+    """In-process pool of threads working through pending job chunks.
+    
+    Chunks are claimed in memory only: the database just records which
+    chunks are done, so after a restart every unfinished chunk of an
+    active job is pending again and the job resumes from its last
+    committed chunk. Jobs are worked on oldest first.
+    """
+    
+    def __init__(self, workers=DEFAULT_WORKERS, poll_seconds=DEFAULT_POLL_SECONDS):
+        self.workers = workers
+        self.poll_seconds = poll_seconds
+        self._claimed = set()
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stopping = threading.Event()
+        self._threads = []
+    
+    def start(self):
+        """Start the worker threads once; they pick up jobs left over from a previous run"""
+        with self._lock:
+            if self._threads or not self.workers:
+                return
+            self._stopping.clear()
+            for number in range(self.workers):
+                thread = threading.Thread(target=self._work, name=f'scoring-job-{number}', daemon=True)
+                thread.start()
+                self._threads.append(thread)
+    
+    def wake(self):
+        self._wake.set()
+    
+    def stop(self, timeout=None):
+        self._stopping.set()
+        self._wake.set()
+        for thread in self._threads:
+            thread.join(timeout)
+        self._threads = []
+    
+    def run_pending(self):
+        """Process chunks in the calling thread until none are pending; returns how many"""
+        processed = 0
+        while self.run_one():
+            processed += 1
+        return processed
+    
+    def run_one(self):
+        chunk_id = self._claim()
+        if chunk_id is None:
+            return False
+        try:
+            process_chunk(chunk_id)
+        finally:
+            with self._lock:
+                self._claimed.discard(chunk_id)
+        return True
+    
+    def _claim(self):
+        with self._lock:
+            chunk_id = (AnalysisChunk.objects
+                        .filter(done=False, job__status__in=ACTIVE_STATUSES)
+                        .exclude(pk__in=self._claimed)
+                        .order_by('job__created_at', 'index')
+                        .values_list('pk', flat=True)
+                        .first())
+            if chunk_id is not None:
+                self._claimed.add(chunk_id)
+            return chunk_id
+    
+    def _work(self):
+        while not self._stopping.is_set():
+            try:
+                busy = self.run_one()
+            except Exception:
+                # e.g. the database was locked; the chunk stays pending
+                logger.exception('Scoring job worker failed')
+                busy = False
+            finally:
+                # Pool threads aren't covered by the request signals that close connections
+                close_old_connections()
+            if not busy:
+                self._wake.wait(self.poll_seconds)
+                self._wake.clear()
+
+def job_option(name, default):
+    return getattr(settings, 'SCORING_JOBS', {}).get(name, default)
+
+_runner = None
+
+def get_job_runner():
+    """Build the JobRunner described by ``settings.SCORING_JOBS`` once"""
+    global _runner
+    if _runner is None:
+        _runner = JobRunner(job_option('WORKERS', DEFAULT_WORKERS),
+                            job_option('POLL_SECONDS', DEFAULT_POLL_SECONDS))
+    return _runner
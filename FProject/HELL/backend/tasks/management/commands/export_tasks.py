@@ -0,0 +1,33 @@
+import sys
+
+from django.core.management.base import BaseCommand
+
+from tasks.bulk import EXPORT_FORMATS, export_tasks
+from tasks.models import Task
+
+
+class Command(BaseCommand):
+    help = 'Write every stored task as CSV, NDJSON or columnar JSON'
+    
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--format',
+            choices=sorted(EXPORT_FORMATS),
+            default='ndjson',
+            help='Output format',
+        )
+        parser.add_argument(
+            '--output',
+            default='-',
+            help='File to write, or - for standard output',
+        )
+    
+    def handle(self, *args, **options):
+        output = options['output']
+        target = sys.stdout if output == '-' else open(output, 'w', newline='', encoding='utf-8')
+        try:
+            for chunk in export_tasks(Task.objects.all(), options['format']):
+                target.write(chunk)
+        finally:
+            if target is not sys.stdout:
+                target.close()
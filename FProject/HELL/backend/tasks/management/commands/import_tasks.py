@@ -0,0 +1,60 @@
+import json
+import sys
+
+from django.core.management.base import BaseCommand, CommandError
+
+from task_analyzer.scoring.streaming import iter_ndjson
+from tasks.bulk import DEFAULT_BATCH_SIZE, BulkImportError, import_tasks, read_csv
+
+
+class Command(BaseCommand):
+    help = 'Create or update tasks from a CSV, NDJSON or JSON file in one transaction'
+    
+    def add_arguments(self, parser):
+        parser.add_argument('path', help='File to import, or - for standard input')
+        parser.add_argument(
+            '--format',
+            choices=['csv', 'ndjson', 'json'],
+            help='Input format (default: guessed from the file extension, else ndjson)',
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=DEFAULT_BATCH_SIZE,
+            help='Rows per bulk insert/update statement',
+        )
+        parser.add_argument(
+            '--allow-past-due',
+            action='store_true',
+            help='Accept due dates that have already passed',
+        )
+    
+    def handle(self, *args, **options):
+        path = options['path']
+        input_format = options['format'] or path.rsplit('.', 1)[-1].lower()
+        if input_format not in ('csv', 'json'):
+            input_format = 'ndjson'
+        
+        try:
+            source = sys.stdin if path == '-' else open(path, newline='', encoding='utf-8')
+        except OSError as e:
+            raise CommandError(f'Cannot read {path}: {e.strerror}')
+        try:
+            if input_format == 'csv':
+                records = read_csv(source)
+            elif input_format == 'json':
+                data = json.load(source)
+                records = data.get('tasks', []) if isinstance(data, dict) else data
+            else:
+                records = iter_ndjson(source)
+            result = import_tasks(records, batch_size=options['batch_size'],
+                                  allow_past_due=options['allow_past_due'])
+        except BulkImportError as e:
+            raise CommandError('\n'.join(['Import rejected:', *e.errors]))
+        except ValueError as e:
+            raise CommandError(str(e))
+        finally:
+            if source is not sys.stdin:
+                source.close()
+        
+        self.stdout.write(f'Created {result.created} tasks, updated {result.updated}')
@@ -0,0 +1,21 @@
+from django.core.management.base import BaseCommand
+
+from tasks.materialized import refresh_scores, sweep_band_crossings
+
+
+class Command(BaseCommand):
+    help = 'Sweep materialized task scores whose urgency band boundary has passed'
+    
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--all',
+            action='store_true',
+            help='Rebuild every materialized score instead of sweeping band crossings',
+        )
+    
+    def handle(self, *args, **options):
+        if options['all']:
+            count = refresh_scores()
+        else:
+            count = sweep_band_crossings()
+        self.stdout.write(f'Re-scored {count} tasks')
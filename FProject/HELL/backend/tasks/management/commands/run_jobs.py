@@ -0,0 +1,32 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from tasks.jobs import DEFAULT_POLL_SECONDS, JobRunner
+
+
+class Command(BaseCommand):
+    help = 'Work through queued analysis jobs, resuming unfinished ones from their last committed chunk'
+    
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--once',
+            action='store_true',
+            help='Exit once no chunks are pending instead of waiting for new jobs',
+        )
+        parser.add_argument(
+            '--poll',
+            type=float,
+            default=DEFAULT_POLL_SECONDS,
+            help='Seconds between checks for new jobs',
+        )
+    
+    def handle(self, *args, **options):
+        runner = JobRunner(workers=0)
+        while True:
+            processed = runner.run_pending()
+            if processed:
+                self.stdout.write(f'Processed {processed} chunks')
+            if options['once']:
+                return
+            time.sleep(options['poll'])
@@ -0,0 +1,84 @@
+from datetime import datetime
+
+from django.db.models import Count, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+
+from task_analyzer.scoring import ScoringContext, StrategyFactory
+from task_analyzer.scoring.batch import TaskBatch
+
+from .models import Task, TaskScore
+
+# Graph-walking strategies score a task from everything downstream of it,
+# so they cannot be refreshed one edited task at a time
+MATERIALIZED_STRATEGIES = [
+    name for name, _ in Task.SCORING_STRATEGIES
+    if not StrategyFactory.create_strategy(name).uses_graph
+]
+
+def refresh_scores(task_ids=None, context=None):
+    """Recompute the materialized scores of ``task_ids`` (every task when None).
+    
+    All strategies are scored from one TaskBatch and written back with a
+    single upsert per batch of rows. Returns the number of tasks scored.
+    """
+    context = context or ScoringContext(now=timezone.now())
+    queryset = Task.objects.all()
+    if task_ids is not None:
+        task_ids = list(task_ids)
+        if not task_ids:
+            return 0
+        queryset = queryset.filter(id__in=task_ids)
+    
+    tasks, dependency_index = queryset.for_scoring()
+    if not tasks:
+        return 0
+    
+    batch = TaskBatch.from_table(tasks, dependency_index, context)
+    next_changes = [
+        None if timestamp != timestamp else datetime.fromtimestamp(timestamp, tz=context.timezone)
+        for timestamp in batch.next_band_change().tolist()
+    ]
+    
+    rows = []
+    for strategy in MATERIALIZED_STRATEGIES:
+        scores = StrategyFactory.create_strategy(strategy).score_batch(batch)
+        rows.extend(
+            TaskScore(task_id=task_id, strategy=strategy, score=score,
+                      next_band_change=next_change, computed_at=context.now)
+            for task_id, score, next_change in zip(tasks.ids, scores, next_changes)
+        )
+    
+    TaskScore.objects.bulk_create(
+        rows,
+        update_conflicts=True,
+        unique_fields=['task', 'strategy'],
+        update_fields=['score', 'next_band_change', 'computed_at'],
+    )
+    return len(tasks)
+
+def sweep_band_crossings(now=None):
+    """Re-score only the tasks whose urgency band boundary has passed"""
+    context = ScoringContext(now=now or timezone.now())
+    due_ids = (TaskScore.objects
+               .filter(next_band_change__lte=context.now)
+               .values_list('task_id', flat=True)
+               .distinct())
+    return refresh_scores(list(due_ids), context)
+
+def top_scores(strategy, limit, with_dependents=False):
+    """Highest materialized scores for a strategy, served from the rank index.
+    
+    ``with_dependents`` annotates each row with the task's
+    ``dependent_count``, counted in the same query for the returned rows only.
+    """
+    rows = TaskScore.objects.filter(strategy=strategy).select_related('task')
+    if with_dependents:
+        dependents = (Task.dependencies.through.objects
+                      .filter(to_task=OuterRef('task_id'))
+                      .order_by()
+                      .values('to_task')
+                      .annotate(count=Count('from_task'))
+                      .values('count'))
+        rows = rows.annotate(dependent_count=Coalesce(Subquery(dependents), 0))
+    return rows.order_by('-score')[:limit]
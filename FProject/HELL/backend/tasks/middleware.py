@@ -0,0 +1,121 @@
+import cProfile
+import json
+import pstats
+import time
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+
+from task_analyzer.scoring.timing import REGISTRY, StageTimer, activate, deactivate
+
+# Functions listed in a ?profile=1 response, by time spent in the function itself
+PROFILE_TOP_FUNCTIONS = 25
+
+class ScoringTimingMiddleware:
+    """Time the scoring pipeline stages of every request.
+    
+    Stages recorded with ``task_analyzer.scoring.timing.stage`` (plus
+    ``render`` and ``total``) are returned as a ``Server-Timing`` header and
+    fed into the metrics registry served at ``/metrics``. With profiling
+    allowed, ``?profile=1`` runs the request under cProfile and adds the
+    hottest functions to JSON responses as ``profile``.
+    """
+    
+    sync_capable = True
+    async_capable = True
+    
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            # Stay in async mode under ASGI instead of costing every request a thread hop
+            markcoroutinefunction(self)
+    
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        timing = self.start(request)
+        if timing is None:
+            return self.get_response(request)
+        try:
+            response = self.get_response(request)
+        finally:
+            self.stop(timing)
+        return self.finish(request, response, timing)
+    
+    async def __acall__(self, request):
+        timing = self.start(request)
+        if timing is None:
+            return await self.get_response(request)
+        try:
+            response = await self.get_response(request)
+        finally:
+            self.stop(timing)
+        return self.finish(request, response, timing)
+    
+    def start(self, request):
+        options = getattr(settings, 'SCORING_TIMING', {})
+        if not options.get('ENABLED', True):
+            return None
+        
+        timer = request.stage_timer = StageTimer()
+        profiler = None
+        if options.get('PROFILING', settings.DEBUG) and request.GET.get('profile') == '1':
+            profiler = cProfile.Profile()
+        
+        token = activate(timer)
+        if profiler:
+            profiler.enable()
+        return timer, profiler, token, time.perf_counter()
+    
+    def stop(self, timing):
+        timer, profiler, token, start = timing
+        if profiler:
+            profiler.disable()
+        deactivate(token)
+        timer.add('total', time.perf_counter() - start)
+    
+    def finish(self, request, response, timing):
+        timer, profiler, _, _ = timing
+        response['Server-Timing'] = timer.server_timing()
+        match = getattr(request, 'resolver_match', None)
+        endpoint = match.route if match else 'unmatched'
+        REGISTRY.inc('scoring_requests_total', help_text='Requests handled, by endpoint and status',
+                     endpoint=endpoint, status=response.status_code)
+        REGISTRY.observe_timer(timer, endpoint=endpoint)
+        
+        if profiler:
+            attach_profile(response, profiler)
+        return response
+    
+    def process_template_response(self, request, response):
+        # DRF responses are rendered after the view returns, so time that too
+        timer = getattr(request, 'stage_timer', None)
+        if timer is not None:
+            start = time.perf_counter()
+            response.add_post_render_callback(
+                lambda rendered: timer.add('render', time.perf_counter() - start)
+            )
+        return response
+
+def profile_rows(profiler, limit=PROFILE_TOP_FUNCTIONS):
+    """The ``limit`` functions with the most time spent in their own code"""
+    stats = pstats.Stats(profiler).sort_stats('tottime')
+    rows = []
+    for function in stats.fcn_list[:limit]:
+        _, calls, total_time, cumulative_time, _ = stats.stats[function]
+        filename, line, name = function
+        rows.append({
+            'function': f'{filename}:{line}({name})',
+            'calls': calls,
+            'total_time': round(total_time, 6),
+            'cumulative_time': round(cumulative_time, 6),
+        })
+    return rows
+
+def attach_profile(response, profiler):
+    if response.streaming or not response.get('Content-Type', '').startswith('application/json'):
+        return
+    data = json.loads(response.content)
+    if isinstance(data, dict):
+        data['profile'] = profile_rows(profiler)
+        response.content = json.dumps(data)
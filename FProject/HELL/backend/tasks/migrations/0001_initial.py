@@ -0,0 +1,28 @@
+# Generated by Django 4.2.7 on 2026-10-17 21:38
+
+import django.core.validators
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Task',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('title', models.CharField(max_length=200)),
+                ('due_date', models.DateTimeField(blank=True, db_index=True, null=True)),
+                ('estimated_hours', models.FloatField(default=1.0)),
+                ('importance', models.IntegerField(db_index=True, default=5, validators=[django.core.validators.MinValueValidator(1), django.core.validators.MaxValueValidator(10)])),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('dependencies', models.ManyToManyField(blank=True, related_name='dependents', to='tasks.task')),
+            ],
+        ),
+    ]
@@ -0,0 +1,32 @@
+# Generated by Django 4.2.7 on 2026-10-17 21:40
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tasks', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TaskScore',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('strategy', models.CharField(choices=[('smart_balance', 'Smart Balance'), ('fastest_wins', 'Fastest Wins'), ('high_impact', 'High Impact'), ('deadline_driven', 'Deadline Driven')], max_length=32)),
+                ('score', models.FloatField()),
+                ('next_band_change', models.DateTimeField(blank=True, db_index=True, null=True)),
+                ('computed_at', models.DateTimeField()),
+                ('task', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='scores', to='tasks.task')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['strategy', '-score'], name='taskscore_strategy_rank')],
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='taskscore',
+            constraint=models.UniqueConstraint(fields=('task', 'strategy'), name='unique_task_strategy_score'),
+        ),
+    ]
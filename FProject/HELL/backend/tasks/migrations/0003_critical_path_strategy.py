@@ -0,0 +1,18 @@
+# Generated by Django 4.2.7 on 2026-10-17 21:45
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tasks', '0002_taskscore'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='taskscore',
+            name='strategy',
+            field=models.CharField(choices=[('smart_balance', 'Smart Balance'), ('fastest_wins', 'Fastest Wins'), ('high_impact', 'High Impact'), ('deadline_driven', 'Deadline Driven'), ('critical_path', 'Critical Path')], max_length=32),
+        ),
+    ]
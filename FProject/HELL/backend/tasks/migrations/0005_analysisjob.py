@@ -0,0 +1,67 @@
+# Generated by Django 4.2.7 on 2026-10-17 22:15
+
+from django.db import migrations, models
+import django.db.models.deletion
+import uuid
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tasks', '0004_strategyprofile'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='AnalysisJob',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('strategy', models.JSONField()),
+                ('strategy_name', models.CharField(max_length=100)),
+                ('explanation_label', models.CharField(blank=True, max_length=200)),
+                ('status', models.CharField(choices=[('queued', 'Queued'), ('running', 'Running'), ('done', 'Done'), ('failed', 'Failed')], db_index=True, default='queued', max_length=10)),
+                ('reference_time', models.DateTimeField()),
+                ('chunk_size', models.PositiveIntegerField()),
+                ('chunks_total', models.PositiveIntegerField(default=0)),
+                ('chunks_done', models.PositiveIntegerField(default=0)),
+                ('total', models.PositiveIntegerField(default=0)),
+                ('scored', models.PositiveIntegerField(default=0)),
+                ('error', models.TextField(blank=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('finished_at', models.DateTimeField(blank=True, null=True)),
+            ],
+        ),
+        migrations.CreateModel(
+            name='AnalysisChunk',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('index', models.PositiveIntegerField()),
+                ('tasks', models.JSONField(null=True)),
+                ('dependents', models.JSONField(null=True)),
+                ('done', models.BooleanField(default=False)),
+                ('job', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='chunks', to='tasks.analysisjob')),
+            ],
+        ),
+        migrations.CreateModel(
+            name='AnalysisResult',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('position', models.PositiveIntegerField()),
+                ('score', models.FloatField()),
+                ('task', models.JSONField()),
+                ('job', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='results', to='tasks.analysisjob')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['job', '-score', 'position'], name='analysisresult_job_rank')],
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='analysisresult',
+            constraint=models.UniqueConstraint(fields=('job', 'position'), name='unique_job_result_position'),
+        ),
+        migrations.AddConstraint(
+            model_name='analysischunk',
+            constraint=models.UniqueConstraint(fields=('job', 'index'), name='unique_job_chunk'),
+        ),
+    ]
@@ -1,10 +1,187 @@
-from django.db import models
-
-class Task(models.Model):
-    title = models.CharField(max_length=200)
-    due_date = models.DateTimeField(null=True, blank=True)
-    estimated_hours = models.FloatField(default=1.0)
-    importance = models.IntegerField(default=5)
-    
-    def __str__(self):
-        return self.title
\ No newline at end of file
+import uuid
+
+from django.core.exceptions import ValidationError
+from django.core.validators import MaxValueValidator, MinValueValidator
+from django.db import models
+from django.db.models import Count
+
+from task_analyzer.scoring.custom import normalize_definition
+from task_analyzer.scoring.dependencies import DependencyIndex
+from task_analyzer.scoring.table import TaskTable
+
+class TaskQuerySet(models.QuerySet):
+    SCORING_FIELDS = ('id', 'title', 'due_date', 'estimated_hours', 'importance')
+    
+    def for_scoring(self):
+        """Load the selected tasks as a TaskTable plus their DependencyIndex.
+        
+        Uses three queries however many tasks are selected: the dependency
+        edges, the dependent counts and the task rows, which are streamed
+        straight into the table's columns instead of becoming dicts. Edges
+        and counts join against the selection as a subquery rather than an
+        ``IN`` list of every id, which would hit SQLite's bound-parameter
+        limit on large backlogs. Dependent counts include dependents
+        outside the selection.
+        """
+        selected_ids = self.values('id')
+        edges = Task.dependencies.through.objects
+        dependencies = {}
+        for from_id, to_id in edges.filter(from_task__in=selected_ids).values_list('from_task_id', 'to_task_id'):
+            dependencies.setdefault(from_id, []).append(to_id)
+        
+        counts = (edges.filter(to_task__in=selected_ids)
+                  .values_list('to_task_id')
+                  .annotate(dependents=Count('from_task_id')))
+        dependency_index = DependencyIndex.from_counts(dict(counts))
+        
+        rows = self.values_list(*self.SCORING_FIELDS).iterator()
+        tasks = TaskTable.from_records(
+            (task_id, title, due_date, hours, importance, dependencies.get(task_id))
+            for task_id, title, due_date, hours, importance in rows
+        )
+        return tasks, dependency_index
+
+class Task(models.Model):
+    SCORING_STRATEGIES = [
+        ('smart_balance', 'Smart Balance'),
+        ('fastest_wins', 'Fastest Wins'),
+        ('high_impact', 'High Impact'),
+        ('deadline_driven', 'Deadline Driven'),
+        ('critical_path', 'Critical Path'),
+    ]
+    
+    title = models.CharField(max_length=200)
+    due_date = models.DateTimeField(null=True, blank=True, db_index=True)
+    estimated_hours = models.FloatField(default=1.0)
+    importance = models.IntegerField(
+        default=5,
+        db_index=True,
+        validators=[MinValueValidator(1), MaxValueValidator(10)]
+    )
+    dependencies = models.ManyToManyField(
+        'self',
+        symmetrical=False,
+        related_name='dependents',
+        blank=True
+    )
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+    
+    objects = TaskQuerySet.as_manager()
+    
+    def __str__(self):
+        return self.title
+
+class TaskScore(models.Model):
+    """Materialized score of one task under one strategy.
+    
+    Maintained incrementally by ``tasks.materialized``; ``next_band_change``
+    records when the task's urgency band next flips so a periodic sweep
+    only re-scores tasks whose band may have changed.
+    """
+    task = models.ForeignKey(Task, on_delete=models.CASCADE, related_name='scores')
+    strategy = models.CharField(max_length=32, choices=Task.SCORING_STRATEGIES)
+    score = models.FloatField()
+    next_band_change = models.DateTimeField(null=True, blank=True, db_index=True)
+    computed_at = models.DateTimeField()
+    
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['task', 'strategy'], name='unique_task_strategy_score'),
+        ]
+        indexes = [
+            models.Index(fields=['strategy', '-score'], name='taskscore_strategy_rank'),
+        ]
+    
+    def __str__(self):
+        return f'{self.task_id} {self.strategy}: {self.score:.2f}'
+
+class StrategyProfile(models.Model):
+    """A named custom strategy definition, usable as ``strategy`` by name.
+    
+    ``definition`` holds the weights, thresholds and levels described in
+    ``task_analyzer.scoring.custom.normalize_definition``.
+    """
+    name = models.SlugField(max_length=64, unique=True)
+    definition = models.JSONField()
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+    
+    def clean(self):
+        if self.name in dict(Task.SCORING_STRATEGIES):
+            raise ValidationError({'name': f'{self.name} is a built-in strategy'})
+        try:
+            normalize_definition(self.definition)
+        except ValueError as e:
+            raise ValidationError({'definition': str(e)})
+    
+    def __str__(self):
+        return self.name
+
+class AnalysisJob(models.Model):
+    """A backlog analyzed in the background, chunk by chunk, by ``tasks.jobs``.
+    
+    ``strategy`` is a built-in name or a custom definition. Every chunk is
+    scored against ``reference_time``, so a job resumed after a restart
+    ranks exactly as if it had run in one go.
+    """
+    QUEUED = 'queued'
+    RUNNING = 'running'
+    DONE = 'done'
+    FAILED = 'failed'
+    STATUSES = [
+        (QUEUED, 'Queued'),
+        (RUNNING, 'Running'),
+        (DONE, 'Done'),
+        (FAILED, 'Failed'),
+    ]
+    
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    strategy = models.JSONField()
+    strategy_name = models.CharField(max_length=100)
+    # Label of the explanation templates; blank when explanations were not asked for
+    explanation_label = models.CharField(max_length=200, blank=True)
+    status = models.CharField(max_length=10, choices=STATUSES, default=QUEUED, db_index=True)
+    reference_time = models.DateTimeField()
+    chunk_size = models.PositiveIntegerField()
+    chunks_total = models.PositiveIntegerField(default=0)
+    chunks_done = models.PositiveIntegerField(default=0)
+    total = models.PositiveIntegerField(default=0)
+    scored = models.PositiveIntegerField(default=0)
+    error = models.TextField(blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+    
+    def __str__(self):
+        return f'{self.id} ({self.status}, {self.scored}/{self.total})'
+
+class AnalysisChunk(models.Model):
+    """Input of one chunk of a job; ``done`` is set in the same transaction
+    that stores the chunk's results, and the input is dropped then."""
+    job = models.ForeignKey(AnalysisJob, on_delete=models.CASCADE, related_name='chunks')
+    index = models.PositiveIntegerField()
+    tasks = models.JSONField(null=True)
+    # [task id, dependent count] pairs over the whole backlog, for this chunk's ids
+    dependents = models.JSONField(null=True)
+    done = models.BooleanField(default=False)
+    
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['job', 'index'], name='unique_job_chunk'),
+        ]
+
+class AnalysisResult(models.Model):
+    """One scored task of a job; ``position`` is its place in the submitted backlog"""
+    job = models.ForeignKey(AnalysisJob, on_delete=models.CASCADE, related_name='results')
+    position = models.PositiveIntegerField()
+    score = models.FloatField()
+    task = models.JSONField()
+    
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['job', 'position'], name='unique_job_result_position'),
+        ]
+        indexes = [
+            models.Index(fields=['job', '-score', 'position'], name='analysisresult_job_rank'),
+        ]
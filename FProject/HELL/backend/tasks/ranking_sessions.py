@@ -0,0 +1,50 @@
+import time
+import uuid
+
+from django.conf import settings
+
+from task_analyzer.scoring.cache import LRUCacheBackend
+
+# Defaults for settings.SCORING_SESSIONS
+DEFAULT_MAX_SESSIONS = 100
+DEFAULT_IDLE_SECONDS = 30 * 60
+
+class SessionStore:
+    """Live ScoringSessions of this process, by id.
+    
+    Sessions idle for ``idle_seconds`` expire and the least recently used
+    are dropped beyond ``max_sessions``; their clients get a 404 and
+    upload the backlog again. Sessions live in one process's memory, so
+    with several worker processes a client must keep reaching the same one.
+    """
+    
+    def __init__(self, max_sessions=DEFAULT_MAX_SESSIONS, idle_seconds=DEFAULT_IDLE_SECONDS):
+        self.idle_seconds = idle_seconds
+        self.backend = LRUCacheBackend(max_sessions)
+    
+    def add(self, session, name):
+        """Keep ``session`` (reported with strategy ``name``); returns its new id"""
+        session_id = uuid.uuid4()
+        self.backend.set(str(session_id), (session, name), time.time() + self.idle_seconds)
+        return session_id
+    
+    def get(self, session_id):
+        """``(session, name)``, or None if unknown or expired; using a session keeps it alive"""
+        entry = self.backend.get(str(session_id))
+        if entry is not None:
+            self.backend.set(str(session_id), entry, time.time() + self.idle_seconds)
+        return entry
+    
+    def delete(self, session_id):
+        return self.backend.delete(str(session_id))
+
+_store = None
+
+def get_session_store():
+    """Build the SessionStore described by ``settings.SCORING_SESSIONS`` once"""
+    global _store
+    if _store is None:
+        options = getattr(settings, 'SCORING_SESSIONS', {})
+        _store = SessionStore(options.get('MAX_SESSIONS', DEFAULT_MAX_SESSIONS),
+                              options.get('IDLE_SECONDS', DEFAULT_IDLE_SECONDS))
+    return _store
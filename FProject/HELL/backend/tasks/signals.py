@@ -0,0 +1,40 @@
+from django.db.models.signals import m2m_changed, post_delete, post_save, pre_delete
+from django.dispatch import receiver
+
+from .materialized import refresh_scores
+from .models import Task
+
+# Editing a task only changes its own score and the dependent counts of
+# the tasks it depends on, so those are the only rows refreshed.
+
+@receiver(post_save, sender=Task)
+def refresh_saved_task(sender, instance, raw=False, **kwargs):
+    if raw:
+        return
+    dependency_ids = list(instance.dependencies.values_list('id', flat=True))
+    refresh_scores([instance.pk, *dependency_ids])
+
+@receiver(m2m_changed, sender=Task.dependencies.through)
+def refresh_dependency_change(sender, instance, action, reverse, pk_set, **kwargs):
+    if action == 'pre_clear':
+        # pk_set is not provided for clears, so remember the edges first
+        related = instance.dependents if reverse else instance.dependencies
+        instance._cleared_dependency_ids = list(related.values_list('id', flat=True))
+        return
+    if action not in ('post_add', 'post_remove', 'post_clear'):
+        return
+    
+    related_ids = pk_set if action != 'post_clear' else instance.__dict__.pop('_cleared_dependency_ids', [])
+    if reverse:
+        # instance gained or lost dependents; the dependents' own scores are unchanged
+        refresh_scores([instance.pk])
+    else:
+        refresh_scores([instance.pk, *related_ids])
+
+@receiver(pre_delete, sender=Task)
+def remember_dependencies(sender, instance, **kwargs):
+    instance._deleted_dependency_ids = list(instance.dependencies.values_list('id', flat=True))
+
+@receiver(post_delete, sender=Task)
+def refresh_after_delete(sender, instance, **kwargs):
+    refresh_scores(instance.__dict__.pop('_deleted_dependency_ids', []))
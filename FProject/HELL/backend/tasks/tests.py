@@ -1,60 +1,1546 @@
-from django.test import TestCase
-from django.utils import timezone
-from datetime import datetime, timedelta
-from .models import Task
-from task_analyzer.scoring.algorithms import TaskScorer
-
-class TaskModelTest(TestCase):
-    def test_task_creation(self):
-        task = Task.objects.create(
-            title="Test Task",
-            estimated_hours=2.0,
-            importance=7
-        )
-        self.assertEqual(task.title, "Test Task")
-        self.assertEqual(task.estimated_hours, 2.0)
-        self.assertEqual(task.importance, 7)
-    
-    def test_importance_validation(self):
-        task = Task(title="Test", importance=11)
-        with self.assertRaises(Exception):
-            task.full_clean()
-
-class ScoringAlgorithmTest(TestCase):
-    def setUp(self):
-        self.scorer = TaskScorer()
-        self.sample_tasks = [
-            {
-                'title': 'Urgent Task',
-                'due_date': timezone.now() + timedelta(hours=12),
-                'estimated_hours': 2.0,
-                'importance': 9,
-                'dependencies': []
-            },
-            {
-                'title': 'Important Task', 
-                'due_date': None,
-                'estimated_hours': 4.0,
-                'importance': 10,
-                'dependencies': []
-            }
-        ]
-    
-    def test_smart_balance_strategy(self):
-        score = self.scorer.calculate_score(
-            self.sample_tasks[0], 
-            self.sample_tasks
-        )
-        self.assertGreater(score, 0)
-        self.assertLessEqual(score, 100)
-    
-    def test_fastest_wins_strategy(self):
-        self.scorer.strategy = 'fastest_wins'
-        score = self.scorer.calculate_score(
-            self.sample_tasks[0],
-            self.sample_tasks
-        )
-        # Quick task should score higher in fastest wins
-        self.assertGreater(score, 0)
-    
-    def test_high_impact
\ No newline at end of file
+import asyncio
+import io
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from unittest import mock
+
+from django.test import TestCase, override_settings
+from django.utils import timezone
+from datetime import datetime, timedelta, timezone as dt_timezone
+from benchmarks.generators import generate_backlog, generate_chain
+from benchmarks.runner import compare, run_benchmarks
+from . import async_views, views
+from .async_views import AdmissionGate, Overloaded, WorkersUnavailable
+from .jobs import JobRunner, process_chunk
+from .bulk import BulkImportError, export_tasks, import_tasks, validate_records
+from .cache import DjangoCacheBackend, get_result_cache
+from .materialized import refresh_scores, sweep_band_crossings
+from .models import AnalysisChunk, AnalysisJob, AnalysisResult, Task, TaskScore
+from .serializers import TaskSerializer
+from task_analyzer.scoring.algorithms import TaskScorer
+from task_analyzer.scoring.batch import TaskBatch
+from task_analyzer.scoring.cache import LRUCacheBackend, ResultCache
+from task_analyzer.scoring import context as scoring_context
+from task_analyzer.scoring.context import ScoringContext
+from task_analyzer.scoring.custom import CustomStrategyCache, normalize_definition
+from task_analyzer.scoring.explain import explanation_templates, strategy_templates
+from task_analyzer.scoring.selection import top_k_indices
+from task_analyzer.scoring.table import TaskTable
+from task_analyzer.scoring import cli, timing
+from task_analyzer.scoring.streaming import NDJSONSpool, score_stream, sort_by_score
+from task_analyzer.scoring.dependencies import DependencyIndex
+from task_analyzer.scoring.graph import DependencyGraph
+from task_analyzer.scoring.parallel import get_executor, rank_parallel
+from task_analyzer.scoring.planner import plan_schedule
+from task_analyzer.scoring.ranking import ScoreIndex
+from task_analyzer.scoring.session import ScoringSession
+from task_analyzer.scoring.pipeline import Band, InverseLog, Linear, StrategySpec, compile_strategy
+from task_analyzer.scoring.strategies import STRATEGY_SPECS, PipelineStrategy, ScoringStrategy, StrategyFactory
+
+@contextmanager
+def clock_moved(hours):
+    """Serve requests as if ``hours`` had passed, for scoring and for cache expiry"""
+    later = time.time() + hours * 3600
+    with mock.patch.object(scoring_context, 'system_clock', lambda: datetime.fromtimestamp(later).astimezone()), \
+            mock.patch('time.time', return_value=later):
+        yield
+
+class TaskModelTest(TestCase):
+    def test_task_creation(self):
+        task = Task.objects.create(
+            title="Test Task",
+            estimated_hours=2.0,
+            importance=7
+        )
+        self.assertEqual(task.title, "Test Task")
+        self.assertEqual(task.estimated_hours, 2.0)
+        self.assertEqual(task.importance, 7)
+    
+    def test_importance_validation(self):
+        task = Task(title="Test", importance=11)
+        with self.assertRaises(Exception):
+            task.full_clean()
+
+class StoredTaskScoringTest(TestCase):
+    def setUp(self):
+        self.base = Task.objects.create(title='Base', estimated_hours=3, importance=6)
+        self.others = []
+        for i in range(4):
+            task = Task.objects.create(title=f'Dependent {i}', estimated_hours=3, importance=6,
+                                       due_date=timezone.now() + timedelta(days=30))
+            task.dependencies.add(self.base)
+            self.others.append(task)
+        self.others[0].dependencies.add(self.others[1])
+    
+    def test_for_scoring_uses_fixed_number_of_queries(self):
+        with self.assertNumQueries(3):
+            tasks, index = Task.objects.filter(importance__gte=5).for_scoring()
+        self.assertEqual(len(tasks), 5)
+        by_id = {task['id']: task for task in tasks}
+        self.assertEqual(sorted(by_id[self.others[0].id]['dependencies']),
+                         sorted([self.base.id, self.others[1].id]))
+        self.assertEqual(index.dependent_count(self.base.id), 4)
+        self.assertEqual(self.base.dependents.count(), 4)
+    
+    def test_dependents_outside_selection_are_counted(self):
+        tasks, index = Task.objects.filter(id=self.base.id).for_scoring()
+        self.assertEqual([task['id'] for task in tasks], [self.base.id])
+        self.assertEqual(index.dependent_count(self.base.id), 4)
+    
+    def test_score_endpoint(self):
+        response = self.client.post('/api/tasks/score/', {
+            'filters': {'importance__gte': 6}, 'strategy': 'smart_balance', 'limit': 2
+        }, content_type='application/json')
+        self.assertEqual(response.status_code, 200)
+        ranked = response.json()['tasks']
+        self.assertEqual(ranked[0]['id'], self.base.id)
+        self.assertEqual(ranked[0]['score'], 24.0 + 10.0 + 12.0 + 10.0)
+        self.assertEqual(len(ranked), 2)
+        
+        response = self.client.post('/api/tasks/score/', {'ids': [self.others[2].id]},
+                                    content_type='application/json')
+        self.assertEqual([task['id'] for task in response.json()['tasks']], [self.others[2].id])
+        
+        response = self.client.post('/api/tasks/score/', {'filters': {'title__regex': '.*'}},
+                                    content_type='application/json')
+        self.assertEqual(response.status_code, 400)
+
+class MaterializedScoreTest(TestCase):
+    def setUp(self):
+        self.base = Task.objects.create(title='Base', estimated_hours=3, importance=6)
+        self.urgent = Task.objects.create(title='Urgent', estimated_hours=3, importance=6,
+                                          due_date=timezone.now() + timedelta(hours=30))
+        self.other = Task.objects.create(title='Other', estimated_hours=3, importance=2)
+    
+    def score_of(self, task, strategy='smart_balance'):
+        return TaskScore.objects.get(task=task, strategy=strategy)
+    
+    def test_scores_are_materialized_for_every_strategy(self):
+        self.assertEqual(TaskScore.objects.filter(task=self.base).count(), 4)
+        self.assertEqual(self.score_of(self.base).score, 24.0 + 10.0 + 12.0 + 1.0)
+        self.assertEqual(self.score_of(self.urgent).score, 24.0 + 22.0 + 12.0 + 1.0)
+    
+    def test_edits_refresh_only_affected_tasks(self):
+        untouched = self.score_of(self.other).computed_at
+        
+        self.urgent.dependencies.add(self.base)
+        self.assertEqual(self.score_of(self.base).score, 24.0 + 10.0 + 12.0 + 4.0)
+        
+        self.base.importance = 9
+        self.base.save()
+        self.assertEqual(self.score_of(self.base).score, 40.0 + 10.0 + 12.0 + 4.0)
+        
+        self.urgent.dependencies.clear()
+        self.assertEqual(self.score_of(self.base).score, 40.0 + 10.0 + 12.0 + 1.0)
+        
+        self.urgent.dependencies.add(self.base)
+        self.urgent.delete()
+        self.assertEqual(self.score_of(self.base).score, 40.0 + 10.0 + 12.0 + 1.0)
+        self.assertEqual(self.score_of(self.other).computed_at, untouched)
+    
+    def test_sweep_only_touches_band_crossings(self):
+        crossing = self.score_of(self.urgent).next_band_change
+        self.assertEqual(crossing, self.urgent.due_date - timedelta(hours=24))
+        self.assertIsNone(self.score_of(self.base).next_band_change)
+        
+        self.assertEqual(sweep_band_crossings(now=crossing - timedelta(seconds=1)), 0)
+        self.assertEqual(sweep_band_crossings(now=crossing), 1)
+        self.assertEqual(self.score_of(self.urgent).score, 24.0 + 30.0 + 12.0 + 1.0)
+        self.assertEqual(self.score_of(self.urgent).next_band_change, self.urgent.due_date)
+    
+    def test_top_endpoint_reads_materialized_rows(self):
+        with self.assertNumQueries(1):
+            response = self.client.get('/api/tasks/top/?strategy=smart_balance&limit=2')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([task['title'] for task in response.json()['tasks']], ['Urgent', 'Base'])
+        
+        self.urgent.dependencies.add(self.base)
+        with self.assertNumQueries(1):
+            response = self.client.get('/api/tasks/top/?strategy=smart_balance&limit=2')
+        explanations = {task['title']: task['explanation'] for task in response.json()['tasks']}
+        self.assertIn('unblocks other tasks', explanations['Base'])
+        self.assertNotIn('unblocks other tasks', explanations['Urgent'])
+        
+        for strategy in ('critical_path', 'luck'):
+            response = self.client.get(f'/api/tasks/top/?strategy={strategy}')
+            self.assertEqual(response.status_code, 400)
+            self.assertIn('smart_balance, fastest_wins', response.json()['error'])
+
+class ScoringAlgorithmTest(TestCase):
+    def setUp(self):
+        self.scorer = TaskScorer()
+        self.sample_tasks = [
+            {
+                'title': 'Urgent Task',
+                'due_date': timezone.now() + timedelta(hours=12),
+                'estimated_hours': 2.0,
+                'importance': 9,
+                'dependencies': []
+            },
+            {
+                'title': 'Important Task', 
+                'due_date': None,
+                'estimated_hours': 4.0,
+                'importance': 10,
+                'dependencies': []
+            }
+        ]
+    
+    def test_smart_balance_strategy(self):
+        score = self.scorer.calculate_score(
+            self.sample_tasks[0], 
+            self.sample_tasks
+        )
+        self.assertGreater(score, 0)
+        self.assertLessEqual(score, 100)
+    
+    def test_fastest_wins_strategy(self):
+        self.scorer.strategy = 'fastest_wins'
+        score = self.scorer.calculate_score(
+            self.sample_tasks[0],
+            self.sample_tasks
+        )
+        # Quick task should score higher in fastest wins
+        self.assertGreater(score, 0)
+    
+    def test_high_impact_strategy(self):
+        self.scorer.strategy = 'high_impact'
+        score = self.scorer.calculate_score(
+            self.sample_tasks[1],
+            self.sample_tasks
+        )
+        self.assertGreater(score, 0)
+
+class DependencyIndexTest(TestCase):
+    def setUp(self):
+        self.tasks = [
+            {'id': 1, 'title': 'Base', 'importance': 5, 'dependencies': []},
+            {'id': 2, 'title': 'Child A', 'importance': 5, 'dependencies': [1]},
+            {'id': 3, 'title': 'Child B', 'importance': 5, 'dependencies': [1, 1, 2]},
+        ]
+    
+    def test_dependent_counts(self):
+        index = DependencyIndex.from_tasks(self.tasks)
+        self.assertEqual(index.dependent_count(1), 2)
+        self.assertEqual(index.dependent_count(2), 1)
+        self.assertEqual(index.dependent_count(3), 0)
+    
+    def test_index_matches_list_signature(self):
+        index = DependencyIndex.from_tasks(self.tasks)
+        for name in ['fastest_wins', 'high_impact', 'deadline_driven', 'smart_balance']:
+            strategy = StrategyFactory.create_strategy(name)
+            scorer = TaskScorer(name)
+            for task in self.tasks:
+                self.assertEqual(
+                    strategy.calculate_score(task, self.tasks),
+                    strategy.calculate_score(task, index)
+                )
+                self.assertEqual(
+                    scorer.calculate_score(task, self.tasks),
+                    scorer.calculate_score(task, index)
+                )
+    
+    def test_score_batch_builds_index_once(self):
+        strategy = StrategyFactory.create_strategy('smart_balance')
+        scores = strategy.score_batch(self.tasks)
+        expected = [strategy.calculate_score(task, self.tasks) for task in self.tasks]
+        self.assertEqual(scores, expected)
+        self.assertEqual(TaskScorer().score_batch(self.tasks),
+                         [TaskScorer().calculate_score(task, self.tasks) for task in self.tasks])
+
+class DependencyGraphTest(TestCase):
+    def test_cycles_unknown_ids_and_blocked_tasks(self):
+        tasks = [
+            {'id': 1, 'dependencies': [2]},
+            {'id': 2, 'dependencies': [1]},
+            {'id': 3, 'dependencies': [2, 9]},
+            {'id': 4},
+            {'id': 5, 'dependencies': [5]},
+            {'id': 6, 'dependencies': [4, 4]},
+        ]
+        graph = DependencyGraph(tasks)
+        self.assertEqual(sorted(map(sorted, graph.cycles)), [[1, 2], [5]])
+        self.assertEqual(graph.issues()['unknown_dependencies'], {3: [9]})
+        self.assertEqual([graph.ids[p] for p in graph.blocked], [1, 2, 3, 5])
+        self.assertEqual([graph.ids[p] for p in graph.order], [4, 6])
+    
+    def test_transitive_dependent_counts(self):
+        tasks = [
+            {'id': 'a'},
+            {'id': 'b', 'dependencies': ['a']},
+            {'id': 'c', 'dependencies': ['a']},
+            {'id': 'd', 'dependencies': ['b', 'c']},
+        ]
+        graph = DependencyGraph(tasks)
+        self.assertEqual(graph.transitive_dependent_counts(), [3, 1, 1, 0])
+        self.assertEqual(graph.direct_dependent_count(0), 2)
+        self.assertEqual(graph.order[0], 0)
+        self.assertFalse(graph.has_issues)
+    
+    def test_long_chain_without_recursion(self):
+        size = 100000
+        chain = [{'id': i, 'dependencies': [i - 1] if i else []} for i in range(size)]
+        chain.append({'id': size, 'dependencies': [size]})
+        chain[0]['dependencies'] = [size - 1]
+        
+        start = time.perf_counter()
+        graph = DependencyGraph(chain)
+        elapsed = time.perf_counter() - start
+        
+        self.assertEqual(len(graph.cycles), 2)
+        self.assertEqual(len(graph.blocked), size + 1)
+        self.assertLess(elapsed, 2.0)
+    
+    def test_transitive_counts_on_long_chain(self):
+        size = 100000
+        graph = DependencyGraph(generate_chain(size))
+        start = time.perf_counter()
+        counts = graph.transitive_dependent_counts()
+        elapsed = time.perf_counter() - start
+        
+        self.assertEqual(counts[:2], [size - 1, size - 2])
+        self.assertEqual(counts[-1], 0)
+        self.assertLess(elapsed, 1.0)
+    
+    def test_analyze_reports_dependency_issues(self):
+        response = self.client.post('/api/tasks/analyze/', {
+            'tasks': [
+                {'id': 1, 'title': 'A', 'importance': 5, 'dependencies': [2]},
+                {'id': 2, 'title': 'B', 'importance': 5, 'dependencies': [1, 7]},
+            ]
+        }, content_type='application/json')
+        issues = response.json()['dependency_issues']
+        self.assertEqual(sorted(issues['cycles'][0]), [1, 2])
+        self.assertEqual(issues['unknown_dependencies'], {'2': [7]})
+
+class CriticalPathStrategyTest(TestCase):
+    def setUp(self):
+        self.context = ScoringContext(now=datetime(2024, 1, 1, tzinfo=dt_timezone.utc))
+        self.strategy = StrategyFactory.create_strategy('critical_path')
+    
+    def test_slack_follows_longest_chain_to_downstream_deadline(self):
+        due = self.context.now + timedelta(hours=10)
+        tasks = [
+            {'id': 1, 'estimated_hours': 2, 'importance': 5},
+            {'id': 2, 'estimated_hours': 3, 'importance': 5, 'dependencies': [1]},
+            {'id': 3, 'estimated_hours': 1, 'importance': 5, 'dependencies': [1]},
+            {'id': 4, 'estimated_hours': 4, 'importance': 5, 'dependencies': [2, 3], 'due_date': due},
+            {'id': 5, 'estimated_hours': 1, 'importance': 5},
+        ]
+        batch = TaskBatch.from_tasks(tasks, context=self.context, with_graph=True)
+        slack = (self.strategy.latest_starts(batch) - self.context.timestamp) / 3600
+        self.assertEqual(slack[:4].tolist(), [1.0, 3.0, 5.0, 6.0])
+        self.assertEqual(slack[4], float('inf'))
+        
+        scores = self.strategy.score_batch(tasks, context=self.context)
+        self.assertEqual(top_k_indices(scores), [0, 1, 2, 3, 4])
+        self.assertEqual(self.strategy.calculate_score(tasks[0], tasks, self.context), scores[0])
+        with self.assertRaisesRegex(TypeError, 'task list'):
+            self.strategy.calculate_score(tasks[0], DependencyIndex.from_tasks(tasks), self.context)
+    
+    def test_large_chain_scores_in_one_pass(self):
+        size = 20000
+        due = (self.context.now + timedelta(days=30)).isoformat()
+        tasks = [{'id': i, 'estimated_hours': 0.01, 'importance': 5,
+                  'dependencies': [i - 1] if i else []} for i in range(size)]
+        tasks[-1]['due_date'] = due
+        scores = self.strategy.score_batch(tasks, context=self.context)
+        self.assertEqual(top_k_indices(scores, 1), [0])
+    
+    def test_analyze_endpoint(self):
+        response = self.client.post('/api/tasks/analyze/', {
+            'strategy': 'critical_path',
+            'tasks': [
+                {'id': 1, 'title': 'Spec', 'importance': 6, 'estimated_hours': 2},
+                {'id': 2, 'title': 'Ship', 'importance': 6, 'estimated_hours': 1,
+                 'dependencies': [1], 'due_date': (timezone.now() + timedelta(hours=4)).isoformat()},
+            ]
+        }, content_type='application/json')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([task['id'] for task in response.json()['tasks']], [1, 2])
+    
+    def test_cached_results_expire_as_slack_runs_down(self):
+        get_result_cache().clear()
+        payload = {'strategy': 'critical_path', 'tasks': [
+            {'id': 1, 'title': 'Spec', 'importance': 6, 'estimated_hours': 2},
+            {'id': 2, 'title': 'Ship', 'importance': 6, 'estimated_hours': 1,
+             'dependencies': [1], 'due_date': (timezone.now() + timedelta(hours=200)).isoformat()},
+        ]}
+        post = lambda: self.client.post('/api/tasks/analyze/', payload, content_type='application/json')
+        first = post()
+        self.assertEqual(post()['X-Cache'], 'HIT')
+        
+        # No urgency band changes within 31 hours, but slack keeps running down
+        with clock_moved(31):
+            later = post()
+        self.assertEqual(later['X-Cache'], 'MISS')
+        self.assertGreater(later.json()['tasks'][0]['score'], first.json()['tasks'][0]['score'])
+
+class PlannerTest(TestCase):
+    def test_days_respect_capacity_and_dependencies(self):
+        tasks = [
+            {'id': 1, 'estimated_hours': 3},
+            {'id': 2, 'estimated_hours': 2, 'dependencies': [1]},
+            {'id': 3, 'estimated_hours': 4},
+            {'id': 4, 'estimated_hours': 1},
+            {'id': 5, 'estimated_hours': 12},
+        ]
+        scores = [30, 90, 40, 10, 60]
+        schedule = plan_schedule(tasks, scores, hours_per_day=8)
+        
+        self.assertEqual(schedule.days[0], [(0, 3.0), (1, 2.0), (3, 1.0)])
+        self.assertEqual(schedule.days[1:], [[(2, 4.0)], [(4, 8.0)], [(4, 4.0)]])
+        self.assertEqual(schedule.unscheduled, [])
+        for day in schedule.days:
+            self.assertLessEqual(sum(hours for _, hours in day), 8)
+    
+    def test_cycles_and_max_days_leave_tasks_unscheduled(self):
+        tasks = [
+            {'id': 1, 'estimated_hours': 6, 'dependencies': [2]},
+            {'id': 2, 'estimated_hours': 6, 'dependencies': [1]},
+            {'id': 3, 'estimated_hours': 6},
+            {'id': 4, 'estimated_hours': 6},
+        ]
+        schedule = plan_schedule(tasks, [1, 1, 2, 1], hours_per_day=8, max_days=1)
+        self.assertEqual(schedule.days, [[(2, 6.0)]])
+        self.assertEqual(schedule.unscheduled, [0, 1, 3])
+    
+    def test_large_plan(self):
+        size = 10000
+        tasks = [{'id': i, 'estimated_hours': 1 + i % 5,
+                  'dependencies': [i - 7] if i >= 7 else []} for i in range(size)]
+        scores = [float(i % 97) for i in range(size)]
+        
+        start = time.perf_counter()
+        schedule = plan_schedule(tasks, scores, hours_per_day=40)
+        elapsed = time.perf_counter() - start
+        
+        self.assertEqual(schedule.unscheduled, [])
+        finished_on = {}
+        for number, day in enumerate(schedule.days):
+            for position, _ in day:
+                for dependency in tasks[position]['dependencies']:
+                    self.assertLessEqual(finished_on[dependency], number)
+                finished_on[position] = number
+        self.assertLess(elapsed, 2.0)
+    
+    def test_plan_endpoint(self):
+        response = self.client.post('/api/tasks/plan/', {
+            'hours_per_day': 4,
+            'start_date': '2024-03-01',
+            'tasks': [
+                {'id': 1, 'title': 'Design', 'importance': 8, 'estimated_hours': 3},
+                {'id': 2, 'title': 'Build', 'importance': 8, 'estimated_hours': 3, 'dependencies': [1]},
+            ]
+        }, content_type='application/json')
+        data = response.json()
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([day['date'] for day in data['days']], ['2024-03-01', '2024-03-02'])
+        self.assertEqual([day['tasks'][0]['title'] for day in data['days']], ['Design', 'Build'])
+        
+        response = self.client.post('/api/tasks/plan/', {'tasks': [], 'hours_per_day': 0},
+                                    content_type='application/json')
+        self.assertEqual(response.status_code, 400)
+
+class ParallelScoringTest(TestCase):
+    def setUp(self):
+        self.tasks = [
+            {'id': i, 'title': f'Task {i}', 'importance': 1 + i % 10,
+             'estimated_hours': 1 + i % 7, 'dependencies': [i // 2] if i else [],
+             'due_date': (timezone.now() + timedelta(hours=i % 200)).isoformat()}
+            for i in range(2000)
+        ]
+    
+    def test_matches_serial_ranking(self):
+        batch = TaskBatch.from_tasks(self.tasks)
+        for name in ['smart_balance', 'fastest_wins', 'high_impact', 'deadline_driven']:
+            scores = StrategyFactory.create_strategy(name).score_batch(batch)
+            for k in [None, 25]:
+                ranking = rank_parallel(batch, name, k, chunk_size=300, executor=get_executor())
+                self.assertEqual([index for index, _ in ranking], top_k_indices(scores, k))
+                self.assertEqual([score for _, score in ranking],
+                                 [scores[index] for index in top_k_indices(scores, k)])
+    
+    def test_analyze_switches_on_above_threshold(self):
+        payload = {'tasks': self.tasks, 'strategy': 'smart_balance', 'limit': 10}
+        serial = self.client.post('/api/tasks/analyze/', payload, content_type='application/json').json()
+        get_result_cache().clear()
+        with override_settings(SCORING_PARALLEL={'THRESHOLD': 1000, 'CHUNK_SIZE': 500}):
+            parallel = self.client.post('/api/tasks/analyze/', payload, content_type='application/json').json()
+        self.assertEqual(parallel['tasks'], serial['tasks'])
+
+class TaskTableTest(TestCase):
+    def setUp(self):
+        self.context = ScoringContext(now=datetime(2024, 1, 1, tzinfo=dt_timezone.utc))
+        self.tasks = [
+            {'id': 1, 'title': 'Base', 'due_date': '2024-01-02T00:00:00Z',
+             'estimated_hours': 2.5, 'importance': 8, 'dependencies': []},
+            {'id': 2, 'title': 'Child', 'due_date': None,
+             'estimated_hours': 1.0, 'importance': 3, 'dependencies': [1, 1]},
+            {'id': 3, 'title': 'Leaf', 'due_date': '2024-01-10T12:00:00+00:00',
+             'estimated_hours': 6.0, 'importance': 5, 'dependencies': [1, 2]},
+        ]
+        self.table = TaskTable.from_dicts(self.tasks, self.context)
+    
+    def test_columns_are_compact_arrays(self):
+        self.assertEqual(self.table.ids.typecode, 'q')
+        self.assertEqual(self.table.importance.typecode, 'b')
+        self.assertEqual(self.table.estimated_hours.typecode, 'd')
+        self.assertEqual(list(self.table.dependency_offsets), [0, 0, 1, 3])
+        self.assertEqual(list(self.table.dependency_ids), [1, 1, 2])
+    
+    def test_rows_convert_back_lazily(self):
+        row = self.table[-1]
+        self.assertEqual(row['id'], 3)
+        self.assertEqual(row['dependencies'], [1, 2])
+        self.assertEqual(row['due_date'], datetime(2024, 1, 10, 12, tzinfo=dt_timezone.utc))
+        self.assertIsNone(self.table[1]['due_date'])
+        self.assertEqual(len(list(self.table)), 3)
+    
+    def test_strategies_score_tables_like_dicts(self):
+        for name in ['fastest_wins', 'high_impact', 'deadline_driven', 'smart_balance', 'critical_path']:
+            strategy = StrategyFactory.create_strategy(name)
+            self.assertEqual(strategy.score_batch(self.table, context=self.context),
+                             strategy.score_batch(self.tasks, context=self.context))
+    
+    def test_stored_tasks_load_as_table(self):
+        base = Task.objects.create(title='Base', estimated_hours=3, importance=6)
+        child = Task.objects.create(title='Child', estimated_hours=1, importance=4)
+        child.dependencies.add(base)
+        tasks, index = Task.objects.for_scoring()
+        self.assertIsInstance(tasks, TaskTable)
+        self.assertEqual(tasks.dependencies_of(list(tasks.ids).index(child.id)), [base.id])
+        self.assertEqual(index.dependent_count(base.id), 1)
+
+class BenchmarkTest(TestCase):
+    def test_generated_backlogs_are_seeded_dags(self):
+        tasks = generate_backlog(2000, seed=7)
+        self.assertEqual(tasks, generate_backlog(2000, seed=7))
+        self.assertNotEqual(tasks, generate_backlog(2000, seed=8))
+        graph = DependencyGraph(tasks)
+        self.assertEqual(graph.cycles, [])
+        self.assertEqual(graph.unknown_dependencies, {})
+        fan_in = sorted(graph.direct_dependent_count(p) for p in range(len(tasks)))
+        self.assertGreater(fan_in[-1], 10 * max(fan_in[len(fan_in) // 2], 1))
+    
+    def test_results_and_regression_check(self):
+        results = run_benchmarks([200], repeat=1)
+        names = {case['name'] for case in results['results']}
+        self.assertIn('strategy:smart_balance', names)
+        self.assertIn('task_scorer:smart_balance', names)
+        self.assertIn('view:analyze', names)
+        self.assertIn('graph:transitive_counts_chain', names)
+        self.assertIn('scalar:smart_balance', names)
+        self.assertIn('smart_balance@200', results['speedups'])
+        self.assertIn('smart_balance@200', results['kernel_speedups'])
+        self.assertEqual(results['below_target'],
+                         [case for case, speedup in results['speedups'].items() if speedup < 10])
+        json.dumps(results)
+        
+        self.assertEqual(compare(results, results), [])
+        faster = {'results': [dict(case, tasks_per_second=case['tasks_per_second'] * 2)
+                              for case in results['results']]}
+        self.assertEqual(len(compare(results, faster)), len(results['results']))
+
+class TimingTest(TestCase):
+    def setUp(self):
+        get_result_cache().clear()
+        self.payload = {'tasks': [
+            {'id': 1, 'title': 'A', 'importance': 7, 'estimated_hours': 2},
+            {'id': 2, 'title': 'B', 'importance': 4, 'estimated_hours': 1, 'dependencies': [1]},
+        ]}
+    
+    def test_stage_is_a_no_op_without_active_timer(self):
+        self.assertIs(timing.stage('score'), timing.stage('select'))
+        timer = timing.StageTimer()
+        token = timing.activate(timer)
+        try:
+            with timing.stage('score'):
+                pass
+            with timing.stage('score'):
+                pass
+        finally:
+            timing.deactivate(token)
+        self.assertEqual(list(timer.durations), ['score'])
+        self.assertRegex(timer.server_timing(), r'^score;dur=\d+\.\d\d$')
+    
+    def test_server_timing_header_and_metrics(self):
+        response = self.client.post('/api/tasks/analyze/', self.payload, content_type='application/json')
+        stages = [entry.split(';')[0] for entry in response['Server-Timing'].split(', ')]
+        for name in ['parse', 'validate', 'cache', 'columns', 'score', 'select', 'explain', 'render', 'total']:
+            self.assertIn(name, stages)
+        self.assertNotIn('profile', response.json())
+        
+        metrics = self.client.get('/metrics').content.decode()
+        self.assertIn('scoring_stage_seconds_bucket{endpoint="api/tasks/analyze/",stage="score",le="+Inf"}', metrics)
+        self.assertIn('scoring_requests_total{endpoint="api/tasks/analyze/",status="200"}', metrics)
+        self.assertIn('scoring_tasks_total{strategy="smart_balance"}', metrics)
+    
+    def test_profile_mode(self):
+        response = self.client.post('/api/tasks/analyze/?profile=1', self.payload,
+                                    content_type='application/json')
+        profile = response.json()['profile']
+        self.assertTrue(profile)
+        self.assertEqual(set(profile[0]), {'function', 'calls', 'total_time', 'cumulative_time'})
+        
+        with override_settings(SCORING_TIMING={'ENABLED': True, 'PROFILING': False}):
+            get_result_cache().clear()
+            response = self.client.post('/api/tasks/analyze/?profile=1', self.payload,
+                                        content_type='application/json')
+        self.assertNotIn('profile', response.json())
+
+class ExplanationTemplateTest(TestCase):
+    def setUp(self):
+        self.context = ScoringContext(now=datetime(2024, 1, 10, 12, 0, tzinfo=dt_timezone.utc))
+        self.tasks = [
+            {'id': i, 'title': f'Task {i}', 'importance': i % 10 + 1, 'estimated_hours': (i % 12) * 0.75 + 0.5,
+             'due_date': (self.context.now + timedelta(hours=i * 7 - 20)).isoformat() if i % 4 else None,
+             'dependencies': [i - 1] if i % 3 else []}
+            for i in range(1, 60)
+        ]
+    
+    def test_batch_lookup_matches_per_task_bands(self):
+        index = DependencyIndex.from_tasks(self.tasks)
+        batch = TaskBatch.from_tasks(self.tasks, index, self.context)
+        for strategy in STRATEGY_SPECS:
+            templates = explanation_templates(strategy, STRATEGY_SPECS[strategy].factors)
+            self.assertEqual(
+                templates.explain_batch(batch),
+                [templates.explain(task, self.context, index.dependent_count(task['id'])) for task in self.tasks]
+            )
+    
+    def test_templates_are_precomputed_per_band_tuple(self):
+        templates = strategy_templates(StrategyFactory.create_strategy('deadline_driven'), 'Deadline driven')
+        self.assertIs(templates, explanation_templates('Deadline driven', ('urgency', 'importance')))
+        self.assertEqual(len(templates.templates), 6 * 4)
+        self.assertEqual(templates.templates[(0, 3)], 'Deadline driven: past due, critical importance')
+    
+    def test_explanations_are_opt_in(self):
+        tasks = [{'id': i, 'title': f'Task {i}', 'estimated_hours': 1, 'importance': i * 2} for i in range(1, 6)]
+        url = '/api/tasks/analyze/'
+        full = self.client.post(url, {'tasks': tasks, 'limit': 2}, content_type='application/json').json()['tasks']
+        self.assertTrue(all('explanation' not in task for task in full))
+        
+        top = self.client.post(url + '?explain=1', {'tasks': tasks, 'limit': 2},
+                               content_type='application/json').json()['tasks']
+        self.assertEqual([task['explanation'] for task in top], [
+            'Smart balanced approach: critical importance, no deadline, quick (up to 1h)',
+            'Smart balanced approach: high importance, no deadline, quick (up to 1h)',
+        ])
+        
+        response = self.client.post(url + '?explain=maybe', {'tasks': tasks}, content_type='application/json')
+        self.assertEqual(response.status_code, 400)
+        
+        suggestions = self.client.get('/api/tasks/suggest/').json()['suggestions']
+        self.assertTrue(all(suggestion['explanation'] for suggestion in suggestions))
+
+class ScoringPipelineTest(TestCase):
+    def setUp(self):
+        self.context = ScoringContext(now=datetime(2024, 1, 10, 12, 0, tzinfo=dt_timezone.utc))
+        self.tasks = generate_backlog(300, seed=4, now=self.context.now)
+        self.tasks.append({'title': 'No id', 'importance': 6, 'estimated_hours': 0.05})
+    
+    def test_new_strategy_is_a_spec(self):
+        spec = StrategySpec('urgent_and_quick', [
+            Band('urgency', (60.0, 45.0, 30.0, 15.0, 5.0), missing=0.0),
+            InverseLog('estimated_hours', scale=20.0),
+            Linear('dependents', weight=5.0, cap=20.0, missing=0.0),
+        ])
+        strategy = PipelineStrategy(spec)
+        self.assertTrue(strategy.uses_dependencies)
+        self.assertFalse(strategy.uses_graph)
+        self.assertEqual(spec.factors, ('urgency', 'effort', 'dependents'))
+        
+        index = DependencyIndex.from_tasks(self.tasks)
+        expected = [strategy.calculate_score(task, index, self.context) for task in self.tasks]
+        actual = strategy.score_batch(self.tasks, context=self.context)
+        for a, b in zip(actual, expected):
+            self.assertAlmostEqual(a, b, places=9)
+        self.assertTrue(all(0 <= score <= 100 for score in actual))
+    
+    def test_specs_compile_once(self):
+        for name, spec in STRATEGY_SPECS.items():
+            strategy = StrategyFactory.create_strategy(name)
+            self.assertIs(strategy.pipeline, compile_strategy(spec))
+        scorer = TaskScorer('high_impact')
+        pipeline = scorer._pipeline
+        scorer.calculate_score(self.tasks[0], self.tasks, self.context)
+        self.assertIs(scorer._pipeline, pipeline)
+        scorer.strategy = 'fastest_wins'
+        self.assertIsNot(scorer._pipeline, pipeline)
+    
+    def test_task_scorer_keeps_its_weights(self):
+        task = {'importance': 4, 'estimated_hours': 3, 'due_date': self.context.now + timedelta(hours=2)}
+        self.assertAlmostEqual(TaskScorer('fastest_wins').calculate_score(task, [task]), 10 / 3 * 0.58)
+        self.assertEqual(TaskScorer('deadline_driven').calculate_score(task, [task], self.context), 20.0)
+        self.assertEqual(TaskScorer('deadline_driven').calculate_score({'importance': 4}, []), 5.0)
+        self.assertEqual(TaskScorer('unknown').calculate_score(task, [task], self.context),
+                         TaskScorer('smart_balance').calculate_score(task, [task], self.context))
+
+class CustomStrategyTest(TestCase):
+    DEFINITION = {
+        'weights': {'importance': 50, 'urgency': 30, 'effort': 10, 'dependencies': 10},
+        'thresholds': {'effort': [2, 6]},
+        'levels': {'effort': [1, 0.5, 0]},
+    }
+    
+    def setUp(self):
+        get_result_cache().clear()
+        self.context = ScoringContext(now=datetime(2024, 1, 10, 12, 0, tzinfo=dt_timezone.utc))
+        self.tasks = generate_backlog(300, seed=5, now=self.context.now)
+        self.tasks.append({'title': 'No id', 'importance': 6, 'estimated_hours': 2})
+    
+    def test_definition_compiles_to_bands(self):
+        strategy = StrategyFactory.create_strategy(self.DEFINITION)
+        self.assertTrue(strategy.uses_dependencies)
+        self.assertEqual(strategy.spec.factors, ('importance', 'urgency', 'effort', 'dependents'))
+        task = {'id': 1, 'importance': 9, 'estimated_hours': 3,
+                'due_date': self.context.now + timedelta(hours=30)}
+        # 50 * 5/5 + 30 * 3/5 + 10 * 0.5 + 10 * 1/4
+        self.assertAlmostEqual(strategy.calculate_score(task, [task], self.context), 50 + 18 + 5 + 2.5)
+        
+        index = DependencyIndex.from_tasks(self.tasks)
+        expected = [strategy.calculate_score(task, index, self.context) for task in self.tasks]
+        for a, b in zip(strategy.score_batch(self.tasks, context=self.context), expected):
+            self.assertAlmostEqual(a, b, places=9)
+    
+    def test_invalid_definitions(self):
+        for definition, message in [
+            ({}, 'weights must give'),
+            ({'weights': {'luck': 5}}, 'Unknown weights factors: luck'),
+            ({'weights': {'effort': -1}}, 'weights.effort must be between'),
+            ({'weights': {'effort': 5}, 'thresholds': {'effort': [4, 2]}}, 'strictly increasing'),
+            ({'weights': {'effort': 5}, 'levels': {'effort': [1]}}, 'needs 5 values'),
+            ({'weights': {'effort': 5}, 'colour': 'red'}, 'Unknown strategy definition keys'),
+        ]:
+            with self.assertRaisesRegex(ValueError, message):
+                normalize_definition(definition)
+    
+    def test_cache_is_keyed_by_definition_and_bounded(self):
+        cache = CustomStrategyCache(max_entries=2)
+        first = cache.get(self.DEFINITION)
+        self.assertIs(cache.get(json.loads(json.dumps(self.DEFINITION))), first)
+        self.assertEqual((cache.hits, cache.misses), (1, 1))
+        for weight in range(1, 5):
+            cache.get({'weights': {'importance': weight}})
+        self.assertEqual(len(cache), 2)
+        self.assertIsNot(cache.get(self.DEFINITION), first)
+    
+    def test_inline_definition_and_profile_endpoints(self):
+        tasks = [{'id': i, 'title': f'Task {i}', 'importance': i, 'estimated_hours': 11 - i} for i in range(1, 11)]
+        definition = {'weights': {'effort': 100}}
+        response = self.client.post('/api/tasks/analyze/', {'tasks': tasks, 'strategy': definition},
+                                    content_type='application/json')
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.json()['strategy'].startswith('custom:'))
+        self.assertEqual(response.json()['tasks'][0]['id'], 10)
+        
+        response = self.client.post('/api/tasks/strategies/', {'name': 'team-quick', 'definition': definition},
+                                    content_type='application/json')
+        self.assertEqual(response.status_code, 201)
+        response = self.client.post('/api/tasks/strategies/', {'name': 'team-bad', 'definition': {'weights': {}}},
+                                    content_type='application/json')
+        self.assertEqual(response.status_code, 400)
+        response = self.client.post('/api/tasks/strategies/', {'name': 'smart_balance', 'definition': definition},
+                                    content_type='application/json')
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual([p['name'] for p in self.client.get('/api/tasks/strategies/').json()['profiles']],
+                         ['team-quick'])
+        
+        response = self.client.post('/api/tasks/analyze/?explain=1', {'tasks': tasks, 'strategy': 'team-quick'},
+                                    content_type='application/json')
+        self.assertEqual(response.json()['strategy'], 'team-quick')
+        self.assertEqual(response.json()['tasks'][0]['explanation'],
+                         'Custom strategy team-quick: quick (up to 1h)')
+        response = self.client.post('/api/tasks/analyze/', {'tasks': tasks, 'strategy': 'team-missing'},
+                                    content_type='application/json')
+        self.assertEqual(response.status_code, 400)
+    
+    def test_cached_results_expire_at_custom_urgency_edges(self):
+        definition = {'weights': {'urgency': 100}, 'thresholds': {'urgency': [1, 2]}}
+        self.assertEqual(StrategyFactory.create_strategy(definition).due_horizons, (1.0, 2.0))
+        payload = {'strategy': definition, 'tasks': [
+            {'id': 1, 'title': 'Soon', 'importance': 5,
+             'due_date': (timezone.now() + timedelta(hours=10)).isoformat()},
+        ]}
+        post = lambda: self.client.post('/api/tasks/analyze/', payload, content_type='application/json')
+        self.assertEqual(post().json()['tasks'][0]['score'], 33.33)
+        self.assertEqual(post()['X-Cache'], 'HIT')
+        
+        # Past the 2h edge, though no built-in urgency band has changed
+        with clock_moved(9):
+            later = post()
+        self.assertEqual(later['X-Cache'], 'MISS')
+        self.assertEqual(later.json()['tasks'][0]['score'], 100.0)
+
+class BulkImportExportTest(TestCase):
+    def test_import_creates_and_links_dependencies(self):
+        existing = Task.objects.create(title='Existing', importance=4)
+        due = (timezone.now() + timedelta(days=2)).isoformat()
+        result = import_tasks([
+            {'id': 900, 'title': 'Design', 'importance': '8', 'estimated_hours': '2'},
+            {'title': 'Build', 'due_date': due, 'dependencies': [900, existing.id]},
+            {'id': existing.id, 'title': 'Existing, renamed', 'importance': 6},
+        ])
+        self.assertEqual((result.created, result.updated), (2, 1))
+        design, build = Task.objects.get(id=result.ids[0]), Task.objects.get(id=result.ids[1])
+        self.assertEqual((design.importance, design.estimated_hours), (8, 2.0))
+        self.assertEqual(set(build.dependencies.values_list('id', flat=True)), {design.id, existing.id})
+        self.assertEqual(Task.objects.get(id=existing.id).title, 'Existing, renamed')
+        # Bulk writes skip signals, so scores are refreshed explicitly
+        self.assertEqual(TaskScore.objects.filter(task_id__in=result.ids).values('task').distinct().count(), 3)
+        imported = dict(TaskScore.objects.values_list('id', 'score'))
+        refresh_scores()
+        self.assertEqual(dict(TaskScore.objects.values_list('id', 'score')), imported)
+    
+    def test_invalid_rows_reject_the_whole_import(self):
+        with self.assertRaises(BulkImportError) as raised:
+            import_tasks([
+                {'title': 'Fine'},
+                {'title': '', 'importance': 11},
+                {'title': 'Late', 'due_date': '2000-01-01T00:00:00Z'},
+                {'title': 'Broken', 'dependencies': [12345]},
+            ])
+        self.assertEqual([error.split(':')[0] for error in raised.exception.errors], ['row 2', 'row 3'])
+        self.assertFalse(Task.objects.exists())
+        
+        with self.assertRaises(BulkImportError):
+            import_tasks([{'title': 'Broken', 'dependencies': [12345]}])
+        self.assertFalse(Task.objects.exists())
+        
+        cleaned = validate_records([{'title': 'Late', 'due_date': '2000-01-01'}], allow_past_due=True)
+        self.assertTrue(timezone.is_aware(cleaned[0][2]))
+    
+    def test_export_round_trip(self):
+        first = Task.objects.create(title='First, "quoted"', importance=9, estimated_hours=1.5,
+                                    due_date=timezone.now() + timedelta(days=1))
+        second = Task.objects.create(title='Second')
+        second.dependencies.add(first)
+        
+        lines = ''.join(export_tasks(Task.objects.all(), 'ndjson', chunk_size=1)).splitlines()
+        rows = [json.loads(line) for line in lines]
+        self.assertEqual([row['id'] for row in rows], [first.id, second.id])
+        self.assertEqual(rows[1]['dependencies'], [first.id])
+        
+        columnar = json.loads(''.join(export_tasks(Task.objects.all(), 'columnar', chunk_size=1)))
+        self.assertEqual(columnar['count'], 2)
+        self.assertEqual(columnar['columns']['dependency_offsets'], [0, 0, 1])
+        self.assertIsNone(columnar['columns']['due_date'][1])
+        
+        csv_text = ''.join(export_tasks(Task.objects.all(), 'csv'))
+        Task.objects.all().delete()
+        response = self.client.post('/api/tasks/import/?allow_past_due=1', csv_text, content_type='text/csv')
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(response.json()['created'], 2)
+        imported = {task.title: task for task in Task.objects.all()}
+        self.assertEqual(imported['First, "quoted"'].importance, 9)
+        self.assertEqual(list(imported['Second'].dependencies.all()), [imported['First, "quoted"']])
+        
+        with self.assertRaises(ValueError):
+            export_tasks(Task.objects.all(), 'xml')
+    
+    def test_endpoints(self):
+        response = self.client.post('/api/tasks/import/', {'tasks': [{'title': 'One'}, {'title': 'Two'}]},
+                                    content_type='application/json')
+        self.assertEqual(response.status_code, 201)
+        response = self.client.post('/api/tasks/import/', '{"title": "Three"}\n{"title": ""}\n',
+                                    content_type='application/x-ndjson')
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(len(response.json()['errors']), 1)
+        
+        response = self.client.get('/api/tasks/export/?format=csv')
+        self.assertEqual(response['Content-Type'], 'text/csv')
+        self.assertEqual(len(b''.join(response.streaming_content).decode().splitlines()), 3)
+        self.assertEqual(self.client.get('/api/tasks/export/?format=xml').status_code, 400)
+    
+    def test_serializer_reads_clock_once(self):
+        due = (timezone.now() + timedelta(days=1)).isoformat()
+        serializer = TaskSerializer(data=[{'title': f'Task {i}', 'due_date': due} for i in range(50)], many=True)
+        with mock.patch('tasks.serializers.timezone.now', wraps=timezone.now) as now:
+            self.assertTrue(serializer.is_valid(), serializer.errors)
+        self.assertEqual(now.call_count, 1)
+        serializer = TaskSerializer(data={'title': 'Late', 'due_date': '2000-01-01T00:00:00Z'})
+        self.assertFalse(serializer.is_valid())
+
+class BatchScoringTest(TestCase):
+    def setUp(self):
+        now = timezone.now()
+        self.tasks = []
+        for i, hours in enumerate([-5, 12, 48, 100, 500, None]):
+            for importance, effort in [(1, 0.05), (4, 1), (5, 3), (7, 6), (9, 12), (10, 40)]:
+                self.tasks.append({
+                    'id': len(self.tasks) + 1,
+                    'title': f'Task {len(self.tasks)}',
+                    'due_date': now + timedelta(hours=hours) if hours is not None else None,
+                    'estimated_hours': effort,
+                    'importance': importance,
+                    'dependencies': list(range(1, i + 1)),
+                })
+        self.tasks.append({'title': 'No id', 'importance': 6, 'estimated_hours': 2})
+    
+    def test_batch_matches_scalar(self):
+        index = DependencyIndex.from_tasks(self.tasks)
+        context = ScoringContext()
+        for name in ['fastest_wins', 'high_impact', 'deadline_driven', 'smart_balance']:
+            strategy = StrategyFactory.create_strategy(name)
+            expected = [strategy.calculate_score(task, index, context) for task in self.tasks]
+            actual = strategy.score_batch(self.tasks, context=context)
+            self.assertEqual(len(actual), len(expected))
+            for a, b in zip(actual, expected):
+                self.assertAlmostEqual(a, b, places=9, msg=name)
+    
+    def test_score_batch_accepts_task_batch(self):
+        strategy = StrategyFactory.create_strategy('smart_balance')
+        batch = TaskBatch.from_tasks(self.tasks)
+        self.assertEqual(len(batch), len(self.tasks))
+        self.assertEqual(strategy.score_batch(batch), strategy.score_batch(self.tasks))
+    
+    def test_strategies_without_a_kernel_score_task_by_task(self):
+        class ImportanceOnly(ScoringStrategy):
+            def calculate_score(self, task, all_tasks, context=None):
+                return task.get('importance', 5) * 2.0
+        
+        strategy = ImportanceOnly()
+        self.assertEqual(strategy.score_batch(self.tasks), [task.get('importance', 5) * 2.0 for task in self.tasks])
+        with self.assertRaises(TypeError):
+            strategy.score_batch(TaskBatch.from_tasks(self.tasks))
+
+class NDJSONStreamingTest(TestCase):
+    def setUp(self):
+        self.tasks = [
+            {'id': i, 'title': f'Task {i}', 'estimated_hours': i % 7 + 1,
+             'importance': i % 10 + 1, 'dependencies': [i - 1] if i > 1 else []}
+            for i in range(1, 41)
+        ]
+        self.body = '\n'.join(json.dumps(task) for task in self.tasks) + '\n\n'
+    
+    def stream(self, query):
+        response = self.client.post(f'/api/tasks/analyze/?{query}', self.body,
+                                    content_type='application/x-ndjson')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response['Content-Type'], 'application/x-ndjson')
+        return [json.loads(line) for line in b''.join(response.streaming_content).splitlines()]
+    
+    def test_sorted_stream_matches_json_endpoint(self):
+        for strategy in ['smart_balance', 'fastest_wins']:
+            expected = self.client.post('/api/tasks/analyze/', {'tasks': self.tasks, 'strategy': strategy},
+                                        content_type='application/json').json()['tasks']
+            self.assertEqual(self.stream(f'strategy={strategy}'), expected)
+            self.assertEqual(self.stream(f'strategy={strategy}&limit=5'), expected[:5])
+    
+    def test_unsorted_stream_keeps_input_order(self):
+        results = self.stream('strategy=smart_balance&sorted=0')
+        self.assertEqual([task['id'] for task in results], list(range(1, 41)))
+    
+    def test_malformed_lines_end_the_stream_with_an_error(self):
+        body = self.body + 'not json\n'
+        for query in ('strategy=fastest_wins', 'strategy=fastest_wins&limit=5', 'strategy=fastest_wins&sorted=0'):
+            response = self.client.post(f'/api/tasks/analyze/?{query}', body, content_type='application/x-ndjson')
+            self.assertEqual(response.status_code, 200)
+            last = json.loads(b''.join(response.streaming_content).splitlines()[-1])
+            self.assertIn('error', last)
+    
+    def test_spool_is_closed_once_streamed(self):
+        spools = []
+        original = views.NDJSONSpool
+        
+        def spool(lines):
+            spools.append(original(lines))
+            return spools[-1]
+        with mock.patch.object(views, 'NDJSONSpool', spool):
+            results = self.stream('strategy=smart_balance&limit=5')
+        self.assertEqual(len(results), 5)
+        self.assertTrue(spools[0]._file.closed)
+    
+    def test_external_sort_spills_runs(self):
+        records = [(float(i % 7), f'line {i}') for i in range(100)]
+        expected = [line for _, line in sorted(records, key=lambda r: -r[0])]
+        self.assertEqual(list(sort_by_score(records, run_size=8)), expected)
+    
+    def test_score_stream_scores_in_chunks(self):
+        spool = NDJSONSpool(self.body.splitlines())
+        strategy = StrategyFactory.create_strategy('smart_balance')
+        context = ScoringContext()
+        scored = list(score_stream(spool, strategy, spool.dependency_index, context, chunk_size=7))
+        self.assertEqual([score for _, score in scored],
+                         strategy.score_batch(self.tasks, context=context))
+
+class ResultCacheTest(TestCase):
+    def setUp(self):
+        get_result_cache().clear()
+    
+    def test_lru_eviction_and_expiry(self):
+        cache = ResultCache(LRUCacheBackend(max_entries=2))
+        cache.set('a', 1)
+        cache.set('b', 2)
+        self.assertEqual(cache.get('a'), 1)
+        cache.set('c', 3)
+        self.assertIsNone(cache.get('b'))
+        self.assertEqual(cache.get('a'), 1)
+        
+        cache.backend.set('d', 4, expires_at=time.time() - 1)
+        self.assertIsNone(cache.get('d'))
+        self.assertEqual(cache.stats(), {'hits': 2, 'misses': 2})
+    
+    def test_key_ignores_dict_ordering(self):
+        first = ResultCache.make_key([{'id': 1, 'importance': 5}], 'smart_balance', limit=None)
+        second = ResultCache.make_key([{'importance': 5, 'id': 1}], 'smart_balance', limit=None)
+        self.assertEqual(first, second)
+        self.assertNotEqual(first, ResultCache.make_key([{'id': 1, 'importance': 5}], 'high_impact', limit=None))
+    
+    def test_django_backend(self):
+        cache = ResultCache(DjangoCacheBackend('default'))
+        cache.set('key', {'tasks': []}, expires_at=time.time() + 60)
+        self.assertEqual(cache.get('key'), {'tasks': []})
+        cache.clear()
+        self.assertIsNone(cache.get('key'))
+    
+    def test_repeated_analyze_is_served_from_cache(self):
+        payload = {'tasks': [
+            {'id': 1, 'title': 'Soon', 'importance': 5, 'estimated_hours': 2,
+             'due_date': (timezone.now() + timedelta(hours=30)).isoformat()},
+        ], 'strategy': 'smart_balance'}
+        post = lambda: self.client.post('/api/tasks/analyze/', payload, content_type='application/json')
+        first, second = post(), post()
+        self.assertEqual(first['X-Cache'], 'MISS')
+        self.assertEqual(second['X-Cache'], 'HIT')
+        self.assertEqual(first.json(), second.json())
+        
+        # Entries expire when the soonest urgency band change is reached
+        key = get_result_cache().make_key(payload['tasks'], 'smart_balance', limit=None, explain=False)
+        expires_at = get_result_cache().backend._entries[key][0]
+        self.assertAlmostEqual(expires_at, time.time() + 6 * 3600, delta=60)
+
+class TopKSelectionTest(TestCase):
+    def test_matches_full_sort(self):
+        scores = [3.0, 9.0, 1.0, 9.0, 7.0, 2.0]
+        self.assertEqual(top_k_indices(scores), [1, 3, 4, 0, 5, 2])
+        self.assertEqual(top_k_indices(scores, 3), [1, 3, 4])
+        self.assertEqual(top_k_indices(scores, 10), [1, 3, 4, 0, 5, 2])
+
+class ScoringContextTest(TestCase):
+    def setUp(self):
+        self.now = datetime(2024, 3, 1, 12, 0, tzinfo=dt_timezone.utc)
+        self.context = ScoringContext(clock=lambda: self.now)
+    
+    def test_band_boundaries_are_inclusive(self):
+        band = self.context.urgency_band
+        self.assertEqual(band(self.now), scoring_context.PAST_DUE)
+        self.assertEqual(band(self.now + timedelta(hours=24)), scoring_context.DUE_WITHIN_24H)
+        self.assertEqual(band(self.now + timedelta(hours=24, seconds=1)), scoring_context.DUE_WITHIN_72H)
+        self.assertEqual(band(self.now + timedelta(hours=168)), scoring_context.DUE_WITHIN_168H)
+        self.assertEqual(band(self.now + timedelta(days=30)), scoring_context.DUE_LATER)
+        self.assertEqual(band(None), scoring_context.NO_DUE_DATE)
+    
+    def test_naive_due_dates_use_reference_timezone(self):
+        naive = datetime(2024, 3, 1, 18, 0)
+        self.assertEqual(self.context.hours_until(naive), 6.0)
+    
+    def test_injected_clock_makes_scores_reproducible(self):
+        task = {'id': 1, 'importance': 8, 'estimated_hours': 2,
+                'due_date': self.now + timedelta(hours=30)}
+        later = ScoringContext(now=self.now + timedelta(hours=10))
+        scorer = TaskScorer('deadline_driven')
+        self.assertEqual(scorer.calculate_score(task, [task], self.context), 20.0)
+        self.assertEqual(scorer.calculate_score(task, [task], later), 40.0)
+        strategy = StrategyFactory.create_strategy('smart_balance')
+        self.assertEqual(strategy.score_batch([task], context=self.context),
+                         [strategy.calculate_score(task, [task], self.context)])
+
+@override_settings(ROOT_URLCONF='task_analyzer.asgi_urls')
+class AsyncServingTest(TestCase):
+    def setUp(self):
+        get_result_cache().clear()
+        self.tasks = [{'id': i, 'title': f'Task {i}', 'estimated_hours': i % 4 + 1, 'importance': i % 10 + 1,
+                       'dependencies': [i - 1] if i > 1 else []} for i in range(1, 30)]
+    
+    def tearDown(self):
+        async_views._gate = None
+    
+    def sync_analyze(self, query=''):
+        get_result_cache().clear()
+        with override_settings(ROOT_URLCONF='task_analyzer.urls'):
+            return self.client.post(f'/api/tasks/analyze/{query}', {'tasks': self.tasks},
+                                    content_type='application/json').json()
+    
+    async def test_analyze_and_suggest_match_sync_views(self):
+        response = await self.async_client.post('/api/tasks/analyze/?explain=1', {'tasks': self.tasks},
+                                                content_type='application/json')
+        self.assertEqual(response.status_code, 200)
+        self.assertIn('score', response['Server-Timing'])
+        expected = await asyncio.to_thread(self.sync_analyze, '?explain=1')
+        self.assertEqual(response.json(), expected)
+        
+        response = await self.async_client.get('/api/tasks/suggest/?limit=2')
+        self.assertEqual(len(response.json()['suggestions']), 2)
+        response = await self.async_client.get('/api/tasks/suggest/?limit=2',
+                                               headers={'If-None-Match': response['ETag']})
+        self.assertEqual(response.status_code, 304)
+        response = await self.async_client.post('/api/tasks/analyze/', b'[1]', content_type='application/json')
+        self.assertEqual(response.status_code, 400)
+        response = await self.async_client.get('/api/tasks/analyze/')
+        self.assertEqual(response.status_code, 405)
+    
+    async def test_heavy_requests_go_through_the_gate(self):
+        # Threads instead of spawned processes, so the test settings apply
+        async_views._gate = AdmissionGate(ThreadPoolExecutor(1), workers=1, max_waiting=0)
+        with self.settings(SCORING_ASYNC={'HEAVY_BYTES': 1}):
+            response = await self.async_client.post('/api/tasks/analyze/', {'tasks': self.tasks},
+                                                    content_type='application/json')
+            self.assertEqual(response.status_code, 200)
+            self.assertEqual(response.json(), await asyncio.to_thread(self.sync_analyze))
+            
+            async_views._gate = AdmissionGate(ThreadPoolExecutor(1), workers=0, max_waiting=0)
+            response = await self.async_client.post('/api/tasks/analyze/', {'tasks': self.tasks},
+                                                    content_type='application/json')
+            self.assertEqual(response.status_code, 503)
+            self.assertEqual(response['Retry-After'], '1')
+        
+        with self.settings(SCORING_ASYNC={'DEADLINE_SECONDS': 0}):
+            response = await self.async_client.get('/api/tasks/suggest/')
+            self.assertEqual(response.status_code, 504)
+    
+    async def test_admission_gate_bounds_admitted_work(self):
+        gate = AdmissionGate(ThreadPoolExecutor(1), workers=1, max_waiting=1)
+        release = asyncio.Event()
+        loop = asyncio.get_running_loop()
+        
+        def blocked():
+            asyncio.run_coroutine_threadsafe(release.wait(), loop).result()
+            return 'done'
+        
+        first = asyncio.ensure_future(gate.run(blocked))
+        queued = asyncio.ensure_future(gate.run(lambda: 'queued', timeout=0.01))
+        await asyncio.sleep(0)
+        with self.assertRaises(Overloaded):
+            await gate.run(lambda: 'refused')
+        # A request timing out in the queue is dropped and frees its slot
+        with self.assertRaises(asyncio.TimeoutError):
+            await queued
+        self.assertEqual(gate.admitted, 1)
+        release.set()
+        self.assertEqual(await first, 'done')
+        self.assertEqual(gate.admitted, 0)
+    
+    async def test_broken_worker_pool_is_replaced(self):
+        def crash():
+            raise RuntimeError('worker died')
+        
+        broken = ThreadPoolExecutor(1, initializer=crash)
+        gate = AdmissionGate(broken, workers=1, max_waiting=0, make_executor=lambda: ThreadPoolExecutor(1))
+        with self.assertLogs('concurrent.futures', 'CRITICAL'), self.assertRaises(WorkersUnavailable):
+            await gate.run(lambda: 'lost')
+        self.assertEqual(gate.admitted, 0)
+        self.assertIsNot(gate.executor, broken)
+        self.assertEqual(await gate.run(lambda: 'done'), 'done')
+        
+        # An executor that refuses new work frees the slot and answers 503
+        async_views._gate = AdmissionGate(broken, workers=1, max_waiting=0,
+                                          make_executor=lambda: ThreadPoolExecutor(1))
+        with self.settings(SCORING_ASYNC={'HEAVY_BYTES': 1}):
+            response = await self.async_client.post('/api/tasks/analyze/', {'tasks': self.tasks},
+                                                    content_type='application/json')
+            self.assertEqual(response.status_code, 503)
+            self.assertEqual(response['Retry-After'], '1')
+            self.assertEqual(async_views._gate.admitted, 0)
+            response = await self.async_client.post('/api/tasks/analyze/', {'tasks': self.tasks},
+                                                    content_type='application/json')
+            self.assertEqual(response.status_code, 200)
+    
+    def test_worker_counters_are_merged(self):
+        registry = timing.MetricsRegistry()
+        registry.inc('scoring_tasks_total', 5, 'Tasks', strategy='smart_balance')
+        drained = registry.drain_counters()
+        self.assertEqual(drained, [('scoring_tasks_total', 'Tasks', {'strategy': 'smart_balance'}, 5)])
+        self.assertEqual(registry.drain_counters(), [])
+
+@override_settings(SCORING_JOBS={'WORKERS': 0, 'CHUNK_SIZE': 4})
+class AnalysisJobTest(TestCase):
+    def setUp(self):
+        get_result_cache().clear()
+        self.tasks = [{'id': i, 'title': f'Task {i}', 'estimated_hours': i % 5 + 1, 'importance': (i * 3) % 10 + 1,
+                       'dependencies': [1, 2] if i > 2 else []} for i in range(1, 11)]
+    
+    def submit(self, payload):
+        return self.client.post('/api/tasks/jobs/', payload, content_type='application/json')
+    
+    def test_job_ranks_like_analyze_and_serves_partial_results(self):
+        response = self.submit({'tasks': self.tasks, 'strategy': 'smart_balance', 'explain': True})
+        self.assertEqual(response.status_code, 202)
+        job = response.json()
+        self.assertEqual((job['status'], job['total'], job['chunks_total']), ('queued', 10, 3))
+        self.assertEqual(response['Location'], f"/api/tasks/jobs/{job['id']}/")
+        
+        runner = JobRunner(workers=0)
+        self.assertTrue(runner.run_one())
+        partial = self.client.get(f"{job['results']}?page_size=2").json()
+        self.assertEqual((partial['status'], partial['complete'], partial['scored']), ('running', False, 4))
+        self.assertEqual(len(partial['tasks']), 2)
+        
+        self.assertEqual(runner.run_pending(), 2)
+        progress = self.client.get(f"/api/tasks/jobs/{job['id']}/").json()
+        self.assertEqual((progress['status'], progress['progress']), ('done', 1.0))
+        
+        expected = self.client.post('/api/tasks/analyze/?explain=1', {'tasks': self.tasks},
+                                    content_type='application/json').json()['tasks']
+        first = self.client.get(f"{job['results']}?page_size=6").json()
+        second = self.client.get(f"{job['results']}?page=2&page_size=6").json()
+        self.assertTrue(first['complete'])
+        self.assertEqual(first['tasks'] + second['tasks'], expected)
+        self.assertEqual(self.client.get(f"{job['results']}?page=0").status_code, 400)
+    
+    def test_resumes_from_last_committed_chunk(self):
+        job = AnalysisJob.objects.get(pk=self.submit({'tasks': self.tasks}).json()['id'])
+        JobRunner(workers=0).run_one()
+        # A restarted process has no claims and only finds the unfinished chunks
+        pending = list(AnalysisChunk.objects.filter(job=job, done=False).values_list('index', flat=True))
+        self.assertEqual(pending, [1, 2])
+        self.assertEqual(JobRunner(workers=0).run_pending(), 2)
+        
+        job.refresh_from_db()
+        self.assertEqual((job.status, job.scored, job.chunks_done), (AnalysisJob.DONE, 10, 3))
+        self.assertEqual(sorted(AnalysisResult.objects.filter(job=job).values_list('position', flat=True)),
+                         list(range(10)))
+        # Finished chunks drop their input and are never scored twice
+        chunk = AnalysisChunk.objects.get(job=job, index=0)
+        self.assertIsNone(chunk.tasks)
+        self.assertFalse(process_chunk(chunk.pk))
+    
+    def test_polling_results_restarts_the_workers(self):
+        job = self.submit({'tasks': self.tasks}).json()
+        # A restarted process has no runner until a job endpoint builds one
+        with mock.patch('tasks.jobs._runner', None), \
+             mock.patch.object(JobRunner, 'start', autospec=True) as start:
+            self.assertEqual(self.client.get(job['results']).status_code, 200)
+        start.assert_called_once()
+    
+    def test_ndjson_graph_strategy_and_failures(self):
+        lines = ''.join(json.dumps(task) + '\n' for task in self.tasks)
+        response = self.client.post('/api/tasks/jobs/?strategy=critical_path', lines,
+                                    content_type='application/x-ndjson')
+        self.assertEqual(response.status_code, 202)
+        # Graph-walking strategies need the whole backlog in one chunk
+        self.assertEqual(response.json()['chunks_total'], 1)
+        JobRunner(workers=0).run_pending()
+        ranked = self.client.get(response.json()['results']).json()['tasks']
+        expected = self.client.post('/api/tasks/analyze/', {'tasks': self.tasks, 'strategy': 'critical_path'},
+                                    content_type='application/json').json()['tasks']
+        self.assertEqual(ranked, expected)
+        
+        broken = self.submit({'tasks': [{'title': 'Bad', 'importance': 'high'}]}).json()
+        JobRunner(workers=0).run_pending()
+        progress = self.client.get(f"/api/tasks/jobs/{broken['id']}/").json()
+        self.assertEqual(progress['status'], 'failed')
+        self.assertTrue(progress['error'].startswith('Chunk 0:'))
+        
+        self.assertEqual(self.submit({'tasks': []}).status_code, 400)
+        self.assertEqual(self.submit({'tasks': [1]}).status_code, 400)
+        self.assertFalse(AnalysisJob.objects.filter(total=0).exists())
+        
+        self.assertEqual(self.client.delete(f"/api/tasks/jobs/{broken['id']}/").status_code, 204)
+        self.assertEqual(self.client.get(f"/api/tasks/jobs/{broken['id']}/").status_code, 404)
+
+class DeltaSessionTest(TestCase):
+    def setUp(self):
+        get_result_cache().clear()
+        self.tasks = generate_backlog(80, seed=9)
+    
+    def analyze(self, tasks, strategy='smart_balance'):
+        response = self.client.post('/api/tasks/analyze/', {'tasks': tasks, 'strategy': strategy},
+                                    content_type='application/json')
+        return [(task['id'], task['score']) for task in response.json()['tasks']]
+    
+    def test_score_index_keeps_rank_order(self):
+        import random
+        rng = random.Random(3)
+        index, expected = ScoreIndex(seed=1), []
+        for order in range(2000):
+            if expected and rng.random() < 0.4:
+                key = expected.pop(rng.randrange(len(expected)))
+                index.remove(key)
+            else:
+                key = ScoreIndex.key(rng.randint(0, 20), order)
+                expected.append(key)
+                expected.sort()
+                index.insert(key, order)
+        self.assertEqual(list(index), [order for _, order in expected])
+        for position in (0, len(expected) // 2, len(expected) - 1):
+            self.assertEqual(index.rank(expected[position]), position)
+            self.assertEqual(index[position], expected[position][1])
+        rebuilt = ScoreIndex.from_sorted((key, key[1]) for key in expected)
+        self.assertEqual(list(rebuilt.slice(5, 15)), [(key, key[1]) for key in expected[5:15]])
+        with self.assertRaises(KeyError):
+            index.remove((-100.0, 0))
+    
+    def test_patches_return_only_rank_changes(self):
+        response = self.client.post('/api/tasks/sessions/?page_size=200', {'tasks': self.tasks},
+                                    content_type='application/json')
+        self.assertEqual(response.status_code, 201)
+        session = response.json()
+        self.assertEqual(response['Location'], session['url'])
+        self.assertEqual([(task['id'], task['score']) for task in session['tasks']], self.analyze(self.tasks))
+        ranking = [task['id'] for task in session['tasks']]
+        
+        blocker = next(task for task in self.tasks if task.get('dependencies'))
+        patches = [
+            {'op': 'update', 'id': blocker['id'], 'task': {'importance': 1, 'dependencies': []}},
+            {'op': 'add', 'task': {'id': 999, 'title': 'New', 'importance': 10, 'estimated_hours': 1,
+                                   'dependencies': [self.tasks[0]['id']]}},
+            {'op': 'remove', 'id': self.tasks[1]['id']},
+        ]
+        response = self.client.patch(session['url'], {'patches': patches}, content_type='application/json')
+        self.assertEqual(response.status_code, 200)
+        changes = response.json()['changes']
+        # Only the patched tasks and the tasks whose dependent counts changed
+        touched = {blocker['id'], 999, self.tasks[0]['id'], self.tasks[1]['id'], *blocker['dependencies']}
+        self.assertTrue({change['id'] for change in changes} <= touched)
+        by_id = {change['id']: change for change in changes}
+        self.assertIsNone(by_id[999]['previous_rank'])
+        self.assertEqual((by_id[self.tasks[1]['id']]['rank'], by_id[self.tasks[1]['id']]['score']), (None, None))
+        
+        # Moving the listed tasks to their new ranks gives the new ranking
+        listed = {change['id'] for change in changes}
+        ranking = [task_id for task_id in ranking if task_id not in listed]
+        for change in changes:
+            if change['rank']:
+                ranking.insert(change['rank'] - 1, change['id'])
+        current = self.client.get(f"{session['url']}?page_size=200").json()
+        self.assertEqual(current['size'], 80)
+        self.assertEqual([task['id'] for task in current['tasks']], ranking)
+        
+        blocker.update(importance=1, dependencies=[])
+        edited = [task for task in self.tasks if task['id'] != self.tasks[1]['id']]
+        edited.append(patches[1]['task'])
+        self.assertEqual([(task['id'], task['score']) for task in current['tasks']], self.analyze(edited))
+    
+    def test_session_errors_leave_it_unchanged(self):
+        response = self.client.post('/api/tasks/sessions/', {'tasks': [{'title': 'No id'}]},
+                                    content_type='application/json')
+        self.assertEqual(response.status_code, 400)
+        url = self.client.post('/api/tasks/sessions/', {'tasks': self.tasks, 'strategy': 'critical_path'},
+                               content_type='application/json').json()['url']
+        before = self.client.get(url).json()['tasks']
+        
+        bad = [{'op': 'remove', 'id': self.tasks[0]['id']}, {'op': 'update', 'id': 12345, 'task': {}}]
+        response = self.client.patch(url, {'patches': bad}, content_type='application/json')
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('unknown task 12345', response.json()['error'])
+        response = self.client.patch(url, {'patches': [{'op': 'update', 'id': self.tasks[0]['id'],
+                                                        'task': {'importance': 'high'}}]},
+                                     content_type='application/json')
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(self.client.get(url).json()['tasks'], before)
+        
+        self.assertEqual(self.client.delete(url).status_code, 204)
+        self.assertEqual(self.client.get(url).status_code, 404)
+        self.assertEqual(self.client.delete(url).status_code, 404)
+    
+    def test_rescores_everything_once_a_band_changes(self):
+        now = datetime(2024, 1, 10, 12, 0, tzinfo=dt_timezone.utc)
+        tasks = generate_backlog(50, seed=2, now=now)
+        session = ScoringSession(tasks, 'deadline_driven', now=now)
+        later = datetime.fromtimestamp(session.expires_at, dt_timezone.utc)
+        self.assertEqual(session.apply([], now=later - timedelta(seconds=1)), [])
+        
+        changes = session.apply([], now=later)
+        self.assertTrue(changes)
+        self.assertEqual(session.ranking(), ScoringSession(tasks, 'deadline_driven', now=later).ranking())
+
+class ScoringCLITest(TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.addCleanup(self.directory.cleanup)
+        self.now = datetime(2024, 1, 10, 12, 0, tzinfo=dt_timezone.utc)
+        self.tasks = generate_backlog(150, seed=6, now=self.now)
+    
+    def write(self, name, content):
+        path = os.path.join(self.directory.name, name)
+        with open(path, 'w') as destination:
+            destination.write(content)
+        return path
+    
+    def run_cli(self, *args):
+        output = os.path.join(self.directory.name, 'out')
+        status = cli.main([*args, '--now', self.now.isoformat(), '--output', output])
+        with open(output) as result:
+            return status, result.read()
+    
+    def test_scalar_and_vectorized_paths_rank_alike(self):
+        path = self.write('backlog.json', json.dumps({'tasks': self.tasks, 'strategy': 'smart_balance'}))
+        status, output = self.run_cli(path, '--explain')
+        self.assertEqual(status, 0)
+        ranked = json.loads(output)
+        self.assertEqual((ranked['strategy'], ranked['message']), ('smart_balance', 'Analyzed 150 tasks'))
+        with mock.patch.object(cli, 'SCALAR_MAX_TASKS', 0):
+            _, vectorized = self.run_cli(path, '--explain')
+        self.assertEqual(ranked, json.loads(vectorized))
+        
+        lines = ''.join(json.dumps(task) + '\n' for task in self.tasks)
+        status, output = self.run_cli(self.write('backlog.ndjson', lines), '--format', 'ndjson', '--limit', '5',
+                                      '--strategy', 'critical_path')
+        top = [json.loads(line) for line in output.splitlines()]
+        context = ScoringContext(now=self.now)
+        scores = StrategyFactory.create_strategy('critical_path').score_batch(self.tasks, context=context)
+        self.assertEqual([task['id'] for task in top], [self.tasks[i]['id'] for i in top_k_indices(scores, 5)])
+        
+        with mock.patch('sys.stderr', new_callable=io.StringIO) as stderr:
+            self.assertEqual(cli.main([self.write('bad.json', '[1]')]), 1)
+            self.assertEqual(cli.main([path, '--strategy', 'unknown']), 1)
+        self.assertEqual(stderr.getvalue(), 'error: Task 0 is not an object\nerror: Unknown strategy: unknown\n')
+        
+        bad_due = self.write('bad_due.json', json.dumps([{'title': 'Bad', 'estimated_hours': 1, 'due_date': 5}]))
+        with mock.patch('sys.stderr', new_callable=io.StringIO) as stderr:
+            self.assertEqual(cli.main([bad_due]), 1)
+            with mock.patch.object(cli, 'SCALAR_MAX_TASKS', 0):
+                self.assertEqual(cli.main([bad_due]), 1)
+        self.assertEqual(stderr.getvalue(), 'error: due_date must be an ISO 8601 string, not int\n' * 2)
+    
+    def test_runs_without_django_or_numpy(self):
+        path = self.write('backlog.json', json.dumps(self.tasks))
+        script = (
+            'import sys\n'
+            'from task_analyzer.scoring.cli import main\n'
+            f'main([{path!r}, "--limit", "1", "--output", "/dev/null"])\n'
+            'assert "django" not in sys.modules, "django"\n'
+            'assert "numpy" not in sys.modules, "numpy"\n'
+        )
+        env = {key: value for key, value in os.environ.items() if key != 'DJANGO_SETTINGS_MODULE'}
+        backend = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+        result = subprocess.run([sys.executable, '-c', script], cwd=backend, env=env,
+                                capture_output=True, text=True)
+        self.assertEqual(result.returncode, 0, result.stderr)
+    
+    def test_first_vectorized_scoring_is_thread_safe(self):
+        script = (
+            'from concurrent.futures import ThreadPoolExecutor\n'
+            'from benchmarks.generators import generate_backlog\n'
+            'from task_analyzer.scoring import StrategyFactory\n'
+            'tasks = generate_backlog(200)\n'
+            'score = lambda _: StrategyFactory.create_strategy("smart_balance").score_batch(tasks)\n'
+            'with ThreadPoolExecutor(8) as pool:\n'
+            '    scores = list(pool.map(score, range(8)))\n'
+            'assert all(result == scores[0] for result in scores)\n'
+        )
+        env = {key: value for key, value in os.environ.items() if key != 'DJANGO_SETTINGS_MODULE'}
+        backend = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+        for _ in range(3):
+            result = subprocess.run([sys.executable, '-c', script], cwd=backend, env=env,
+                                    capture_output=True, text=True)
+            self.assertEqual(result.returncode, 0, result.stderr)
+
+class AnalyzeEndpointTest(TestCase):
+    def setUp(self):
+        get_result_cache().clear()
+    
+    def analyze(self, payload):
+        return self.client.post('/api/tasks/analyze/', payload, content_type='application/json')
+    
+    def test_scores_match_strategy_classes(self):
+        soon = (timezone.now() + timedelta(hours=6)).isoformat()
+        later = (timezone.now() + timedelta(days=20)).isoformat()
+        tasks = [
+            {'id': 1, 'title': 'Blocker', 'due_date': later, 'estimated_hours': 3, 'importance': 6, 'dependencies': []},
+            {'id': 2, 'title': 'Urgent', 'due_date': soon, 'estimated_hours': 3, 'importance': 6, 'dependencies': [1]},
+            {'id': 3, 'title': 'Follow-up', 'due_date': later, 'estimated_hours': 3, 'importance': 6, 'dependencies': [1]},
+        ]
+        response = self.analyze({'tasks': tasks, 'strategy': 'smart_balance'})
+        self.assertEqual(response.status_code, 200)
+        
+        scored = {task['id']: task for task in response.json()['tasks']}
+        # Due soon beats the blocker, which beats an otherwise identical follow-up
+        self.assertEqual([task['id'] for task in response.json()['tasks']], [2, 1, 3])
+        self.assertEqual(scored[1]['score'], 24.0 + 8.0 + 12.0 + 7.0)
+        self.assertEqual(scored[2]['due_date'], soon)
+        self.assertNotIn('explanation', scored[2])
+        
+        response = self.client.post('/api/tasks/analyze/?explain=1', {'tasks': tasks, 'strategy': 'smart_balance'},
+                                    content_type='application/json')
+        scored = {task['id']: task for task in response.json()['tasks']}
+        self.assertEqual(scored[1]['explanation'],
+                         'Smart balanced approach: medium importance, due later, short (up to 4h), unblocks other tasks')
+        self.assertEqual(scored[2]['explanation'],
+                         'Smart balanced approach: medium importance, due within 24h, short (up to 4h)')
+    
+    def test_date_only_due_dates(self):
+        response = self.analyze({
+            'tasks': [{'title': 'Due', 'due_date': '2020-01-01', 'estimated_hours': 1, 'importance': 5}],
+            'strategy': 'deadline_driven'
+        })
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()['tasks'][0]['score'], 75.0)
+    
+    def test_unknown_strategy(self):
+        response = self.analyze({'tasks': [], 'strategy': 'random'})
+        self.assertEqual(response.status_code, 400)
+    
+    def test_limit_returns_top_k(self):
+        tasks = [{'id': i, 'title': f'Task {i}', 'estimated_hours': 1, 'importance': i % 10 + 1}
+                 for i in range(1, 51)]
+        full = self.analyze({'tasks': tasks, 'strategy': 'high_impact'}).json()['tasks']
+        response = self.analyze({'tasks': tasks, 'strategy': 'high_impact', 'limit': 5})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()['tasks'], full[:5])
+        self.assertEqual(response.json()['message'], 'Analyzed 50 tasks')
+        
+        response = self.client.post('/api/tasks/analyze/?limit=0', {'tasks': tasks},
+                                    content_type='application/json')
+        self.assertEqual(response.status_code, 400)
+        
+        # Fractional limits are refused alike from JSON bodies and query strings
+        for limit in (2.9, True, [5]):
+            response = self.analyze({'tasks': tasks, 'strategy': 'high_impact', 'limit': limit})
+            self.assertEqual(response.json(), {'error': 'limit must be a positive integer'})
+        response = self.client.post('/api/tasks/analyze/?limit=2.9', {'tasks': tasks},
+                                    content_type='application/json')
+        self.assertEqual(response.json(), {'error': 'limit must be a positive integer'})
+        self.assertEqual(self.analyze({'tasks': tasks, 'strategy': 'high_impact', 'limit': 5.0}).json()['tasks'],
+                         full[:5])
+    
+    def test_suggest(self):
+        response = self.client.get('/api/tasks/suggest/?strategy=deadline_driven')
+        self.assertEqual(response.status_code, 200)
+        suggestions = response.json()['suggestions']
+        self.assertEqual(suggestions[0]['title'], 'Fix critical bug')
+        self.assertEqual(len(suggestions), 3)
+        
+        response = self.client.get('/api/tasks/suggest/?strategy=deadline_driven&limit=1')
+        self.assertEqual([s['title'] for s in response.json()['suggestions']], ['Fix critical bug'])
+    
+    def test_suggest_is_precomputed_and_conditional(self):
+        get_result_cache().clear()
+        response = self.client.get('/api/tasks/suggest/')
+        etag, last_modified = response['ETag'], response['Last-Modified']
+        
+        response = self.client.get('/api/tasks/suggest/', HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response.content, b'')
+        self.assertEqual(response['ETag'], etag)
+        response = self.client.get('/api/tasks/suggest/', HTTP_IF_MODIFIED_SINCE=last_modified)
+        self.assertEqual(response.status_code, 304)
+        response = self.client.get('/api/tasks/suggest/?strategy=fastest_wins', HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response['ETag'], etag)
+        
+        # One build per strategy, limit and hour; the next hour has the same answer and ETag
+        now = timezone.now().replace(minute=30, second=0, microsecond=0) + timedelta(hours=1)
+        snapshot = views.suggestion_snapshot('smart_balance', 'smart_balance', 3, now=now)
+        later = now + timedelta(minutes=29)
+        self.assertIs(views.suggestion_snapshot('smart_balance', 'smart_balance', 3, now=later), snapshot)
+        next_hour = views.suggestion_snapshot('smart_balance', 'smart_balance', 3, now=later + timedelta(minutes=1))
+        self.assertIsNot(next_hour, snapshot)
+        self.assertEqual((next_hour['body'], next_hour['etag']), (snapshot['body'], snapshot['etag']))
+        self.assertEqual(next_hour['last_modified'] - snapshot['last_modified'], 3600)
+        
+        # Scored as of the bucket start, so even scores that drift with the
+        # clock are kept for the rest of the hour
+        at_minute_45 = now.replace(minute=45)
+        with mock.patch('time.time', return_value=at_minute_45.timestamp()):
+            snapshot = views.suggestion_snapshot('critical_path', 'critical_path', 3, now=at_minute_45)
+            later = at_minute_45 + timedelta(minutes=10)
+            self.assertIs(views.suggestion_snapshot('critical_path', 'critical_path', 3, now=later), snapshot)
@@ -1,7 +1,18 @@
-from django.urls import path
-from . import views
-
-urlpatterns = [
-    path('analyze/', views.analyze_tasks),
-    path('suggest/', views.suggest_tasks),
+from django.urls import path
+from . import views
+
+urlpatterns = [
+    path('analyze/', views.analyze_tasks),
+    path('suggest/', views.suggest_tasks),
+    path('score/', views.score_stored_tasks),
+    path('top/', views.top_tasks),
+    path('plan/', views.plan_tasks),
+    path('strategies/', views.strategy_profiles),
+    path('import/', views.import_tasks),
+    path('export/', views.export_tasks),
+    path('jobs/', views.submit_job),
+    path('jobs/<uuid:job_id>/', views.job_detail),
+    path('jobs/<uuid:job_id>/results/', views.job_results),
+    path('sessions/', views.create_session),
+    path('sessions/<uuid:session_id>/', views.session_detail),
 ]
\ No newline at end of file
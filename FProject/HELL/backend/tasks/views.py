@@ -1,104 +1,772 @@
-from rest_framework.decorators import api_view
-from rest_framework.response import Response
-from django.utils import timezone
-from datetime import timedelta
-
-@api_view(['POST'])
-def analyze_tasks(request):
-    try:
-        tasks = request.data.get('tasks', [])
-        strategy = request.data.get('strategy', 'smart_balance')
-        
-        scored_tasks = []
-        for task in tasks:
-            score = calculate_score(task, strategy)
-            explanation = get_explanation(task, score, strategy)
-            
-            scored_task = {
-                **task,
-                'score': round(score, 2),
-                'explanation': explanation
-            }
-            scored_tasks.append(scored_task)
-        
-        scored_tasks.sort(key=lambda x: x['score'], reverse=True)
-        
-        return Response({
-            'tasks': scored_tasks,
-            'strategy': strategy,
-            'message': f'Analyzed {len(scored_tasks)} tasks'
-        })
-        
-    except Exception as e:
-        return Response({'error': str(e)}, status=400)
-
-@api_view(['GET'])
-def suggest_tasks(request):
-    strategy = request.GET.get('strategy', 'smart_balance')
-    
-    sample_tasks = [
-        {
-            'title': 'Fix critical bug',
-            'due_date': (timezone.now() + timedelta(hours=12)).isoformat(),
-            'estimated_hours': 2,
-            'importance': 9
-        },
-        {
-            'title': 'Complete project',
-            'due_date': (timezone.now() + timedelta(days=2)).isoformat(),
-            'estimated_hours': 4,
-            'importance': 8
-        },
-        {
-            'title': 'Write documentation',
-            'due_date': (timezone.now() + timedelta(days=7)).isoformat(),
-            'estimated_hours': 3,
-            'importance': 6
-        }
-    ]
-    
-    suggestions = []
-    for task in sample_tasks:
-        score = calculate_score(task, strategy)
-        explanation = get_explanation(task, score, strategy)
-        priority = 'critical' if score > 80 else 'high' if score > 60 else 'medium'
-        
-        suggestions.append({
-            'title': task['title'],
-            'score': round(score, 2),
-            'explanation': explanation,
-            'priority': priority
-        })
-    
-    suggestions.sort(key=lambda x: x['score'], reverse=True)
-    
-    return Response({
-        'suggestions': suggestions[:3],
-        'strategy': strategy
-    })
-
-def calculate_score(task, strategy):
-    importance = task.get('importance', 5)
-    hours = task.get('estimated_hours', 1)
-    
-    if strategy == 'fastest_wins':
-        return min(100, (1 / max(hours, 0.1)) * 20)
-    elif strategy == 'high_impact':
-        return min(100, importance * 10)
-    elif strategy == 'deadline_driven':
-        return min(100, importance * 8 + 20)
-    else:  # smart_balance
-        return min(100, importance * 7 + (1 / max(hours, 0.1)) * 3)
-
-def get_explanation(task, score, strategy):
-    importance = task.get('importance', 5)
-    hours = task.get('estimated_hours', 1)
-    
-    strategies = {
-        'fastest_wins': 'Quick wins strategy',
-        'high_impact': 'High impact focus', 
-        'deadline_driven': 'Deadline driven',
-        'smart_balance': 'Smart balanced approach'
-    }
-    
-    return f"{strategies[strategy]}: Importance {importance}/10, Effort {hours}h"
\ No newline at end of file
+import hashlib
+import heapq
+import json
+from operator import itemgetter
+
+from rest_framework.decorators import api_view
+from rest_framework.response import Response
+from django.conf import settings
+from django.core.exceptions import ValidationError
+from django.http import HttpResponse, HttpResponseNotModified, JsonResponse, StreamingHttpResponse
+from django.utils import timezone
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date
+from datetime import date, datetime, timedelta, timezone as dt_timezone
+
+from task_analyzer.scoring import DependencyGraph, ScoringContext, StrategyFactory
+from task_analyzer.scoring.batch import TaskBatch
+from task_analyzer.scoring.explain import STRATEGY_LABELS, strategy_templates
+from task_analyzer.scoring.parallel import DEFAULT_CHUNK_SIZE, can_parallelize, get_executor, rank_parallel
+from task_analyzer.scoring.planner import plan_schedule
+from task_analyzer.scoring.table import TaskTable
+from task_analyzer.scoring.timing import REGISTRY, stage
+from task_analyzer.scoring.selection import top_k_indices
+from task_analyzer.scoring.session import ScoringSession
+from task_analyzer.scoring.streaming import NDJSONSpool, iter_ndjson, score_stream, sort_by_score
+
+from . import bulk, jobs
+from .cache import get_result_cache
+from .materialized import MATERIALIZED_STRATEGIES, top_scores
+from .models import AnalysisJob, StrategyProfile, Task
+from .ranking_sessions import get_session_store
+
+NDJSON_CONTENT_TYPE = 'application/x-ndjson'
+DEFAULT_HOURS_PER_DAY = 8
+# Largest page of job or session rankings served at once
+MAX_PAGE_SIZE = 1000
+DEFAULT_PAGE_SIZE = 100
+# Sample backlog suggestions are drawn from: (title, hours from the start
+# of the time bucket until due, estimated hours, importance)
+SUGGESTION_SAMPLES = (
+    ('Fix critical bug', 12, 2, 9),
+    ('Complete project', 48, 4, 8),
+    ('Write documentation', 168, 3, 6),
+)
+# Suggestions are scored as of the start of each bucket of this many seconds
+SUGGESTION_BUCKET_SECONDS = 3600
+
+# Lookups clients may pass as ``filters`` when scoring stored tasks
+STORED_TASK_FILTERS = {
+    'importance', 'importance__gte', 'importance__lte',
+    'due_date__gte', 'due_date__lte', 'due_date__isnull',
+    'title__icontains',
+}
+
+@api_view(['POST'])
+def analyze_tasks(request):
+    if request.content_type.split(';')[0].strip() == NDJSON_CONTENT_TYPE:
+        return analyze_ndjson(request)
+    
+    try:
+        with stage('parse'):
+            data = request.data
+    except Exception as e:
+        return Response({'error': str(e)}, status=400)
+    body, status, headers = analyze_payload(data, request.query_params)
+    return Response(body, status=status, headers=headers)
+
+def analyze_payload(data, params):
+    """Rank a parsed analyze body; returns ``(body, status, headers)``.
+    
+    Shared by the DRF view and its async counterpart in async_views.
+    """
+    try:
+        with stage('validate'):
+            tasks = data.get('tasks', [])
+            strategy, name = resolve_strategy(data.get('strategy', 'smart_balance'))
+            limit = parse_limit(params.get('limit') or
+                                data.get('limit', data.get('top_k')))
+            explain = parse_explain(params.get('explain', data.get('explain')))
+        
+        # Identical backlogs polled within the same urgency window are
+        # answered without parsing dates, scoring or sorting again
+        cache = get_result_cache()
+        with stage('cache'):
+            cache_key = cache.make_key(tasks, strategy, limit=limit, explain=explain)
+            cached = cache.get(cache_key)
+        if cached is not None:
+            return cached, 200, {'X-Cache': 'HIT'}
+        
+        ranking, batch = rank_batch(tasks, strategy, limit)
+        REGISTRY.inc('scoring_tasks_total', len(tasks), help_text='Tasks scored by analyze, by strategy',
+                     strategy=name if name in STRATEGY_LABELS else 'custom')
+        
+        result = {
+            'tasks': annotate_ranking(tasks, ranking, batch, explain and templates_for(strategy, name)),
+            'strategy': name,
+            'message': f'Analyzed {len(tasks)} tasks'
+        }
+        issues = dependency_issues(tasks, batch.graph)
+        if issues:
+            result['dependency_issues'] = issues
+        with stage('cache'):
+            scorer = StrategyFactory.create_strategy(strategy)
+            cache.set(cache_key, result, expires_at=scorer.valid_until(batch))
+        return result, 200, {'X-Cache': 'MISS'}
+    
+    except Exception as e:
+        return {'error': str(e)}, 400, {}
+
+@api_view(['POST'])
+def score_stored_tasks(request):
+    """Score persisted tasks selected by ``ids`` and/or ``filters``.
+    
+    Tasks and their dependency edges are loaded in a fixed number of
+    queries, so clients no longer have to resend the backlog.
+    """
+    try:
+        strategy, name = resolve_strategy(request.data.get('strategy', 'smart_balance'))
+        limit = parse_limit(request.query_params.get('limit') or
+                            request.data.get('limit', request.data.get('top_k')))
+        explain = parse_explain(request.query_params.get('explain', request.data.get('explain')))
+        
+        queryset = Task.objects.all()
+        ids = request.data.get('ids')
+        if ids is not None:
+            queryset = queryset.filter(id__in=ids)
+        filters = request.data.get('filters') or {}
+        unknown = set(filters) - STORED_TASK_FILTERS
+        if unknown:
+            return Response({'error': f'Unsupported filters: {", ".join(sorted(unknown))}'}, status=400)
+        queryset = queryset.filter(**filters)
+        
+        tasks, dependency_index = queryset.for_scoring()
+        ranking, batch = rank_batch(tasks, strategy, limit, dependency_index)
+        
+        return Response({
+            'tasks': annotate_ranking(tasks, ranking, batch, explain and templates_for(strategy, name)),
+            'strategy': name,
+            'message': f'Analyzed {len(tasks)} tasks'
+        })
+    
+    except Exception as e:
+        return Response({'error': str(e)}, status=400)
+
+@api_view(['POST'])
+def plan_tasks(request):
+    """Pack tasks into a day-by-day schedule that respects dependencies.
+    
+    Takes the same ``tasks``/``strategy`` body as analyze plus
+    ``hours_per_day``, an optional ``max_days`` and ``start_date``. Tasks
+    that already carry a ``score`` (e.g. analyze output) are not rescored.
+    """
+    try:
+        tasks = request.data.get('tasks', [])
+        strategy, name = resolve_strategy(request.data.get('strategy', 'smart_balance'))
+        hours_per_day = float(request.data.get('hours_per_day', DEFAULT_HOURS_PER_DAY))
+        max_days = parse_limit(request.data.get('max_days'))
+        start_date = request.data.get('start_date')
+        start = date.fromisoformat(start_date) if start_date else timezone.localdate()
+        
+        graph = None
+        if tasks and all('score' in task for task in tasks):
+            scores = [float(task['score']) for task in tasks]
+        else:
+            scores, batch = score_tasks(tasks, strategy)
+            graph = batch.graph
+        graph = graph or DependencyGraph(tasks)
+        schedule = plan_schedule(tasks, scores, hours_per_day, max_days, graph)
+        
+        days = []
+        for offset, day in enumerate(schedule.days):
+            days.append({
+                'date': (start + timedelta(days=offset)).isoformat(),
+                'hours': round(sum(hours for _, hours in day), 2),
+                'tasks': [
+                    {
+                        'id': tasks[position].get('id'),
+                        'title': tasks[position].get('title'),
+                        'hours': round(hours, 2),
+                        'score': round(scores[position], 2),
+                    }
+                    for position, hours in day
+                ]
+            })
+        
+        result = {
+            'days': days,
+            'unscheduled': [
+                {'id': tasks[position].get('id'), 'title': tasks[position].get('title')}
+                for position in schedule.unscheduled
+            ],
+            'strategy': name,
+            'hours_per_day': hours_per_day,
+            'message': f'Planned {len(tasks) - len(schedule.unscheduled)} of {len(tasks)} tasks over {len(days)} days'
+        }
+        issues = dependency_issues(tasks, graph)
+        if issues:
+            result['dependency_issues'] = issues
+        return Response(result)
+    
+    except Exception as e:
+        return Response({'error': str(e)}, status=400)
+
+@api_view(['GET', 'POST'])
+def strategy_profiles(request):
+    """List the built-in strategies and stored profiles, or save a profile.
+    
+    POST ``{"name": ..., "definition": {...}}`` creates the profile or
+    replaces its definition; the name can then be used as ``strategy``.
+    """
+    if request.method == 'GET':
+        profiles = StrategyProfile.objects.order_by('name').values('name', 'definition', 'updated_at')
+        return Response({
+            'strategies': [{'name': name, 'label': label} for name, label in STRATEGY_LABELS.items()],
+            'profiles': list(profiles)
+        })
+    
+    profile = StrategyProfile.objects.filter(name=request.data.get('name')).first() or StrategyProfile()
+    profile.name = request.data.get('name')
+    profile.definition = request.data.get('definition')
+    try:
+        profile.full_clean()
+    except ValidationError as e:
+        return Response({'error': e.message_dict}, status=400)
+    created = profile.pk is None
+    profile.save()
+    return Response({
+        'name': profile.name,
+        'definition': profile.definition,
+        'strategy': StrategyFactory.create_strategy(profile.definition).spec.name
+    }, status=201 if created else 200)
+
+@api_view(['POST'])
+def submit_job(request):
+    """Queue a backlog too big for analyze as a background job.
+    
+    Takes the analyze body (``tasks``, ``strategy``, ``explain``) or an
+    NDJSON upload with ``strategy``/``explain`` query parameters, which is
+    stored a chunk at a time. Answers 202 with the job's progress; poll
+    ``/api/tasks/jobs/<id>/`` and read ``/api/tasks/jobs/<id>/results/``,
+    which serves the top tasks scored so far before the job is done.
+    """
+    params = request.query_params
+    try:
+        if request.content_type.split(';')[0].strip() == NDJSON_CONTENT_TYPE:
+            strategy_value = params.get('strategy', 'smart_balance')
+            explain = parse_explain(params.get('explain'))
+            records = iter_ndjson(request.stream or [])
+        else:
+            data = request.data
+            records = data.get('tasks') if isinstance(data, dict) else None
+            if not isinstance(records, list):
+                raise ValueError('tasks must be a list')
+            strategy_value = data.get('strategy', 'smart_balance')
+            explain = parse_explain(params.get('explain', data.get('explain')))
+        strategy, name = resolve_strategy(strategy_value)
+        job = jobs.submit_job(records, strategy, name, strategy_label(name) if explain else '')
+    except Exception as e:
+        return Response({'error': str(e)}, status=400)
+    
+    runner = jobs.get_job_runner()
+    runner.start()
+    runner.wake()
+    return Response(job_progress(job), status=202, headers={'Location': job_url(job)})
+
+@api_view(['GET', 'DELETE'])
+def job_detail(request, job_id):
+    """Progress of a job; DELETE cancels it and drops its results"""
+    job = AnalysisJob.objects.filter(pk=job_id).first()
+    if job is None:
+        return Response({'error': 'Job not found'}, status=404)
+    if request.method == 'DELETE':
+        job.delete()
+        return Response(status=204)
+    # After a restart the workers only come back once a job is looked at
+    jobs.get_job_runner().start()
+    return Response(job_progress(job))
+
+@api_view(['GET'])
+def job_results(request, job_id):
+    """One page of a job's ranking, best first (``page``, ``page_size``).
+    
+    Readable while the job runs: the page then ranks only the chunks
+    committed so far and ``complete`` is false.
+    """
+    job = AnalysisJob.objects.filter(pk=job_id).first()
+    if job is None:
+        return Response({'error': 'Job not found'}, status=404)
+    try:
+        page, page_size = parse_page(request.query_params)
+    except ValueError as e:
+        return Response({'error': str(e)}, status=400)
+    
+    # Clients that only poll for results must bring the workers back too
+    jobs.get_job_runner().start()
+    return Response({
+        **job_progress(job),
+        'complete': job.status == AnalysisJob.DONE,
+        'page': page,
+        'page_size': page_size,
+        'tasks': jobs.result_page(job, (page - 1) * page_size, page_size),
+    })
+
+def job_progress(job):
+    return {
+        'id': str(job.id),
+        'status': job.status,
+        'strategy': job.strategy_name,
+        'total': job.total,
+        'scored': job.scored,
+        'chunks_done': job.chunks_done,
+        'chunks_total': job.chunks_total,
+        'progress': round(job.scored / job.total, 4) if job.total else 0.0,
+        'error': job.error or None,
+        'created_at': job.created_at,
+        'finished_at': job.finished_at,
+        'results': job_url(job) + 'results/',
+    }
+
+def job_url(job):
+    return f'/api/tasks/jobs/{job.id}/'
+
+@api_view(['POST'])
+def create_session(request):
+    """Upload a backlog once for delta re-analysis.
+    
+    Takes the analyze body; every task needs an ``id``. Answers 201 with
+    the session's id and first page of its ranking (``page_size``). Edits
+    are then PATCHed to ``/api/tasks/sessions/<id>/``, which answers with
+    the rank changes only.
+    """
+    data = request.data
+    try:
+        tasks = data.get('tasks') if isinstance(data, dict) else None
+        if not isinstance(tasks, list):
+            raise ValueError('tasks must be a list')
+        strategy, name = resolve_strategy(data.get('strategy', 'smart_balance'))
+        _, page_size = parse_page(request.query_params)
+        session = ScoringSession(tasks, strategy)
+    except Exception as e:
+        return Response({'error': str(e)}, status=400)
+    
+    session_id = get_session_store().add(session, name)
+    url = session_url(session_id)
+    return Response({
+        'id': str(session_id),
+        'strategy': name,
+        'size': len(session),
+        'tasks': session.ranking(0, page_size),
+        'url': url,
+    }, status=201, headers={'Location': url})
+
+@api_view(['GET', 'PATCH', 'DELETE'])
+def session_detail(request, session_id):
+    """A delta session: GET a page of its ranking, PATCH edits, DELETE it.
+    
+    PATCH takes ``{"patches": [...]}`` of ``add``, ``update`` and
+    ``remove`` operations (see ScoringSession.apply) and answers with the
+    tasks whose score changed and their old and new ranks. Only those
+    tasks are re-scored and moved in the session's score index.
+    """
+    store = get_session_store()
+    if request.method == 'DELETE':
+        if not store.delete(session_id):
+            return Response({'error': 'Session not found'}, status=404)
+        return Response(status=204)
+    entry = store.get(session_id)
+    if entry is None:
+        return Response({'error': 'Session not found or expired'}, status=404)
+    session, name = entry
+    
+    with session.lock:
+        body = {'id': str(session_id), 'strategy': name}
+        try:
+            if request.method == 'GET':
+                page, page_size = parse_page(request.query_params)
+                body['page'] = page
+                body['page_size'] = page_size
+                body['tasks'] = session.ranking((page - 1) * page_size, page_size)
+            else:
+                data = request.data
+                body['changes'] = session.apply(data.get('patches') if isinstance(data, dict) else None)
+        except Exception as e:
+            return Response({'error': str(e)}, status=400)
+        body['size'] = len(session)
+    return Response(body)
+
+def session_url(session_id):
+    return f'/api/tasks/sessions/{session_id}/'
+
+@api_view(['GET'])
+def top_tasks(request):
+    """Serve the highest materialized scores without recomputing anything"""
+    strategy = request.GET.get('strategy', 'smart_balance')
+    if strategy not in MATERIALIZED_STRATEGIES:
+        # Graph-walking strategies aren't materialized (see tasks.materialized)
+        return Response({'error': f'Unsupported strategy: {strategy}; top scores are kept for '
+                                  f'{", ".join(MATERIALIZED_STRATEGIES)}'}, status=400)
+    
+    try:
+        limit = parse_limit(request.GET.get('limit', request.GET.get('top_k', 10)))
+        explain = parse_explain(request.GET.get('explain'), default=True)
+    except ValueError as e:
+        return Response({'error': str(e)}, status=400)
+    
+    context = ScoringContext()
+    templates = templates_for(strategy, strategy)
+    ranked_tasks = []
+    for row in top_scores(strategy, limit, with_dependents=explain):
+        task = {
+            'id': row.task_id,
+            'title': row.task.title,
+            'due_date': row.task.due_date,
+            'estimated_hours': row.task.estimated_hours,
+            'importance': row.task.importance,
+            'score': round(row.score, 2),
+        }
+        if explain:
+            task['explanation'] = templates.explain(task, context, row.dependent_count)
+        ranked_tasks.append(task)
+    
+    return Response({
+        'tasks': ranked_tasks,
+        'strategy': strategy
+    })
+
+def analyze_ndjson(request):
+    """Score an NDJSON upload (one task per line) and stream NDJSON results.
+    
+    Tasks are read and scored in chunks, so memory stays flat as the
+    backlog grows. Query parameters: ``strategy``, ``limit``/``top_k``
+    (keeps only a bounded heap), ``sorted=0`` to stream results in
+    input order instead of by descending score and ``explain``.
+    """
+    params = request.query_params
+    try:
+        strategy, name = resolve_strategy(params.get('strategy', 'smart_balance'))
+        limit = parse_limit(params.get('limit', params.get('top_k')))
+        explain = parse_explain(params.get('explain'))
+        scorer = StrategyFactory.create_strategy(strategy)
+        lines = request.stream or []
+        if scorer.uses_dependencies:
+            # Dependent counts need the whole stream, so spool it to disk first
+            tasks = NDJSONSpool(lines)
+            dependency_index = tasks.dependency_index
+        else:
+            tasks = iter_ndjson(lines)
+            dependency_index = None
+    except Exception as e:
+        return Response({'error': str(e)}, status=400)
+    
+    context = ScoringContext()
+    explainer = (templates_for(strategy, name), context, dependency_index) if explain else None
+    in_input_order = params.get('sorted', '1') in ('0', 'false')
+    
+    def output():
+        # A generator, so reading and scoring only start once streaming
+        # does and their errors reach stream_lines
+        try:
+            scored = score_stream(tasks, scorer, dependency_index, context)
+            if limit:
+                for task, score in heapq.nlargest(limit, scored, key=itemgetter(1)):
+                    yield to_ndjson(task, score, explainer)
+            elif in_input_order:
+                for task, score in scored:
+                    yield to_ndjson(task, score, explainer)
+            else:
+                yield from sort_by_score((score, to_ndjson(task, score, explainer)) for task, score in scored)
+        finally:
+            # Drops the spool's temporary file, or ends the line generator
+            tasks.close()
+    
+    return StreamingHttpResponse(stream_lines(output()), content_type=NDJSON_CONTENT_TYPE)
+
+@api_view(['POST'])
+def import_tasks(request):
+    """Create or update stored tasks in bulk.
+    
+    Accepts JSON (``{"tasks": [...]}`` or a bare list), NDJSON or CSV
+    with the export columns. Rows are validated in one pass, written with
+    batched bulk inserts/updates in a single transaction and their
+    dependencies linked afterwards; see ``bulk.import_tasks``. Pass
+    ``allow_past_due=1`` to accept due dates that have already passed.
+    """
+    content_type = request.content_type.split(';')[0].strip()
+    try:
+        allow_past_due = parse_flag(request.query_params.get('allow_past_due'), 'allow_past_due')
+        if content_type == NDJSON_CONTENT_TYPE:
+            records = iter_ndjson(request.stream or [])
+        elif content_type == 'text/csv':
+            records = bulk.read_csv(request.stream or [])
+        else:
+            data = request.data
+            records = data.get('tasks', []) if isinstance(data, dict) else data
+            if not isinstance(records, list):
+                raise ValueError('tasks must be a list')
+        result = bulk.import_tasks(records, allow_past_due=allow_past_due)
+    except bulk.BulkImportError as e:
+        return Response({'error': str(e), 'errors': e.errors[:bulk.MAX_REPORTED_ERRORS]}, status=400)
+    except ValueError as e:
+        return Response({'error': str(e)}, status=400)
+    
+    return Response({
+        'created': result.created,
+        'updated': result.updated,
+        'ids': result.ids,
+    }, status=201 if result.created else 200)
+
+def export_tasks(request):
+    """Stream every stored task as ``?format=`` csv, ndjson (default) or columnar JSON.
+    
+    A plain Django view rather than a DRF one: DRF reserves the
+    ``format`` parameter, and rows are written straight from a TaskTable
+    without serializers.
+    """
+    export_format = request.GET.get('format', 'ndjson')
+    try:
+        chunks = bulk.export_tasks(Task.objects.all(), export_format)
+    except ValueError as e:
+        return JsonResponse({'error': str(e)}, status=400)
+    
+    extension = 'json' if export_format == 'columnar' else export_format
+    response = StreamingHttpResponse(chunks, content_type=bulk.EXPORT_FORMATS[export_format])
+    response['Content-Disposition'] = f'attachment; filename="tasks.{extension}"'
+    return response
+
+def to_ndjson(task, score, explainer=None):
+    task['score'] = round(score, 2)
+    if explainer:
+        templates, context, dependency_index = explainer
+        dependents = dependency_index.dependent_count(task['id']) if dependency_index and task.get('id') else 0
+        task['explanation'] = templates.explain(task, context, dependents)
+    return json.dumps(task)
+
+def stream_lines(lines):
+    # Headers are already sent once streaming starts, so errors are
+    # reported as a final NDJSON record instead of a status code
+    try:
+        for line in lines:
+            yield line + '\n'
+    except Exception as e:
+        yield json.dumps({'error': str(e)}) + '\n'
+
+@api_view(['GET'])
+def suggest_tasks(request):
+    body, status, headers = suggest_payload(request.GET, request)
+    if status == 304:
+        return HttpResponseNotModified(headers=headers)
+    return Response(body, status=status, headers=headers)
+
+def suggest_payload(params, request=None):
+    """Suggestions for the query ``params``; returns ``(body, status, headers)``.
+    
+    Headers carry the ETag and Last-Modified of the precomputed answer.
+    When ``request`` is given and its conditional headers still match,
+    the status is 304 and the body None.
+    """
+    try:
+        strategy, name = resolve_strategy(params.get('strategy', 'smart_balance'))
+        limit = parse_limit(params.get('limit', params.get('top_k', 3)))
+    except ValueError as e:
+        return {'error': str(e)}, 400, {}
+    
+    snapshot = suggestion_snapshot(strategy, name, limit)
+    headers = {'ETag': snapshot['etag'], 'Last-Modified': http_date(snapshot['last_modified'])}
+    if request is not None:
+        conditional = get_conditional_response(request, etag=snapshot['etag'],
+                                               last_modified=snapshot['last_modified'])
+        if conditional is not None and conditional.status_code == 304:
+            return None, 304, headers
+    return snapshot['body'], 200, headers
+
+def suggestion_snapshot(strategy, name, limit, now=None):
+    """Suggestions body with its ETag, built once per strategy, limit and time bucket.
+    
+    The sample tasks are due at fixed offsets from the start of the
+    current bucket and scored as of that instant, so every process
+    builds the same body, ETag and Last-Modified. Since nothing is scored
+    against the live clock, entries live in the result cache until the
+    bucket ends, whatever the strategy.
+    """
+    timestamp = (now or timezone.now()).timestamp()
+    bucket_start = int(timestamp - timestamp % SUGGESTION_BUCKET_SECONDS)
+    cache = get_result_cache()
+    cache_key = cache.make_key(SUGGESTION_SAMPLES, strategy, endpoint='suggest', limit=limit,
+                               bucket=bucket_start)
+    snapshot = cache.get(cache_key)
+    if snapshot is not None:
+        return snapshot
+    
+    reference = datetime.fromtimestamp(bucket_start, dt_timezone.utc)
+    sample_tasks = [
+        {
+            'title': title,
+            'due_date': reference + timedelta(hours=hours_until_due),
+            'estimated_hours': estimated_hours,
+            'importance': importance
+        }
+        for title, hours_until_due, estimated_hours, importance in SUGGESTION_SAMPLES
+    ]
+    scores, batch = score_tasks(sample_tasks, strategy, context=ScoringContext(now=reference))
+    ranking = top_k_indices(scores, limit)
+    explanations = templates_for(strategy, name).explain_batch(batch, ranking)
+    
+    suggestions = []
+    for index, explanation in zip(ranking, explanations):
+        task, score = sample_tasks[index], scores[index]
+        priority = 'critical' if score > 80 else 'high' if score > 60 else 'medium'
+        
+        suggestions.append({
+            'title': task['title'],
+            'score': round(score, 2),
+            'explanation': explanation,
+            'priority': priority
+        })
+    body = {
+        'suggestions': suggestions,
+        'strategy': name
+    }
+    REGISTRY.inc('scoring_suggestions_built_total', help_text='Suggestion snapshots computed, by strategy',
+                 strategy=name if name in STRATEGY_LABELS else 'custom')
+    
+    digest = hashlib.sha256(json.dumps(body, sort_keys=True).encode()).hexdigest()
+    snapshot = {'body': body, 'etag': f'"{digest[:32]}"', 'last_modified': bucket_start}
+    cache.set(cache_key, snapshot, expires_at=bucket_start + SUGGESTION_BUCKET_SECONDS)
+    return snapshot
+
+def score_tasks(tasks, strategy, dependency_index=None, context=None):
+    """Score task dicts (or a TaskTable) with one strategy and one reference time.
+    
+    ISO ``due_date`` strings are parsed once per task while building the
+    column batch, so the dicts are scored as sent. Returns the scores and
+    the batch they were computed from.
+    """
+    scorer = StrategyFactory.create_strategy(strategy)
+    batch = build_batch(tasks, scorer, dependency_index, context)
+    return scorer.score_batch(batch), batch
+
+def build_batch(tasks, scorer, dependency_index=None, context=None):
+    """TaskBatch of task dicts or a TaskTable with the columns ``scorer`` needs"""
+    build = TaskBatch.from_table if isinstance(tasks, TaskTable) else TaskBatch.from_tasks
+    return build(tasks, dependency_index, context or ScoringContext(),
+                 count_dependents=scorer.uses_dependencies,
+                 with_graph=scorer.uses_graph)
+
+def dependency_issues(tasks, graph=None):
+    """Cycles, unknown ids and blocked tasks in the batch's dependency lists"""
+    if graph is None:
+        if not any(task.get('dependencies') for task in tasks):
+            return {}
+        with stage('graph'):
+            graph = DependencyGraph(tasks)
+    return graph.issues()
+
+def rank_batch(tasks, strategy, limit=None, dependency_index=None):
+    """Score and rank tasks, returning ((index, score) best first, batch).
+    
+    Batches of at least ``SCORING_PARALLEL['THRESHOLD']`` tasks are scored
+    chunk by chunk in the shared process pool, which only sends back each
+    chunk's top ``limit``; smaller ones are scored in-process.
+    """
+    options = getattr(settings, 'SCORING_PARALLEL', {})
+    threshold = options.get('THRESHOLD')
+    scorer = StrategyFactory.create_strategy(strategy)
+    if threshold is not None and len(tasks) >= threshold and can_parallelize(scorer):
+        batch = build_batch(tasks, scorer, dependency_index)
+        ranking = rank_parallel(batch, strategy, limit,
+                                options.get('CHUNK_SIZE', DEFAULT_CHUNK_SIZE),
+                                get_executor(options.get('WORKERS')))
+        return ranking, batch
+    
+    scores, batch = score_tasks(tasks, strategy, dependency_index)
+    return [(index, scores[index]) for index in top_k_indices(scores, limit)], batch
+
+def annotate_ranking(tasks, ranking, batch, templates=None):
+    """Task dicts for (index, score) pairs, in ranking order.
+    
+    Only the returned tasks get ``score`` (and ``explanation`` when
+    ``templates`` are given): request dicts are updated in place rather
+    than copied, and TaskTable rows only become dicts here. Explanations
+    are looked up from the strategy's precomputed templates by the bands
+    of the batch columns, not formatted per task.
+    """
+    ranked_tasks = []
+    with stage('explain'):
+        if templates:
+            explanations = templates.explain_batch(batch, [index for index, _ in ranking])
+        for position, (index, score) in enumerate(ranking):
+            task = tasks[index]
+            task['score'] = round(score, 2)
+            if templates:
+                task['explanation'] = explanations[position]
+            ranked_tasks.append(task)
+    return ranked_tasks
+
+def parse_limit(value):
+    """Validate a ``limit``/``top_k`` parameter; None means return everything"""
+    if value in (None, ''):
+        return None
+    # Fractional numbers from JSON bodies are refused like '2.9' in a
+    # query string, rather than truncated
+    if isinstance(value, bool) or isinstance(value, float) and not value.is_integer():
+        limit = 0
+    else:
+        try:
+            limit = int(value)
+        except (TypeError, ValueError):
+            limit = 0
+    if limit < 1:
+        raise ValueError('limit must be a positive integer')
+    return limit
+
+def parse_positive(value, name, default):
+    if value in (None, ''):
+        return default
+    try:
+        number = int(value)
+    except (TypeError, ValueError):
+        number = 0
+    if number < 1:
+        raise ValueError(f'{name} must be a positive integer')
+    return number
+
+def parse_page(params):
+    """Validate ``page`` and ``page_size`` query parameters"""
+    page = parse_positive(params.get('page'), 'page', 1)
+    page_size = parse_positive(params.get('page_size'), 'page_size', DEFAULT_PAGE_SIZE)
+    if page_size > MAX_PAGE_SIZE:
+        raise ValueError(f'page_size must be at most {MAX_PAGE_SIZE}')
+    return page, page_size
+
+def parse_explain(value, default=False):
+    """Validate an ``explain`` parameter (``1``/``0``); ``default`` when absent"""
+    return parse_flag(value, 'explain', default)
+
+def parse_flag(value, name, default=False):
+    if value in (None, ''):
+        return default
+    if isinstance(value, bool):
+        return value
+    if str(value).lower() in ('1', 'true', 'yes'):
+        return True
+    if str(value).lower() in ('0', 'false', 'no'):
+        return False
+    raise ValueError(f'{name} must be 0 or 1')
+
+def resolve_strategy(value):
+    """Validate a request's ``strategy``: a built-in name, a StrategyProfile name or a definition.
+    
+    Returns what StrategyFactory.create_strategy takes (the name or the
+    definition) and the name reported back. Inline definitions are
+    validated and compiled here, once per distinct definition.
+    """
+    if isinstance(value, dict):
+        return value, StrategyFactory.create_strategy(value).spec.name
+    if value in STRATEGY_LABELS:
+        return value, value
+    definition = StrategyProfile.objects.filter(name=value).values_list('definition', flat=True).first()
+    if definition is None:
+        raise ValueError(f'Unknown strategy: {value}')
+    return definition, value
+
+def templates_for(strategy, name):
+    """Explanation templates of a resolved strategy"""
+    return strategy_templates(StrategyFactory.create_strategy(strategy), strategy_label(name))
+
+def strategy_label(name):
+    return STRATEGY_LABELS.get(name, f'Custom strategy {name}')
+
+def metrics(request):
+    """Request counts and pipeline stage histograms in Prometheus text format"""
+    return HttpResponse(REGISTRY.render(), content_type='text/plain; version=0.0.4; charset=utf-8')
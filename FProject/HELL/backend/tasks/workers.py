@@ -0,0 +1,9 @@
+import os
+
+import django
+
+def setup_worker(niceness=0):
+    """Initializer of spawned pool processes: lower their priority, then set Django up"""
+    if niceness:
+        os.nice(niceness)
+    django.setup()